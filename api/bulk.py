@@ -0,0 +1,67 @@
+"""
+Bulk domain analysis from the command line.
+
+Reads a domain list (plain text, CSV with a url/domain column, or NDJSON),
+dedupes it and writes one NDJSON record per domain. Re-running with the same
+output file resumes after the last completed domain. Domains go through the
+same result cache and signal tables as the API.
+
+Usage (from the ``api`` directory):
+    python bulk.py domains.csv -o results.ndjson --concurrency 32
+    python bulk.py - < domains.txt          # results to stdout, no checkpointing
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dotenv import load_dotenv
+from utils.helpers.bulk import (
+    BULK_CONCURRENCY, BULK_HOST_DELAY, BULK_PER_HOST,
+    HostLimiter, dedupe_urls, read_domains, run_bulk, run_bulk_to_file
+)
+
+load_dotenv(override=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help="Domain list file, or - for stdin")
+    parser.add_argument('-o', '--output', help="NDJSON output file, also used as the resume checkpoint (default: stdout)")
+    parser.add_argument('--format', choices=('text', 'csv', 'ndjson'), help="Input format (detected if omitted)")
+    parser.add_argument('--concurrency', type=int, default=BULK_CONCURRENCY, help="Analyses in flight")
+    parser.add_argument('--per-host', type=int, default=BULK_PER_HOST, help="Concurrent analyses per host")
+    parser.add_argument('--host-delay', type=float, default=BULK_HOST_DELAY, help="Seconds between analyses of one host")
+    parser.add_argument('--refresh', action='store_true', help="Ignore cached signals and analyze every domain afresh")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logger = logging.getLogger('bulk')
+
+    if args.input == '-':
+        items, invalid = dedupe_urls(read_domains(sys.stdin, args.format))
+    else:
+        with open(args.input, encoding='utf-8-sig') as f:
+            items, invalid = dedupe_urls(read_domains(f, args.format))
+    logger.info(f"{len(items)} unique URLs to analyze, {len(invalid)} invalid entries skipped")
+
+    # The application context gives workers the database-backed caches
+    from main import app
+    from api.routes.rest.bulk import PERSIST_BATCH_SIZE
+    from api.routes.rest.analyze import BatchedAnalyzer
+
+    limiter = HostLimiter(args.per_host, args.host_delay)
+    analyzer = BatchedAnalyzer(PERSIST_BATCH_SIZE, args.refresh)
+    try:
+        if args.output:
+            counts = run_bulk_to_file(items, args.output, args.concurrency, limiter, app=app, analyze=analyzer.analyze)
+            logger.info(f"Done: {counts['ok']} ok, {counts['error']} failed, {counts['skipped']} already complete")
+        else:
+            for record in run_bulk(items, args.concurrency, limiter, app, analyzer.analyze):
+                sys.stdout.write(json.dumps(record, default=str) + '\n')
+                sys.stdout.flush()
+    finally:
+        with app.app_context():
+            analyzer.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# gunicorn.conf.py
+
+"""
+Production server settings.
+
+Run from the ``api`` directory:
+    gunicorn -c gunicorn.conf.py main:app
+
+or ``python server.py``. The app is loaded once in the master and the GeoIP
+readers are opened there before workers fork, so every worker shares the same
+memory-mapped database pages copy-on-write instead of mapping its own. Each
+worker runs threads, since an analysis mostly waits on DNS, TLS and HTTP.
+Settings can be overridden with the environment variables below or on the
+gunicorn command line.
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+from urllib.parse import urlparse
+
+API_DIR = Path(__file__).resolve().parent
+
+def _default_port() -> int:
+    port = os.environ.get("API_PORT")
+    if port and port.isdigit():
+        return int(port)
+    try:
+        return urlparse(os.environ.get("API_URL", "")).port or 5000
+    except ValueError:
+        return 5000
+
+# The app imports both ``api.*`` and ``utils.*``
+pythonpath = f"{API_DIR.parent},{API_DIR}"
+chdir = str(API_DIR)
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{_default_port()}")
+
+# One process per core; threads cover the time spent waiting on the network
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count())))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+preload_app = True
+
+# Analyses and streamed responses run long; idle keep-alive connections don't
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Recycle workers now and then so slow leaks can't build up; jitter staggers restarts
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+def when_ready(server):
+    """Prepare the GeoIP databases in the master, after the app is loaded and before any worker forks"""
+    from utils.storage.maxmind_geo import geoip_manager
+
+    geoip_manager.warmup()
+    # Threads don't survive fork; each worker starts its own refresher in post_fork
+    geoip_manager.stop_refresher()
+    server.log.info(f"GeoIP readers preloaded: {sorted(geoip_manager.get_refresh_stats()['editions'])}")
+
+def post_fork(server, worker):
+    """Drop connections inherited from the master and restart per-process threads"""
+    from api import db
+    from utils.monitoring.health_checks import health_monitor
+    from utils.storage.maxmind_geo import geoip_manager
+
+    # With preload_app this returns the app object the master already loaded
+    with server.app.wsgi().app_context():
+        # Pooled connections opened by create_all() in the master must not be shared
+        db.engine.dispose(close=False)
+    geoip_manager.start_refresher()
+    health_monitor.start()
+
+def worker_exit(server, worker):
+    """Let queued analysis jobs finish and release the readers once the worker stops serving"""
+    from utils.helpers.jobs import shutdown_job_manager
+    from utils.monitoring.health_checks import health_monitor
+    from utils.storage.maxmind_geo import geoip_manager
+
+    health_monitor.stop()
+    shutdown_job_manager(wait=True)
+    geoip_manager.stop_refresher()
+    geoip_manager.close_readers()
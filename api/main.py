@@ -1,12 +1,11 @@
 from flask import Flask, jsonify, send_from_directory
-from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
 from dotenv import load_dotenv
 import os
 import logging
+from api import db
 from api.utils.logger import setup_logger
+from utils.monitoring.error_tracking import init_error_tracking
 from urllib.parse import urlparse
 
 # Load environment variables, ignoring comments
@@ -37,11 +36,6 @@ def get_api_port():
     logger.info("No API_PORT or valid API_URL port found. Using default port 5000.")
     return 5000
 
-class Base(DeclarativeBase):
-    pass
-
-db = SQLAlchemy(model_class=Base)
-
 def init_app():
     """Create and configure the Flask application."""
     app = Flask(__name__)
@@ -93,6 +87,7 @@ def create_app():
 
     # Initialize extensions
     db.init_app(app)
+    init_error_tracking(app, os.environ.get("SENTRY_DSN"))
 
     with app.app_context():
         # Import routes
@@ -118,35 +113,35 @@ def create_app():
                     "rest": {
                         "base": "/api/v1",
                         "health": "/api/health",
+                        "liveness": "/api/health/live",
+                        "readiness": "/api/health/ready",
                         "auth": "/api/v1/auth/*",
                         "users": "/api/v1/users/*",
-                        "posts": "/api/v1/posts/*"
+                        "posts": "/api/v1/posts/*",
+                        "geo": "/api/v1/geo/*",
+                        "analyze": "/api/analyze",
+                        "jobs": "/api/v1/jobs",
+                        "bulk": "/api/v1/bulk"
                     },
                     "graphql": "/graphql",
-                    "trpc": "/trpc/*"
+                    "trpc": "/trpc/*",
+                    "metrics": "/metrics"
                 }
             })
 
-        @app.route("/api/health")
-        def health_check():
-            """Health check endpoint."""
-            try:
-                db.session.execute(text("SELECT 1"))
-                return jsonify({
-                    "status": "healthy",
-                    "database": "connected",
-                    "api_url": os.environ.get("API_URL"),
-                    "app_url": os.environ.get("APP_URL")
-                })
-            except Exception as e:
-                logger.error(f"Health check failed: {str(e)}")
-                return jsonify({"status": "unhealthy", "error": str(e)}), 500
-
     return app
 
 app = create_app()
 
 if __name__ == "__main__":
+    # Development server only; use server.py (gunicorn) in production.
+    # The reloader in debug mode starts the app twice, so it is opt-in.
+    from utils.monitoring.health_checks import health_monitor
+    from utils.storage.maxmind_geo import geoip_manager
+
+    geoip_manager.warmup()
+    health_monitor.start()
     port = get_api_port()
-    logger.info(f"Starting server on port {port}")
-    app.run(host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
+    debug = os.environ.get("FLASK_DEBUG", "").lower() in ("1", "true", "yes")
+    logger.info(f"Starting development server on port {port} (debug={debug})")
+    app.run(host="0.0.0.0", port=port, debug=debug, threaded=True)
\ No newline at end of file
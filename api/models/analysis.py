@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import (
+    Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from api import db
+
+class Domain(db.Model):
+    """An analyzed site, keyed by host name."""
+    __tablename__ = 'domains'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(253), unique=True, index=True)
+    url: Mapped[str] = mapped_column(Text)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_analyzed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+class DomainIP(db.Model):
+    """An IP address a domain resolved to."""
+    __tablename__ = 'domain_ips'
+    __table_args__ = (UniqueConstraint('domain_id', 'ip', name='uq_domain_ips_domain_ip'),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    domain_id: Mapped[int] = mapped_column(ForeignKey('domains.id', ondelete='CASCADE'), index=True)
+    ip: Mapped[str] = mapped_column(String(45), index=True)
+    hostname: Mapped[Optional[str]] = mapped_column(String(253))
+    resolved_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class IPGeo(db.Model):
+    """MaxMind geolocation and ASN data for one IP address."""
+    __tablename__ = 'ip_geo'
+    __table_args__ = (Index('ix_ip_geo_asn_country', 'asn', 'country_code'),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    ip: Mapped[str] = mapped_column(String(45), unique=True, index=True)
+    city: Mapped[Optional[str]] = mapped_column(String(255))
+    region: Mapped[Optional[str]] = mapped_column(String(255))
+    country: Mapped[Optional[str]] = mapped_column(String(255))
+    country_code: Mapped[Optional[str]] = mapped_column(String(2), index=True)
+    latitude: Mapped[Optional[float]] = mapped_column(Float)
+    longitude: Mapped[Optional[float]] = mapped_column(Float)
+    network: Mapped[Optional[str]] = mapped_column(String(64))
+    asn: Mapped[Optional[int]] = mapped_column(Integer, index=True)
+    asn_org: Mapped[Optional[str]] = mapped_column(String(255))
+    is_cdn: Mapped[bool] = mapped_column(Boolean, default=False)
+    cdn_provider: Mapped[Optional[str]] = mapped_column(String(64))
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class DNSRecord(db.Model):
+    """One DNS record value seen for a domain."""
+    __tablename__ = 'dns_records'
+    __table_args__ = (
+        UniqueConstraint('domain_id', 'rdtype', 'value_hash', name='uq_dns_records_domain_type_value'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    domain_id: Mapped[int] = mapped_column(ForeignKey('domains.id', ondelete='CASCADE'), index=True)
+    rdtype: Mapped[str] = mapped_column(String(10))
+    # sha256 of value, since TXT values can be too long to index
+    value_hash: Mapped[str] = mapped_column(String(64))
+    value: Mapped[str] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class Certificate(db.Model):
+    """The TLS certificate a domain last presented."""
+    __tablename__ = 'certificates'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    domain_id: Mapped[int] = mapped_column(ForeignKey('domains.id', ondelete='CASCADE'), unique=True, index=True)
+    common_name: Mapped[Optional[str]] = mapped_column(String(255))
+    organization: Mapped[Optional[str]] = mapped_column(String(255), index=True)
+    country: Mapped[Optional[str]] = mapped_column(String(2))
+    state: Mapped[Optional[str]] = mapped_column(String(255))
+    locality: Mapped[Optional[str]] = mapped_column(String(255))
+    issuer: Mapped[Optional[str]] = mapped_column(String(255))
+    issuer_country: Mapped[Optional[str]] = mapped_column(String(2))
+    issuer_common_name: Mapped[Optional[str]] = mapped_column(String(255))
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class SocialLink(db.Model):
+    """A domain's link to a social platform."""
+    __tablename__ = 'social_links'
+    __table_args__ = (UniqueConstraint('domain_id', 'platform', name='uq_social_links_domain_platform'),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    domain_id: Mapped[int] = mapped_column(ForeignKey('domains.id', ondelete='CASCADE'), index=True)
+    platform: Mapped[str] = mapped_column(String(32), index=True)
+    url: Mapped[str] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from api import db
+
+class AnalysisCacheEntry(db.Model):
+    """Cached analysis signals for one normalized URL."""
+    __tablename__ = 'analysis_cache'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    cache_key: Mapped[str] = mapped_column(Text)
+    payload: Mapped[str] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+class ContentAnalysisCacheEntry(db.Model):
+    """LLM content analysis of one page text, for one model and prompt version."""
+    __tablename__ = 'content_analysis_cache'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # SHA256 of the normalized text, model and prompt version
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    model: Mapped[str] = mapped_column(String(100))
+    prompt_version: Mapped[int] = mapped_column(Integer)
+    payload: Mapped[str] = mapped_column(Text)
+    size: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    last_used_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
@@ -2,6 +2,12 @@ from flask import Blueprint
 from .auth import auth_bp
 from .users import users_bp
 from .posts import posts_bp
+from .geo import geo_bp
+from .analyze import analyze_bp
+from .jobs import jobs_bp
+from .bulk import bulk_bp
+from .metrics import metrics_bp
+from .health import router as health_bp
 
 rest_bp = Blueprint('rest', __name__)
 
@@ -10,4 +16,10 @@ def register_rest_routes(app):
     # Register individual blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
     app.register_blueprint(users_bp, url_prefix='/api/v1/users')
-    app.register_blueprint(posts_bp, url_prefix='/api/v1/posts')
\ No newline at end of file
+    app.register_blueprint(posts_bp, url_prefix='/api/v1/posts')
+    app.register_blueprint(geo_bp, url_prefix='/api/v1/geo')
+    app.register_blueprint(analyze_bp, url_prefix='/api')
+    app.register_blueprint(jobs_bp, url_prefix='/api/v1/jobs')
+    app.register_blueprint(bulk_bp, url_prefix='/api/v1/bulk')
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(health_bp, url_prefix='/api')
\ No newline at end of file
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+from flask import Blueprint, Response, current_app, jsonify, request
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from api import db
+from api.models import analysis as analysis_models
+from api.models.cache import AnalysisCacheEntry
+from utils.storage.result_cache import (
+    AnalysisResultCache, MemoryResultCacheBackend, SQLAlchemyResultCacheBackend
+)
+from utils.storage.signal_store import ANALYSIS_PERSIST, SignalStore
+from utils.monitoring.tracing import record_spans, span, timing_breakdown
+
+analyze_bp = Blueprint('analyze', __name__)
+
+# Allow ``debug=1`` timing breakdowns outside Flask debug mode
+ANALYSIS_DEBUG_TIMINGS = os.getenv("ANALYSIS_DEBUG_TIMINGS", "").lower() in ('1', 'true', 'yes')
+
+_result_cache: Optional[AnalysisResultCache] = None
+_signal_store: Optional[SignalStore] = None
+
+def get_result_cache() -> AnalysisResultCache:
+    """Get the analysis result cache, using the backend named by ANALYSIS_CACHE_BACKEND"""
+    global _result_cache
+    if _result_cache is None:
+        from utils.helpers.analysis import SIGNAL_TTLS
+
+        if os.environ.get("ANALYSIS_CACHE_BACKEND", "database") == "memory":
+            backend = MemoryResultCacheBackend()
+        else:
+            backend = SQLAlchemyResultCacheBackend(db, AnalysisCacheEntry)
+        _result_cache = AnalysisResultCache(backend, SIGNAL_TTLS)
+    return _result_cache
+
+def get_signal_store() -> SignalStore:
+    """Get the store that keeps analysis signals in the relational tables"""
+    global _signal_store
+    if _signal_store is None:
+        _signal_store = SignalStore(db, analysis_models)
+    return _signal_store
+
+def analyze_with_cache(
+    url: str,
+    refresh: bool = False,
+    on_signal: Optional[Callable[[str, Any], None]] = None,
+    persist: bool = True
+) -> Tuple[str, Dict[str, Any], str]:
+    """
+    Collect analysis signals for a URL, reusing fresh cached signals.
+
+    Freshly collected signals are also written to the signal tables unless
+    ANALYSIS_PERSIST or ``persist`` is off; callers that write in batches pass
+    ``persist=False``. Must run inside an application context when the
+    database is used.
+
+    Returns:
+        Tuple of the normalized URL, its signals and the cache status
+        ('HIT', 'PARTIAL' or 'MISS')
+    """
+    from utils.helpers.url_parsing import normalize_url
+    from utils.helpers.analysis import collect_signals
+
+    key = normalize_url(url)
+    cache = get_result_cache()
+
+    fresh, fetched_at = ({}, {}) if refresh else cache.lookup(key)
+    if cache.is_complete(fresh):
+        if on_signal is not None:
+            for name, value in fresh.items():
+                on_signal(name, value)
+        return key, fresh, 'HIT'
+
+    signals = collect_signals(key, reuse=fresh, on_signal=on_signal)
+    cache.store(key, signals, fetched_at)
+    if ANALYSIS_PERSIST and persist:
+        get_signal_store().save([(key, signals)])
+    return key, signals, 'PARTIAL' if fresh else 'MISS'
+
+class BatchedAnalyzer:
+    """
+    analyze_with_cache for many URLs, writing fresh signals to the signal
+    tables in batches of ``batch_size`` so each write is one bulk upsert.
+
+    analyze() is safe to call from worker threads running in an application
+    context; call flush() once they are done to write the remainder.
+    """
+
+    def __init__(self, batch_size: int, refresh: bool = False) -> None:
+        self.batch_size = max(batch_size, 1)
+        self.refresh = refresh
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+
+    def analyze(self, url: str) -> Tuple[str, Dict[str, Any], str]:
+        key, signals, cache_status = analyze_with_cache(url, self.refresh, persist=False)
+        if ANALYSIS_PERSIST and cache_status != 'HIT':
+            batch: List[Tuple[str, Dict[str, Any]]] = []
+            with self._lock:
+                self._pending.append((key, signals))
+                if len(self._pending) >= self.batch_size:
+                    batch, self._pending = self._pending, []
+            if batch:
+                get_signal_store().save(batch)
+        return key, signals, cache_status
+
+    def flush(self) -> None:
+        """Write any signals still waiting for a full batch"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            get_signal_store().save(batch)
+
+@analyze_bp.route('/analyze', methods=['GET', 'POST'])
+def analyze() -> Response:
+    """Analyze a website.
+
+    Takes ``url`` as a query parameter or form field. Results are cached per
+    normalized URL with per-signal TTLs; pass ``refresh=1`` to bypass the
+    cache. Responses carry an ETag and honour ``If-None-Match``. With
+    ``debug=1`` (in debug mode or with ANALYSIS_DEBUG_TIMINGS set) the response
+    includes a ``timings`` breakdown of every pipeline stage.
+    """
+    from utils.helpers.url_parsing import validate_url
+    from utils.helpers.analysis import build_response
+
+    url = request.values.get('url', '').strip()
+    if not url or not validate_url(url):
+        return jsonify({"error": "A valid 'url' parameter is required"}), 400
+
+    refresh = request.values.get('refresh', '').lower() in ('1', 'true', 'yes')
+    debug = (current_app.debug or ANALYSIS_DEBUG_TIMINGS) and request.values.get('debug', '').lower() in ('1', 'true', 'yes')
+
+    with record_spans() as spans, span('analyze.request', url=url) as current:
+        key, signals, cache_status = analyze_with_cache(url, refresh)
+        current.set_attribute('cache', cache_status)
+        result = build_response(key, signals)
+
+    if debug:
+        result['timings'] = timing_breakdown(spans)
+    body = json.dumps(result, default=str, sort_keys=True)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.sha256(body.encode('utf-8')).hexdigest()[:32])
+    response.headers['X-Cache'] = cache_status
+    return response.make_conditional(request)
@@ -0,0 +1,64 @@
+import json
+import os
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from typing import Iterator
+from utils.helpers.bulk import (
+    BULK_CONCURRENCY, BULK_HOST_DELAY, BULK_PER_HOST,
+    HostLimiter, dedupe_urls, read_domains_from_bytes, run_bulk
+)
+from .analyze import BatchedAnalyzer
+
+bulk_bp = Blueprint('bulk', __name__)
+
+# Upper bound on unique URLs accepted in one upload
+MAX_BULK_URLS = int(os.getenv("MAX_BULK_URLS", "100000"))
+
+# Analyses written to the signal tables per upsert batch
+PERSIST_BATCH_SIZE = 200
+
+@bulk_bp.route('', methods=['POST'])
+@bulk_bp.route('/', methods=['POST'])
+def bulk_analyze():
+    """Analyze an uploaded domain list.
+
+    Accepts a multipart ``file`` upload or a raw request body in plain text,
+    CSV (with a url/domain column) or NDJSON; pass ``format`` to skip
+    detection. Entries are deduped by normalized URL and results stream back as
+    NDJSON, one record per URL in completion order. Like ``/api/analyze``, each
+    URL reuses fresh cached signals (``refresh=1`` bypasses them) and new
+    signals are written to the signal tables in batches. For resumable runs use
+    the ``bulk.py`` command line entry point.
+    """
+    upload = request.files.get('file')
+    data = upload.read() if upload is not None else request.get_data()
+    fmt = request.values.get('format') or None
+    if fmt not in (None, 'text', 'csv', 'ndjson'):
+        return jsonify({"error": "format must be one of text, csv, ndjson"}), 400
+
+    items, invalid = dedupe_urls(read_domains_from_bytes(data, fmt))
+    if not items:
+        return jsonify({"error": "No valid URLs in the upload", "details": {"invalid": invalid[:100]}}), 400
+    if len(items) > MAX_BULK_URLS:
+        return jsonify({
+            "error": f"Too many URLs: {len(items)} (max {MAX_BULK_URLS})",
+            "details": {"max_urls": MAX_BULK_URLS}
+        }), 413
+
+    refresh = request.values.get('refresh', '').lower() in ('1', 'true', 'yes')
+    limiter = HostLimiter(BULK_PER_HOST, BULK_HOST_DELAY)
+    analyzer = BatchedAnalyzer(PERSIST_BATCH_SIZE, refresh)
+    app = current_app._get_current_object()
+
+    def generate() -> Iterator[str]:
+        for entry in invalid:
+            yield json.dumps({'input': entry, 'status': 'invalid'}) + '\n'
+        try:
+            for record in run_bulk(items, BULK_CONCURRENCY, limiter, app, analyzer.analyze):
+                yield json.dumps(record, default=str) + '\n'
+        finally:
+            analyzer.flush()
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['X-Bulk-Total'] = str(len(items))
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
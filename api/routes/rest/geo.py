@@ -0,0 +1,102 @@
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from typing import Iterator, List, Tuple
+
+geo_bp = Blueprint('geo', __name__)
+
+# Upper bound on IPs accepted in one batch request, in either input format
+MAX_BATCH_SIZE = 100_000
+
+class BatchTooLargeError(ValueError):
+    """A batch request has more than MAX_BATCH_SIZE IPs."""
+
+def _read_request_ips() -> List[str]:
+    """
+    Read IPs from the request body, one per line (plain text or NDJSON strings).
+
+    The whole body is validated before any result is streamed, so a bad line
+    gets a 4xx response instead of breaking the NDJSON stream halfway.
+
+    Raises:
+        BatchTooLargeError: If the body has more than MAX_BATCH_SIZE IPs
+        ValueError: If a line starting with a quote isn't a JSON string
+    """
+    ips: List[str] = []
+    for number, line in enumerate(request.stream, start=1):
+        text = line.decode('utf-8', errors='replace').strip()
+        if not text:
+            continue
+        if text.startswith('"'):
+            try:
+                text = json.loads(text)
+            except ValueError:
+                raise ValueError(f"Line {number} is not a valid JSON string: {text[:100]!r}")
+            if not isinstance(text, str):
+                raise ValueError(f"Line {number} is not a JSON string")
+        if len(ips) >= MAX_BATCH_SIZE:
+            raise BatchTooLargeError(f"Batch too large: more than {MAX_BATCH_SIZE} IPs")
+        ips.append(text)
+    return ips
+
+def _batch_too_large(message: str) -> Tuple[Response, int]:
+    return jsonify({"error": message, "details": {"max_batch_size": MAX_BATCH_SIZE}}), 413
+
+@geo_bp.route('/batch', methods=['POST'])
+def batch_lookup():
+    """Geolocate a batch of IP addresses.
+
+    Accepts either a JSON body ``{"ips": [...]}`` or a newline-delimited body
+    with one IP per line. No DNS is performed and duplicate IPs are returned
+    once. Results stream back as NDJSON, one object per unique IP.
+    """
+    if request.is_json:
+        payload = request.get_json(silent=True) or {}
+        ips = payload.get('ips')
+        if not isinstance(ips, list) or not all(isinstance(ip, str) for ip in ips):
+            return jsonify({"error": "Request body must contain an 'ips' list of strings"}), 400
+        if len(ips) > MAX_BATCH_SIZE:
+            return _batch_too_large(f"Batch too large: {len(ips)} IPs (max {MAX_BATCH_SIZE})")
+        source = ips
+    else:
+        try:
+            source = _read_request_ips()
+        except BatchTooLargeError as e:
+            return _batch_too_large(str(e))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    # Imported here so registering the blueprint doesn't load the GeoIP databases
+    from utils.storage.maxmind_geo import geoip_manager
+
+    def generate() -> Iterator[str]:
+        for result in geoip_manager.lookup_ips(source):
+            yield json.dumps(result) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@geo_bp.route('/domains', methods=['GET'])
+def domains_by_network():
+    """List stored domains by the network their IPs belong to.
+
+    Filters on ``asn`` and/or ``country`` (ISO 3166-1 alpha-2), e.g.
+    ``?asn=13335&country=DE`` for every analyzed domain on Cloudflare in
+    Germany. Paginate with ``limit`` (max 1000) and ``offset``.
+    """
+    asn = request.args.get('asn', '').strip().upper().removeprefix('AS')
+    country = request.args.get('country', '').strip()
+    if not asn and not country:
+        return jsonify({"error": "Provide an 'asn' and/or 'country' filter"}), 400
+    if asn and not asn.isdigit():
+        return jsonify({"error": "'asn' must be a number such as 13335 or AS13335"}), 400
+    if country and (len(country) != 2 or not country.isalpha()):
+        return jsonify({"error": "'country' must be a two-letter ISO country code"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 100)), 1), 1000)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({"error": "'limit' and 'offset' must be integers"}), 400
+
+    from .analyze import get_signal_store
+
+    domains = get_signal_store().find_domains(int(asn) if asn else None, country or None, limit, offset)
+    return jsonify({'domains': domains, 'count': len(domains), 'limit': limit, 'offset': offset})
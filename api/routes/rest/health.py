@@ -1,16 +1,53 @@
+import os
 from flask import Blueprint, jsonify
-from typing import Dict
+from flask.blueprints import BlueprintSetupState
+from typing import Any, Dict, Tuple
+from utils.monitoring.health_checks import health_monitor
 
 router = Blueprint('health', __name__)
 
+@router.record_once
+def bind_health_monitor(state: BlueprintSetupState) -> None:
+    """Run the background checks against the app this blueprint is registered on."""
+    health_monitor.init_app(state.app)
+
 @router.route('/health', methods=['GET'])
-def health_check() -> Dict[str, str]:
-    """Health check endpoint.
+def health_check() -> Tuple[Any, int]:
+    """Health check endpoint, served from the background checker's cached results.
+
+    Returns:
+        Tuple[Any, int]: Status of every dependency check and 200, or 503 while not ready
+    """
+    ready, snapshot = health_monitor.readiness()
+    checks = snapshot['checks']
+    return jsonify({
+        "status": "healthy" if ready else "unhealthy",
+        "database": checks.get('database', {}).get('status', 'pending'),
+        "api_url": os.environ.get("API_URL"),
+        "app_url": os.environ.get("APP_URL"),
+        "geoip": checks.get('geoip'),
+        "openai": checks.get('openai'),
+        "checked_at": snapshot['checked_at'],
+        "stale": snapshot['stale'],
+        "failing": snapshot['failing'],
+    }), 200 if ready else 503
+
+@router.route('/health/live', methods=['GET'])
+def liveness() -> Dict[str, str]:
+    """Liveness probe: answers as long as the process serves requests, without touching dependencies."""
+    return jsonify({"status": "alive"})
+
+@router.route('/health/ready', methods=['GET'])
+def readiness() -> Tuple[Any, int]:
+    """Readiness probe: 200 only while the required checks are fresh and passing.
 
     Returns:
-        Dict[str, str]: A dictionary containing the health status and version
+        Tuple[Any, int]: The failing checks and the age of the results, with 200 or 503
     """
+    ready, snapshot = health_monitor.readiness()
     return jsonify({
-        "status": "healthy",
-        "version": "1.0.0"
-    })
\ No newline at end of file
+        "status": "ready" if ready else "not_ready",
+        "failing": snapshot['failing'],
+        "checked_at": snapshot['checked_at'],
+        "stale": snapshot['stale'],
+    }), 200 if ready else 503
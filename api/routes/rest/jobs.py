@@ -0,0 +1,106 @@
+import json
+import time
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
+from typing import Any, Dict, Iterator
+from utils.helpers.jobs import Job, QueueFullError, get_job_manager
+from .analyze import analyze_with_cache
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# Seconds between keep-alive comments on idle event streams
+SSE_KEEPALIVE = 15.0
+
+def _format_event(index: int, event: Dict[str, Any]) -> str:
+    data = json.dumps({'data': event['data'], 'time': event['time']}, default=str)
+    return f"id: {index}\nevent: {event['event']}\ndata: {data}\n\n"
+
+@jobs_bp.route('', methods=['POST'])
+@jobs_bp.route('/', methods=['POST'])
+def create_job():
+    """Start an analysis job.
+
+    Takes ``url`` as a JSON field or form field, plus an optional ``refresh``.
+    Returns 202 with the job id straight away; the analysis runs on a bounded
+    worker pool and 503 is returned when that pool's queue is full.
+    """
+    from utils.helpers.url_parsing import validate_url
+
+    payload = request.get_json(silent=True) if request.is_json else None
+    values = payload if isinstance(payload, dict) else request.values
+    url = str(values.get('url') or '').strip()
+    if not url or not validate_url(url):
+        return jsonify({"error": "A valid 'url' parameter is required"}), 400
+    refresh = str(values.get('refresh') or '').lower() in ('1', 'true', 'yes')
+
+    app = current_app._get_current_object()
+
+    def work(job: Job) -> Dict[str, Any]:
+        from utils.helpers.analysis import build_response
+
+        with app.app_context():
+            key, signals, _ = analyze_with_cache(url, refresh, on_signal=job.add_event)
+            return build_response(key, signals)
+
+    try:
+        job = get_job_manager().submit(url, work)
+    except QueueFullError as e:
+        response = jsonify({"error": "Too many analyses in progress, try again later", "details": str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
+
+    response = jsonify({
+        'id': job.id,
+        'status': job.status,
+        'status_url': url_for('jobs.get_job', job_id=job.id),
+        'events_url': url_for('jobs.job_events', job_id=job.id),
+    })
+    response.status_code = 202
+    response.headers['Location'] = url_for('jobs.get_job', job_id=job.id)
+    return response
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Get a job's status, the events so far and, once complete, its result."""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+@jobs_bp.route('/<job_id>/events', methods=['GET'])
+def job_events(job_id: str):
+    """Stream a job's events as server-sent events.
+
+    Each completed signal is sent as an event named after the signal, and status
+    changes as ``status`` events. The stream ends after the job completes or
+    fails. Reconnecting clients resume after ``Last-Event-ID``.
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    try:
+        seen = int(request.headers.get('Last-Event-ID', '-1')) + 1
+    except ValueError:
+        seen = 0
+
+    def generate() -> Iterator[str]:
+        nonlocal seen
+        last_sent = time.monotonic()
+        while True:
+            events = job.wait_for_events(seen, timeout=SSE_KEEPALIVE)
+            for event in events:
+                yield _format_event(seen, event)
+                seen += 1
+            if job.finished and seen >= len(job.events):
+                break
+            if events:
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= SSE_KEEPALIVE:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,13 @@
+from flask import Blueprint, Response
+from utils.monitoring.tracing import render_prometheus
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics() -> Response:
+    """Expose analysis stage histograms in the Prometheus text format.
+
+    Counts are per process: under gunicorn each scrape reports the worker that
+    served it.
+    """
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,97 @@
+# scripts/bench_address_extraction.py
+
+"""
+Benchmark for address extraction.
+
+Times the previous extractor (two ``re.findall`` scans with unbounded
+``[A-Za-z\\s,]+`` prefixes) against the anchor-first extractor on page texts of
+doubling size, including adversarial texts that make the old patterns
+backtrack. The old extractor is skipped once a run exceeds --budget seconds.
+
+Usage (from the ``api`` directory):
+    python -m scripts.bench_address_extraction --max-mb 4
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+from typing import Callable, Dict, List
+from utils.helpers.geo_detection import extract_addresses
+
+US_ADDRESS_PATTERN = r'\b\d+\s+[A-Za-z\s,]+(?:Road|Street|Ave|Avenue|Blvd|Boulevard|Rd|St|Dr|Drive|Lane|Ln|Place|Pl|Circle|Cir|Court|Ct|Highway|Hwy|Way)[,\s]+(?:[A-Za-z\s]+,\s*)?(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)[,\s]+\d{5}(?:-\d{4})?\b'
+NON_US_ADDRESS_PATTERN = r'\b\d+\s+[A-Za-z\s,]+(?:Road|Street|Avenue|Lane|Court|Way|Close|Drive|Park|Gardens|Grove|Terrace)[,\s]+(?:[A-Za-z\s]+,\s*)?[A-Z]{1,2}[0-9][0-9A-Z]?\s+[0-9][A-Z]{2}\b'
+
+
+def legacy_extract_addresses(text: str) -> List[str]:
+    """The extractor as it was before the anchor-first rewrite"""
+    return (re.findall(US_ADDRESS_PATTERN, text, re.IGNORECASE)
+            + re.findall(NON_US_ADDRESS_PATTERN, text, re.IGNORECASE))
+
+
+def marketing_text(size: int) -> str:
+    """Ordinary page copy with an address every few kilobytes"""
+    rng = random.Random(0)
+    words = "our team builds colour widgets for customers around the world since 1998 call 555 0100".split()
+    addresses = ["1600 Amphitheatre Parkway Way, Mountain View, CA 94043",
+                 "10 Downing Street, London SW1A 2AA"]
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        chunk = ' '.join(rng.choice(words) for _ in range(400)) + '. ' + rng.choice(addresses) + '. '
+        parts.append(chunk)
+        length += len(chunk)
+    return ''.join(parts)[:size]
+
+
+def repeated_streets(size: int) -> str:
+    """A house number followed by many street suffixes and no commas: quadratic for the old patterns"""
+    return ('1 ' + 'Street x ' * (size // 9))[:size] + ' 12345'
+
+
+def suffixes_before_zips(size: int) -> str:
+    """ZIP-like numbers every ~160 characters, each preceded by street suffixes: worst case for the new engine"""
+    block = '7 ' + 'Street x ' * 17 + ' 54321 '
+    return (block * (size // len(block) + 1))[:size]
+
+
+CORPORA: Dict[str, Callable[[int], str]] = {
+    'marketing copy': marketing_text,
+    'repeated streets': repeated_streets,
+    'suffixes before zips': suffixes_before_zips,
+}
+
+
+def _time(extract: Callable[[str], object], text: str) -> float:
+    start = time.perf_counter()
+    extract(text)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-mb', type=float, default=4, help="Largest text size in MB")
+    parser.add_argument('--budget', type=float, default=10.0, help="Stop timing the old extractor past this many seconds")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    max_size = int(args.max_mb * 1024 * 1024)
+    for name, make_text in CORPORA.items():
+        print(f"\n{name}")
+        print(f"{'size':>10} {'old':>10} {'new':>10}")
+        size, legacy_done = 4 * 1024, False
+        while size <= max_size:
+            text = make_text(size)
+            old = '-'
+            if not legacy_done:
+                elapsed = _time(legacy_extract_addresses, text)
+                old = f"{elapsed:.3f}s"
+                legacy_done = elapsed > args.budget
+            new = _time(extract_addresses, text)
+            print(f"{len(text) // 1024:>8}KB {old:>10} {new:>9.3f}s")
+            size *= 2
+
+
+if __name__ == "__main__":
+    main()
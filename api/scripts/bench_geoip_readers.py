@@ -0,0 +1,67 @@
+# scripts/bench_geoip_readers.py
+
+"""
+Micro-benchmark for MaxMind lookups.
+
+Compares opening a fresh ``geoip2.database.Reader`` per lookup (the previous
+behaviour) against the shared memory-mapped readers held by ``GeoIPManager``,
+and measures ``GeoIPManager.lookup_ips`` batch throughput (city, country and
+ASN per IP) over random IPv4 addresses.
+
+Usage (from the ``api`` directory):
+    python -m scripts.bench_geoip_readers --ip 81.2.69.142 --lookups 20000
+"""
+
+import argparse
+import random
+import time
+import geoip2.database
+from typing import Callable
+from utils.storage.maxmind_geo import geoip_manager
+
+
+def _measure(label: str, lookups: int, lookup: Callable[[], object]) -> float:
+    """Run ``lookup`` ``lookups`` times and print lookups per second"""
+    start = time.perf_counter()
+    for _ in range(lookups):
+        lookup()
+    elapsed = time.perf_counter() - start
+    rate = lookups / elapsed if elapsed else float('inf')
+    print(f"{label:<28} {lookups:>8} lookups in {elapsed:8.3f}s  ({rate:,.0f} lookups/s)")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ip', default='81.2.69.142', help="IP address to look up")
+    parser.add_argument('--lookups', type=int, default=20000, help="Number of lookups per run")
+    args = parser.parse_args()
+
+    geoip_manager.warmup()
+    city_path = geoip_manager.local_path / geoip_manager._database_filename('city')
+    if geoip_manager.get_reader('city') is None:
+        raise SystemExit(f"No city database available at {city_path}")
+
+    def reader_per_lookup() -> object:
+        with geoip2.database.Reader(str(city_path)) as reader:
+            return reader.city(args.ip)
+
+    def shared_reader() -> object:
+        reader = geoip_manager.get_reader('city')
+        assert reader is not None
+        return reader.city(args.ip)
+
+    before = _measure("open reader per lookup", args.lookups, reader_per_lookup)
+    after = _measure("shared mmap reader", args.lookups, shared_reader)
+    print(f"Speedup: {after / before:.1f}x")
+
+    ips = [f"{random.randint(1, 223)}.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(0, 255)}"
+           for _ in range(args.lookups)]
+    start = time.perf_counter()
+    results = sum(1 for _ in geoip_manager.lookup_ips(ips))
+    elapsed = time.perf_counter() - start
+    print(f"{'lookup_ips batch':<28} {results:>8} lookups in {elapsed:8.3f}s  ({results / elapsed:,.0f} lookups/s)")
+
+
+if __name__ == "__main__":
+    main()
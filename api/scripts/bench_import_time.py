@@ -0,0 +1,99 @@
+# scripts/bench_import_time.py
+
+"""
+Cold-start benchmark for the storage and analysis modules.
+
+Imports each module in a fresh interpreter under ``python -X importtime``, with
+S3 configured against an unroutable endpoint, dummy MaxMind credentials and an
+empty GeoIP directory, so any network call made at import time shows up as a
+multi-second stall. Reports wall time and the slowest imports per module.
+
+Usage (from the ``api`` directory):
+    python -m scripts.bench_import_time
+    python -m scripts.bench_import_time --module main --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+DEFAULT_MODULES = [
+    'utils.storage.s3_bucket',
+    'utils.storage.maxmind_geo',
+    'utils.helpers.geo_detection',
+    'utils.helpers.analysis',
+]
+
+
+def _offline_env(geoip_dir: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        'S3_BUCKET_NAME': 'bench-unreachable-bucket',
+        # TEST-NET-1: packets go nowhere, so a connection attempt hangs until it times out
+        'AWS_ENDPOINT_URL_S3': 'http://192.0.2.1',
+        'AWS_ACCESS_KEY_ID': 'bench',
+        'AWS_SECRET_ACCESS_KEY': 'bench',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'MAXMIND_ACCOUNT_ID': '0',
+        'MAXMIND_LICENSE_KEY': 'bench',
+        'GEOIP_DB_PATH': geoip_dir,
+        'PYTHONPATH': os.pathsep.join(p for p in sys.path if p),
+    })
+    return env
+
+
+def measure(module: str, env: dict, timeout: float) -> Tuple[float, List[Tuple[int, str]]]:
+    """
+    Import a module in a new interpreter.
+
+    Returns:
+        Tuple of wall-clock seconds and (cumulative microseconds, module) pairs,
+        slowest first
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=env, capture_output=True, text=True, timeout=timeout
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    imports: List[Tuple[int, str]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative), name.strip()))
+    imports.sort(reverse=True)
+    return elapsed, imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', action='append', help="Module to import (repeatable)")
+    parser.add_argument('--top', type=int, default=8, help="Slowest imports to list per module")
+    parser.add_argument('--budget', type=float, default=1.0, help="Seconds a cold import may take")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Give up on an import after this many seconds")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as geoip_dir:
+        env = _offline_env(geoip_dir)
+        for module in args.module or DEFAULT_MODULES:
+            elapsed, imports = measure(module, env, args.timeout)
+            verdict = 'ok' if elapsed < args.budget else 'OVER BUDGET'
+            failed = failed or elapsed >= args.budget
+            print(f"\n{module}: {elapsed:.3f}s wall ({verdict})")
+            for cumulative, name in imports[:args.top]:
+                print(f"  {cumulative / 1000:8.1f}ms  {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# scripts/bench_social_links.py
+
+"""
+Benchmark for social link extraction.
+
+Compares the previous extractor (one ``find_all('a')`` pass and a substring test
+per platform) with the single-pass host-suffix extractor over a corpus of saved
+HTML pages, and reports pages where the two disagree (substring matches such as
+``box.com`` for ``x.com`` that the host lookup rejects).
+
+Usage (from the ``api`` directory):
+    python -m scripts.bench_social_links --corpus path/to/saved/pages
+    python -m scripts.bench_social_links --anchors 5000   # synthetic page
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, Tag
+from utils.helpers.entity_detection import SOCIAL_PLATFORMS, extract_social_links
+
+
+def legacy_extract_social_links(soup: BeautifulSoup, base_url: str) -> Tuple[Dict[str, Any], List[str]]:
+    """The extractor as it was before the single-pass rewrite"""
+    social_links: Dict[str, Any] = {}
+    all_links: List[str] = []
+    for platform, domains in SOCIAL_PLATFORMS.items():
+        for link in soup.find_all('a', href=True):
+            if not isinstance(link, Tag):
+                continue
+            href = link.get('href')
+            if not href or not isinstance(href, str):
+                continue
+            if not href.startswith(('http://', 'https://')):
+                href = urljoin(base_url, href)
+            if any(domain in href.lower() for domain in domains):
+                social_links[platform] = href
+                all_links.append(href)
+                break
+    return social_links, all_links
+
+
+def synthetic_page(anchors: int) -> str:
+    """A marketing-style page: mostly internal links, social links in the footer"""
+    rng = random.Random(0)
+    links = [f'<a href="/products/{rng.randint(0, 10**6)}">Product</a>' for _ in range(anchors)]
+    links += [
+        '<a href="https://www.dropbox.com/s/brochure.pdf">Brochure</a>',
+        '<a href="https://twitter.com/acme">Twitter</a>',
+        '<a href="https://www.linkedin.com/company/acme">LinkedIn</a>',
+        '<a href="https://github.com/acme">GitHub</a>',
+    ]
+    return f"<html><body>{''.join(links)}</body></html>"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help="Directory of saved .html pages")
+    parser.add_argument('--anchors', type=int, default=5000, help="Anchors in the synthetic page when no corpus is given")
+    parser.add_argument('--repeat', type=int, default=5, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    if args.corpus:
+        paths = sorted(Path(args.corpus).glob('**/*.htm*'))
+        if not paths:
+            raise SystemExit(f"No .html files under {args.corpus}")
+        pages = [(p.name, p.read_text(encoding='utf-8', errors='replace')) for p in paths]
+    else:
+        pages = [('synthetic', synthetic_page(args.anchors))]
+
+    # Parse once up front: only the extraction itself is being measured
+    soups = [(name, BeautifulSoup(html, 'html.parser')) for name, html in pages]
+    anchors = sum(len(soup.find_all('a', href=True)) for _, soup in soups)
+    print(f"{len(soups)} pages, {anchors} anchors, {args.repeat} passes")
+
+    timings = {}
+    for label, extract in (("per-platform substring", legacy_extract_social_links),
+                           ("single-pass host lookup", extract_social_links)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, soup in soups:
+                extract(soup, 'https://example.com')
+        timings[label] = time.perf_counter() - start
+        per_page = timings[label] / (args.repeat * len(soups)) * 1000
+        print(f"{label:<26} {timings[label]:8.3f}s  ({per_page:.2f} ms/page)")
+    print(f"Speedup: {timings['per-platform substring'] / timings['single-pass host lookup']:.1f}x")
+
+    for name, soup in soups:
+        before, _ = legacy_extract_social_links(soup, 'https://example.com')
+        after, _ = extract_social_links(soup, 'https://example.com')
+        if before != after:
+            print(f"  {name}: {before} -> {after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# scripts/load_test.py
+
+"""
+HTTP load test for comparing server setups.
+
+Sends requests from a pool of client threads for a fixed duration against each
+target in turn and reports throughput, latency percentiles and errors. Start
+the servers to compare first, e.g. from the ``api`` directory:
+
+    python main.py                                   # Werkzeug, port 5000
+    GUNICORN_BIND=0.0.0.0:8000 python server.py       # gunicorn
+
+Usage (from the ``api`` directory):
+    python -m scripts.load_test \\
+        --target werkzeug=http://localhost:5000/api/health \\
+        --target gunicorn=http://localhost:8000/api/health \\
+        --concurrency 64 --duration 20
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import Dict, List, Tuple
+import requests
+
+
+def run_target(url: str, concurrency: int, duration: float, timeout: float) -> Dict[str, float]:
+    """Hammer one URL from ``concurrency`` threads for ``duration`` seconds"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client() -> None:
+        nonlocal errors
+        session = requests.Session()
+        local: List[float] = []
+        local_errors = 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                response = session.get(url, timeout=timeout)
+                response.content
+                if response.status_code >= 500:
+                    local_errors += 1
+                    continue
+            except requests.RequestException:
+                local_errors += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    if not latencies:
+        return {'requests': 0, 'errors': errors, 'rps': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [latencies[0]] * 99
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed,
+        'p50': cuts[49] * 1000,
+        'p95': cuts[94] * 1000,
+        'p99': cuts[98] * 1000,
+    }
+
+
+def _parse_target(value: str) -> Tuple[str, str]:
+    name, sep, url = value.partition('=')
+    if not sep:
+        return value, value
+    return name, url
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', action='append', type=_parse_target, required=True,
+                        help="name=URL to load; repeat to compare servers")
+    parser.add_argument('--concurrency', type=int, default=32, help="Client threads")
+    parser.add_argument('--duration', type=float, default=15.0, help="Seconds per target")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    results = {}
+    for name, url in args.target:
+        # Warm up connections and caches before measuring
+        run_target(url, min(args.concurrency, 4), 1.0, args.timeout)
+        results[name] = run_target(url, args.concurrency, args.duration, args.timeout)
+
+    print(f"{'target':<16} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<16} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+              f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f}")
+
+    baseline = next(iter(results.values()))['rps']
+    if len(results) > 1 and baseline:
+        for name, r in list(results.items())[1:]:
+            print(f"{name}: {r['rps'] / baseline:.1f}x the throughput of {next(iter(results))}")
+
+
+if __name__ == "__main__":
+    main()
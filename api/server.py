@@ -1,4 +1,21 @@
-from api import app
+"""
+Production entry point: serves the app with gunicorn using gunicorn.conf.py.
+
+    python server.py [extra gunicorn options]
+
+For local development with the reloader, run ``main.py`` with FLASK_DEBUG=1.
+"""
+
+import sys
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).resolve().parent / "gunicorn.conf.py"
+
+def main() -> None:
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = [sys.argv[0], "--config", str(CONFIG_PATH), *sys.argv[1:], "main:app"]
+    run()
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    main()
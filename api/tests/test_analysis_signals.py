@@ -0,0 +1,60 @@
+"""Test that collect_signals reports each signal as soon as it is ready."""
+
+import pytest
+from utils.helpers import analysis, entity_detection, geo_detection
+from utils.storage.maxmind_geo import geoip_manager
+
+PAGE = {'links': [], 'text': 'Hello', 'title': None, 'lang': None, 'meta': {}, 'bytes_read': 5, 'truncated': False}
+
+@pytest.fixture
+def log(monkeypatch):
+    calls = []
+
+    def stage(name, value):
+        def run(*args, **kwargs):
+            calls.append(f'stage:{name}')
+            return value
+        return run
+
+    monkeypatch.setattr(geoip_manager, 'lookup_url', stage('ip_geolocation', {'country': 'GB'}))
+    monkeypatch.setattr(geo_detection, 'get_ip_location', stage('ip_location', None))
+    monkeypatch.setattr(analysis, 'fetch_page', stage('fetch', PAGE))
+    monkeypatch.setattr(entity_detection, 'extract_social_links', stage('social', ({}, None)))
+    monkeypatch.setattr(geo_detection, 'combine_location_signals', stage('location', {'location': 'GB'}))
+    return calls
+
+def test_each_page_signal_is_emitted_before_the_next_stage(log):
+    """social goes out before the location stage runs, not after every page stage."""
+    analysis.collect_signals('https://example.com', on_signal=lambda name, value: log.append(name))
+
+    assert log.index('social') < log.index('stage:location') < log.index('location')
+
+def test_reused_page_signals_are_emitted_when_the_fetch_fails(log, monkeypatch):
+    """Cached page signals still reach subscribers when the page can't be fetched."""
+    def fail(url):
+        raise ConnectionError("unreachable")
+
+    monkeypatch.setattr(analysis, 'fetch_page', fail)
+    monkeypatch.setattr(analysis, 'PAGE_SIGNALS', ('social', 'location', 'content'))
+    reuse = {'social': {'links': {}, 'equivalency': None}, 'location': {'location': 'GB'}}
+
+    signals = analysis.collect_signals('https://example.com', reuse=reuse,
+                                       on_signal=lambda name, value: log.append(name))
+
+    assert [entry for entry in log if not entry.startswith('stage:')] == [
+        'ip_geolocation', 'ip_location', 'social', 'location'
+    ]
+    assert 'content' not in signals
+
+def test_content_analysis_runs_after_page_signals_are_out(log, monkeypatch):
+    """The batched LLM stage doesn't hold back social and location events."""
+    def analyze_content(url, page):
+        log.append('stage:content')
+        return {'analysis': 'About example'}
+
+    monkeypatch.setattr(analysis, 'analyze_content', analyze_content)
+    monkeypatch.setattr(analysis, 'PAGE_SIGNALS', ('social', 'location', 'content'))
+
+    analysis.collect_signals('https://example.com', on_signal=lambda name, value: log.append(name))
+
+    assert log.index('social') < log.index('location') < log.index('stage:content') < log.index('content')
@@ -0,0 +1,95 @@
+"""Test /api/analyze result caching with the in-memory backend."""
+
+import pytest
+from flask import Flask
+from routes.rest import analyze
+from utils.helpers import analysis
+from utils.storage.result_cache import AnalysisResultCache, MemoryResultCacheBackend
+
+URL = 'https://example.com'
+
+@pytest.fixture
+def site(monkeypatch):
+    """Client plus the signals the fake pipeline returns and the reuse sets it was called with."""
+    state = {
+        'signals': {'ip_geolocation': {'ip': '203.0.113.5', 'country': 'GB'}, 'social': {'links': {'github': 'https://github.com/x'}}},
+        'calls': [],
+        'backend': MemoryResultCacheBackend(),
+    }
+
+    def fake_collect(url, reuse=None, on_signal=None):
+        state['calls'].append(sorted(reuse or {}))
+        return {**state['signals'], **(reuse or {})}
+
+    monkeypatch.setattr(analysis, 'collect_signals', fake_collect)
+    monkeypatch.setattr(analyze, '_result_cache',
+                        AnalysisResultCache(state['backend'], {'ip_geolocation': 60, 'social': 600}))
+    monkeypatch.setattr(analyze, 'ANALYSIS_PERSIST', False)
+    app = Flask('analyze-test')
+    app.register_blueprint(analyze.analyze_bp, url_prefix='/api')
+    state['client'] = app.test_client()
+    return state
+
+def test_miss_then_hit_with_etag(site):
+    """A cached result is served without collecting, and a matching ETag gets a 304."""
+    first = site['client'].get(f'/api/analyze?url={URL}')
+    second = site['client'].get(f'/api/analyze?url={URL}')
+
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert site['calls'] == [[]]
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.get_json()['social_links'] == {'github': 'https://github.com/x'}
+
+    cached = site['client'].get(f'/api/analyze?url={URL}', headers={'If-None-Match': first.headers['ETag']})
+    assert cached.status_code == 304 and cached.data == b''
+
+def test_stale_signal_is_recomputed_and_merged(site):
+    """Only the expired signal is recollected; the fresh one keeps its original fetch time."""
+    site['client'].get(f'/api/analyze?url={URL}')
+    entry = site['backend'].get(URL)
+    entry['fetched_at']['ip_geolocation'] -= 120
+    social_fetched = entry['fetched_at']['social']
+    site['signals']['ip_geolocation'] = {'ip': '203.0.113.5', 'country': 'FR'}
+
+    response = site['client'].get(f'/api/analyze?url={URL}')
+
+    assert response.headers['X-Cache'] == 'PARTIAL'
+    assert site['calls'][-1] == ['social']
+    assert response.get_json()['ip_geolocation'] == {'ip': '203.0.113.5', 'country': 'FR'}
+    stored = site['backend'].get(URL)['fetched_at']
+    assert stored['social'] == social_fetched and stored['ip_geolocation'] > social_fetched
+
+def test_none_signal_is_not_cached(site):
+    """A failed lookup is retried on the next request instead of being cached for its TTL."""
+    site['signals']['ip_geolocation'] = None
+    site['client'].get(f'/api/analyze?url={URL}')
+    assert 'ip_geolocation' not in site['backend'].get(URL)['signals']
+
+    site['signals']['ip_geolocation'] = {'ip': '203.0.113.5', 'country': 'GB'}
+    response = site['client'].get(f'/api/analyze?url={URL}')
+    assert response.headers['X-Cache'] == 'PARTIAL'
+    assert response.get_json()['ip_geolocation'] == {'ip': '203.0.113.5', 'country': 'GB'}
+
+@pytest.mark.parametrize('geolocation', [
+    {'ip': None, 'country': None, 'timed_out_signals': []},
+    {'ip': '203.0.113.5', 'country': 'GB', 'timed_out_signals': ['ssl', 'headers']},
+])
+def test_unresolved_or_timed_out_geolocation_is_not_cached(site, geolocation):
+    """A lookup for an unresolved domain or with timed-out collectors is retried, not cached."""
+    site['signals']['ip_geolocation'] = geolocation
+    site['client'].get(f'/api/analyze?url={URL}')
+    assert 'ip_geolocation' not in site['backend'].get(URL)['signals']
+
+    site['client'].get(f'/api/analyze?url={URL}')
+    assert site['calls'][-1] == ['social']
+
+def test_refresh_bypasses_cache(site):
+    """refresh=1 recollects every signal and replaces the cached entry."""
+    site['client'].get(f'/api/analyze?url={URL}')
+    site['signals']['social'] = {'links': {}}
+
+    response = site['client'].get(f'/api/analyze?url={URL}&refresh=1')
+
+    assert response.headers['X-Cache'] == 'MISS'
+    assert site['calls'] == [[], []]
+    assert site['client'].get(f'/api/analyze?url={URL}').get_json()['social_links'] == {}
@@ -0,0 +1,113 @@
+"""Test bulk input parsing, dedupe, checkpointing, host politeness and the bulk endpoint."""
+
+import json
+import time
+from flask import Flask, has_app_context
+from routes.rest import analyze as analyze_routes, bulk as bulk_routes
+from utils.helpers import analysis, bulk
+from utils.storage.result_cache import AnalysisResultCache, MemoryResultCacheBackend
+from utils.helpers.bulk import HostLimiter, dedupe_urls, interleave_by_host, load_checkpoint, read_domains
+
+def test_read_domains_detects_formats():
+    """Plain text, CSV with a header and NDJSON inputs all yield the URL column."""
+    assert list(read_domains(['# list\n', 'example.com\n', '\n', 'example.org\n'])) == ['example.com', 'example.org']
+    assert list(read_domains(['name,domain\n', 'Acme,acme.com\n', 'Foo,foo.io\n'])) == ['acme.com', 'foo.io']
+    assert list(read_domains(['{"url": "a.com"}\n', '"b.com"\n', 'not json\n'])) == ['a.com', 'b.com']
+
+def test_dedupe_urls_normalizes():
+    """Spellings of one site collapse to a single normalized URL."""
+    items, invalid = dedupe_urls(['Example.com', 'https://example.com/', 'HTTPS://EXAMPLE.COM:443', 'nodot', 'b.org'])
+    assert items == [('https://example.com', 'Example.com'), ('https://b.org', 'b.org')]
+    assert invalid == ['nodot']
+
+def test_interleave_by_host():
+    """URLs of one host are spread out round-robin."""
+    items = [('https://a.com/1', ''), ('https://a.com/2', ''), ('https://b.com', '')]
+    assert [url for url, _ in interleave_by_host(items)] == ['https://a.com/1', 'https://b.com', 'https://a.com/2']
+
+def test_checkpoint_resume(tmp_path, monkeypatch):
+    """A re-run skips completed URLs and drops a truncated trailing record."""
+    calls = []
+
+    def fake_analyze(url, entry, limiter, app=None, analyze=None):
+        calls.append(url)
+        return {'url': url, 'input': entry, 'status': 'ok', 'result': {}}
+
+    monkeypatch.setattr(bulk, 'analyze_one', fake_analyze)
+    output = tmp_path / 'out.ndjson'
+    output.write_text(json.dumps({'url': 'https://a.com', 'status': 'ok'}) + '\n{"url": "https://b.c')
+
+    items, _ = dedupe_urls(['a.com', 'b.com', 'c.com'])
+    counts = bulk.run_bulk_to_file(items, str(output), concurrency=2)
+
+    assert counts == {'skipped': 1, 'ok': 2, 'error': 0}
+    assert sorted(calls) == ['https://b.com', 'https://c.com']
+    assert load_checkpoint(str(output)) == {'https://a.com', 'https://b.com', 'https://c.com'}
+
+def test_host_limiter_spaces_requests():
+    """A host's analyses start at least the configured delay apart."""
+    limiter = HostLimiter(per_host=1, delay=0.2)
+    start = time.monotonic()
+    for _ in range(2):
+        limiter.acquire('example.com')
+        limiter.release('example.com')
+    limiter.acquire('other.com')
+    assert 0.2 <= time.monotonic() - start < 1.0
+
+def test_workers_run_in_the_app_context(monkeypatch):
+    """Given an app, every worker analyzes inside its context so the caches are reachable."""
+    contexts = []
+
+    def fake_collect(url):
+        contexts.append(has_app_context())
+        return {}
+
+    monkeypatch.setattr(analysis, 'collect_signals', fake_collect)
+    monkeypatch.setattr(analysis, 'build_response', lambda url, signals: {'url': url})
+    items, _ = dedupe_urls(['a.com', 'b.com', 'c.com'])
+
+    records = list(bulk.run_bulk(items, concurrency=3, limiter=HostLimiter(delay=0), app=Flask('bulk-test')))
+
+    assert [record['status'] for record in records] == ['ok'] * 3
+    assert contexts == [True] * 3
+
+class RecordingStore:
+    def __init__(self):
+        self.batches = []
+
+    def save(self, analyses):
+        self.batches.append([url for url, _ in analyses])
+        return len(analyses)
+
+def test_bulk_endpoint_uses_result_cache_and_batched_store(monkeypatch):
+    """Bulk analyses reuse cached signals and write fresh ones in store batches."""
+    collected = []
+
+    def fake_collect(url, reuse=None, on_signal=None):
+        collected.append(url)
+        return {'ip_geolocation': {'ip': '203.0.113.5', 'country': 'GB'}, 'social': {'links': {}}}
+
+    store = RecordingStore()
+    monkeypatch.setattr(analysis, 'collect_signals', fake_collect)
+    monkeypatch.setattr(analysis, 'build_response', lambda url, signals: {'url': url})
+    monkeypatch.setattr(analyze_routes, '_result_cache',
+                        AnalysisResultCache(MemoryResultCacheBackend(), {'ip_geolocation': 60, 'social': 60}))
+    monkeypatch.setattr(analyze_routes, '_signal_store', store)
+    monkeypatch.setattr(analyze_routes, 'ANALYSIS_PERSIST', True)
+    monkeypatch.setattr(bulk_routes, 'PERSIST_BATCH_SIZE', 2)
+    app = Flask('bulk-route-test')
+    app.register_blueprint(bulk_routes.bulk_bp, url_prefix='/api/v1/bulk')
+    client = app.test_client()
+    upload = 'a.com\nb.com\nc.com\n'
+
+    first = [json.loads(line) for line in client.post('/api/v1/bulk', data=upload).data.splitlines()]
+    assert sorted(record['cache'] for record in first) == ['MISS'] * 3
+    assert sorted(len(batch) for batch in store.batches) == [1, 2]
+    assert sorted(collected) == ['https://a.com', 'https://b.com', 'https://c.com']
+
+    second = [json.loads(line) for line in client.post('/api/v1/bulk', data=upload).data.splitlines()]
+    assert [record['cache'] for record in second] == ['HIT'] * 3
+    assert len(store.batches) == 2 and len(collected) == 3
+
+    client.post('/api/v1/bulk?refresh=1', data=upload)
+    assert len(collected) == 6
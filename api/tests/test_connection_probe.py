@@ -0,0 +1,113 @@
+"""Test the single-connection TLS probe and its certificate and header parsing."""
+
+import datetime
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from utils.storage.maxmind_geo import GeoIPManager, geoip_manager
+
+def _name(**fields):
+    oids = {'C': NameOID.COUNTRY_NAME, 'ST': NameOID.STATE_OR_PROVINCE_NAME, 'L': NameOID.LOCALITY_NAME,
+            'O': NameOID.ORGANIZATION_NAME, 'CN': NameOID.COMMON_NAME}
+    return x509.Name([x509.NameAttribute(oids[key], value) for key, value in fields.items()])
+
+@pytest.fixture(scope='module')
+def cert_files(tmp_path_factory):
+    """A self-signed certificate, so verification fails and the DER fallback is used."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    subject = _name(C='GB', ST='London', L='London', O='Probe Ltd', CN='localhost')
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(subject).issuer_name(subject)
+            .public_key(key.public_key()).serial_number(1)
+            .not_valid_before(now - datetime.timedelta(days=1)).not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256()))
+    directory = tmp_path_factory.mktemp('tls')
+    (directory / 'cert.pem').write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    (directory / 'key.pem').write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return str(directory / 'cert.pem'), str(directory / 'key.pem')
+
+class SiteStub(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive site: / redirects to /home, which only allows GET."""
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    requests = []
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def _reply(self, status, **headers):
+        self.requests.append((self.command, self.path, self.headers.get('Range')))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name.replace('_', '-'), value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.path == '/':
+            return self._reply(301, Location='/home')
+        self._reply(405, Allow='GET')
+
+    def do_GET(self):
+        self._reply(206, X_Powered_By='stub', CF_RAY='7ac7-SJC', Server_Timing='cfL4;desc=?proto=TCP&rtt=1500&min_rtt=1000')
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def site(cert_files):
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*cert_files)
+    SiteStub.connections = 0
+    SiteStub.requests = []
+    server = ThreadingHTTPServer(('localhost', 0), SiteStub)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+def test_probe_follows_redirect_and_falls_back_to_get_on_one_connection(site):
+    """Redirect, rejected HEAD and ranged GET all travel over the probe's single handshake."""
+    result = geoip_manager._probe_connection('localhost', site)
+
+    # The failed verified handshake never reaches the handler; one connection serves every request
+    assert SiteStub.connections == 1
+    assert SiteStub.requests == [('HEAD', '/', None), ('HEAD', '/home', None), ('GET', '/home', 'bytes=0-0')]
+    assert result['connection']['verified'] is False
+    assert result['connection']['first_byte_ms'] is not None
+    assert result['ssl']['error'].startswith('SSL verification failed')
+    assert {key: result['ssl'][key] for key in ('organization', 'country', 'state', 'locality', 'common_name', 'issuer')} == {
+        'organization': 'Probe Ltd', 'country': 'GB', 'state': 'London', 'locality': 'London',
+        'common_name': 'localhost', 'issuer': 'Probe Ltd',
+    }
+    headers = result['headers']
+    assert (headers['powered_by'], headers['cf_ray_location'], headers['server_min_rtt']) == ('stub', 'SJC', '1000')
+    assert headers['estimated_distance_km'] == '100'
+
+def test_cross_host_redirect_is_not_followed(site, monkeypatch):
+    """A redirect to another host ends the probe with the redirect's own headers."""
+    monkeypatch.setattr(SiteStub, 'do_HEAD', lambda self: self._reply(302, Location='https://elsewhere.example/', CF_RAY='8abc-LHR'))
+
+    headers = geoip_manager._probe_connection('localhost', site)['headers']
+
+    assert [request[:2] for request in SiteStub.requests] == [('HEAD', '/')]
+    assert headers['cf_ray_location'] == 'LHR'
+
+def test_parse_peer_cert_maps_subject_and_issuer():
+    """Decoded certificates map subject and issuer fields to signals."""
+    cert = {
+        'subject': ((('countryName', 'US'),), (('organizationName', 'Example Inc'),), (('commonName', 'example.com'),)),
+        'issuer': ((('countryName', 'US'),), (('organizationName', 'Let\'s Encrypt'),), (('commonName', 'R3'),)),
+    }
+    assert GeoIPManager._parse_peer_cert(cert) == {
+        'country': 'US', 'organization': 'Example Inc', 'common_name': 'example.com',
+        'issuer_country': 'US', 'issuer': 'Let\'s Encrypt', 'issuer_common_name': 'R3',
+    }
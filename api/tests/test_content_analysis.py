@@ -0,0 +1,96 @@
+"""Test the shared OpenAI client and batched content analysis against a local mock server."""
+
+import concurrent.futures
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils.helpers import content_analysis, openai_client
+from utils.helpers.content_analysis import ContentBatcher
+
+class OpenAIStub(BaseHTTPRequestHandler):
+    """OpenAI-compatible /v1/chat/completions that names each page after its URL."""
+    protocol_version = 'HTTP/1.1'
+    requests = []
+    # Responses to throttle with a 429 before answering
+    throttle = 0
+    connections = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.connections.add(self.client_address)
+        self.requests.append(body)
+        if OpenAIStub.throttle:
+            OpenAIStub.throttle -= 1
+            return self._send(429, {'error': {'message': 'Rate limit reached', 'type': 'requests'}},
+                              {'Retry-After': '0'})
+        pages = json.loads(body['messages'][1]['content'])['pages']
+        results = [{'id': page['id'], 'analysis': f"About {page['url']}",
+                    'organization': {'name': page['url'], 'type': 'Company'}} for page in pages]
+        self._send(200, {
+            'id': 'chatcmpl-test', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': json.dumps({'results': results})}}],
+            'usage': {'prompt_tokens': 10, 'completion_tokens': 10, 'total_tokens': 20},
+        })
+
+    def _send(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub(monkeypatch):
+    OpenAIStub.requests, OpenAIStub.throttle, OpenAIStub.connections = [], 0, set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OpenAIStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_BASE_URL', f'http://127.0.0.1:{server.server_port}/v1')
+    monkeypatch.setattr(openai_client, '_client', None)
+    yield OpenAIStub
+    server.shutdown()
+
+def page(text):
+    return {'links': [], 'text': text, 'title': None, 'lang': None, 'meta': {}, 'bytes_read': 0, 'truncated': False}
+
+def test_concurrent_pages_share_one_completion(stub, monkeypatch):
+    """Pages analyzed at the same time go out in one request, and each gets its own result."""
+    monkeypatch.setattr(content_analysis, '_batcher', ContentBatcher(batch_size=8, window=0.5))
+    urls = [f'https://example{i}.com' for i in range(5)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda url: content_analysis.analyze_content(url, page(f'Welcome to {url}')), urls))
+
+    assert len(stub.requests) == 1
+    assert len(json.loads(stub.requests[0]['messages'][1]['content'])['pages']) == 5
+    assert [result['organization']['name'] for result in results] == urls
+    assert results[0]['organization']['industry'] == 'N/A'
+
+    # A full batch is sent without waiting out the window
+    monkeypatch.setattr(content_analysis, '_batcher', ContentBatcher(batch_size=2, window=30))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda url: content_analysis.analyze_content(url, page('text')), urls[:2]))
+    assert len(stub.requests) == 2
+    assert len(stub.connections) == 1
+
+def test_rate_limited_requests_are_retried(stub, monkeypatch):
+    """429s are retried until the retry budget runs out, then the page gets no content signal."""
+    stub.throttle = 2
+    completion = openai_client.chat_completion([{'role': 'system', 'content': 'x'},
+                                                {'role': 'user', 'content': json.dumps({'pages': []})}])
+    assert completion.choices[0].message.content == '{"results": []}'
+    assert len(stub.requests) == 3
+
+    monkeypatch.setattr(openai_client, 'OPENAI_MAX_RETRIES', 1)
+    monkeypatch.setattr(content_analysis, '_batcher', ContentBatcher(batch_size=1))
+    stub.throttle = 5
+    assert content_analysis.analyze_content('https://example.com', page('text')) is None
+    assert len(stub.requests) == 5
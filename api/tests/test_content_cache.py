@@ -0,0 +1,58 @@
+"""Test the content-hash cache in front of LLM content analysis."""
+
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from api import db
+from api.models.cache import ContentAnalysisCacheEntry
+from utils.helpers import content_analysis
+from utils.helpers.content_analysis import ContentBatcher
+from utils.storage.content_cache import ContentAnalysisCache, content_key
+
+@pytest.fixture
+def app_context(monkeypatch):
+    app = Flask('content-cache-test')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    monkeypatch.setattr(content_analysis, '_content_cache', None)
+    monkeypatch.setattr(content_analysis, '_batcher', ContentBatcher(batch_size=1))
+    with app.app_context():
+        db.create_all()
+        yield
+
+def page(text):
+    return {'links': [], 'text': text, 'title': 'Acme', 'lang': None, 'meta': {}, 'bytes_read': 0, 'truncated': False}
+
+def test_unchanged_text_skips_the_model(app_context, monkeypatch):
+    """Re-analysis of the same text, give or take whitespace, is served from the cache."""
+    calls = []
+
+    def fake_analyze_pages(pages):
+        calls.append(pages)
+        return [{'analysis': f"About {url}", 'organization': {'name': 'Acme'}} for url, _ in pages]
+
+    monkeypatch.setattr(content_analysis, 'analyze_pages', fake_analyze_pages)
+
+    first = content_analysis.analyze_content('https://acme.com', page('We make  anvils.\n'))
+    again = content_analysis.analyze_content('https://acme.com', page('We make anvils.'))
+    content_analysis.analyze_content('https://acme.com', page('We make rockets.'))
+
+    assert len(calls) == 2
+    assert again == first == {'analysis': 'About https://acme.com', 'organization': {'name': 'Acme'}}
+    assert content_key('a  b', 'gpt-4o-mini', 2) != content_key('a b', 'gpt-4o', 2)
+    assert db.session.query(ContentAnalysisCacheEntry).count() == 2
+
+def test_least_recently_used_rows_are_evicted(app_context):
+    """Once stored payloads exceed the bound, the oldest-used rows go first."""
+    cache = ContentAnalysisCache(db, ContentAnalysisCacheEntry, max_bytes=350)
+    for i in range(3):
+        cache.set(f'key{i}', {'analysis': 'x' * 90}, 'model', 2)
+    # key0 was used more recently than key1
+    db.session.query(ContentAnalysisCacheEntry).filter_by(content_hash='key0').update(
+        {'last_used_at': datetime.utcnow() + timedelta(minutes=1)})
+    db.session.commit()
+
+    cache.set('key3', {'analysis': 'x' * 90}, 'model', 2)
+
+    assert sorted(row.content_hash for row in db.session.query(ContentAnalysisCacheEntry)) == ['key0', 'key2', 'key3']
+    assert cache.get('key1') is None and cache.get('key0') is not None
@@ -0,0 +1,122 @@
+"""Test concurrent DNS resolution and answer caching against a local stub DNS server."""
+
+import asyncio
+import socket
+import threading
+import time
+import dns.asyncresolver
+import dns.exception
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+import pytest
+from utils.helpers import dns_resolver
+
+# name -> {rdtype: (ttl, [rdata text])}; names not listed return NXDOMAIN
+ZONE = {
+    'example.test.': {
+        'A': (300, ['192.0.2.10']),
+        'MX': (300, ['10 mail.example.test.']),
+        'TXT': (0, ['"v=spf1 ip4:192.0.2.0/24 -all"']),
+    },
+    'slow.test.': {
+        'A': (300, ['192.0.2.20']),
+    },
+}
+
+class StubDNSServer:
+    """Minimal UDP DNS server answering from ZONE and counting queries."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        self.queries = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                wire, addr = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            query = dns.message.from_wire(wire)
+            question = query.question[0]
+            name = question.name.to_text()
+            rdtype = dns.rdatatype.to_text(question.rdtype)
+            self.queries.append((name, rdtype))
+            if name.startswith('slow.'):
+                continue  # never answer, so the client hits its deadline
+
+            response = dns.message.make_response(query)
+            records = ZONE.get(name)
+            if records is None:
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            elif rdtype in records:
+                ttl, values = records[rdtype]
+                response.answer.append(dns.rrset.from_text(name, ttl, 'IN', rdtype, *values))
+            self.sock.sendto(response.to_wire(), addr)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+@pytest.fixture
+def stub_server():
+    with StubDNSServer() as server:
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.nameservers = ['127.0.0.1']
+        resolver.port = server.port
+        dns_resolver.set_resolver(resolver)
+        yield server
+    dns_resolver.set_resolver(None)
+
+def test_resolve_many_and_cache(stub_server):
+    """All record types are answered in one call and repeat queries hit the cache."""
+    results = asyncio.run(dns_resolver.resolve_many('example.test', ('A', 'MX', 'TXT', 'AAAA')))
+
+    assert results['A'] == ['192.0.2.10']
+    assert results['MX'] == ['10 mail.example.test.']
+    assert results['TXT'] == ['"v=spf1 ip4:192.0.2.0/24 -all"']
+    assert isinstance(results['AAAA'], dns.resolver.NoAnswer)
+    assert len(stub_server.queries) == 4
+
+    again = asyncio.run(dns_resolver.resolve_many('example.test', ('A', 'MX', 'TXT', 'AAAA')))
+    assert {rdtype: again[rdtype] for rdtype in ('A', 'MX', 'TXT')} == {
+        rdtype: results[rdtype] for rdtype in ('A', 'MX', 'TXT')
+    }
+    assert isinstance(again['AAAA'], dns.resolver.NoAnswer)
+    # A and MX come from the cache, AAAA from the negative cache; TXT has TTL 0
+    assert stub_server.queries[4:] == [('example.test.', 'TXT')]
+
+def test_nxdomain_is_cached(stub_server):
+    """NXDOMAIN answers are cached and re-raised without another query."""
+    for _ in range(2):
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            asyncio.run(dns_resolver.resolve('missing.test', 'A'))
+    assert stub_server.queries == [('missing.test.', 'A')]
+
+def test_overall_deadline_returns_partial_results(stub_server):
+    """Queries still running at the deadline are reported as timeouts."""
+    start = time.perf_counter()
+    results = asyncio.run(dns_resolver.resolve_many('slow.test', ('A', 'MX'), lifetime=5.0, deadline=0.3))
+
+    assert time.perf_counter() - start < 2.0
+    assert isinstance(results['A'], dns.exception.Timeout)
+    assert isinstance(results['MX'], dns.exception.Timeout)
+
+def test_run_sync_inside_running_loop(stub_server):
+    """The synchronous wrapper also works when an event loop is already running."""
+    async def caller():
+        return dns_resolver.run_sync(dns_resolver.resolve('example.test', 'A'))
+
+    assert asyncio.run(caller()) == ['192.0.2.10']
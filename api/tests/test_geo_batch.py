@@ -0,0 +1,33 @@
+"""Test request validation of the batch IP lookup endpoint."""
+
+import json
+import pytest
+from flask import Flask
+from routes.rest import geo
+from utils.storage.maxmind_geo import geoip_manager
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(geoip_manager, 'lookup_ips', lambda ips: ({'ip': ip} for ip in dict.fromkeys(ips)))
+    app = Flask('geo-test')
+    app.register_blueprint(geo.geo_bp, url_prefix='/api/v1/geo')
+    return app.test_client()
+
+def test_malformed_line_is_rejected_before_streaming(client):
+    """A bad NDJSON line is a 400, not a broken stream; valid mixed input streams normally."""
+    response = client.post('/api/v1/geo/batch', data='1.1.1.1\n"x\n', content_type='text/plain')
+    assert response.status_code == 400
+    assert 'Line 2' in response.get_json()['error']
+
+    response = client.post('/api/v1/geo/batch', data='1.1.1.1\n"8.8.8.8"\n1.1.1.1\n', content_type='text/plain')
+    assert [json.loads(line)['ip'] for line in response.data.splitlines()] == ['1.1.1.1', '8.8.8.8']
+
+def test_batch_size_cap_applies_to_both_formats(client, monkeypatch):
+    """Plain-text bodies are capped like JSON ones."""
+    monkeypatch.setattr(geo, 'MAX_BATCH_SIZE', 2)
+
+    plain = client.post('/api/v1/geo/batch', data='1.1.1.1\n2.2.2.2\n3.3.3.3\n', content_type='text/plain')
+    as_json = client.post('/api/v1/geo/batch', json={'ips': ['1.1.1.1', '2.2.2.2', '3.3.3.3']})
+
+    assert plain.status_code == as_json.status_code == 413
+    assert plain.get_json()['details'] == {'max_batch_size': 2}
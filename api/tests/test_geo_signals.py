@@ -0,0 +1,45 @@
+"""Test the per-collector deadlines of the additional CDN signal collectors."""
+
+import concurrent.futures
+import threading
+import time
+import pytest
+from utils.storage import maxmind_geo
+from utils.storage.maxmind_geo import geoip_manager
+
+@pytest.fixture
+def slow_probe(monkeypatch):
+    """Fast DNS/IP collectors, a connection probe that hangs, and one-worker pools per collector."""
+    release = threading.Event()
+    probes = []
+
+    def probe(domain):
+        probes.append(domain)
+        release.wait(5)
+        return {'ssl': {}, 'headers': {}, 'connection': {}}
+
+    executors = {name: concurrent.futures.ThreadPoolExecutor(max_workers=1) for name in maxmind_geo.SIGNAL_COLLECTOR_TIMEOUTS}
+    monkeypatch.setattr(geoip_manager, '_signal_executors', executors)
+    monkeypatch.setattr(geoip_manager, '_get_dns_location_signals', lambda domain: {'mx_records': ['mx.' + domain]})
+    monkeypatch.setattr(geoip_manager, '_get_ip_location_signals', lambda ip: {'reverse_dns': 'host.' + ip})
+    monkeypatch.setattr(geoip_manager, '_probe_connection', probe)
+    monkeypatch.setitem(maxmind_geo.SIGNAL_COLLECTOR_TIMEOUTS, 'connection', 0.2)
+    yield probes
+    release.set()
+    for executor in executors.values():
+        executor.shutdown(wait=True)
+
+def test_slow_collector_times_out_without_starving_the_others(slow_probe):
+    """A hanging probe only costs its own deadline, and its straggler doesn't block other collectors."""
+    for domain in ('slow.example', 'next.example'):
+        start = time.monotonic()
+        signals, timed_out = geoip_manager._collect_additional_signals(domain, '203.0.113.5')
+
+        assert time.monotonic() - start < 1.0
+        assert timed_out == ['ssl', 'headers']
+        assert signals['ssl'] is None and signals['connection'] is None
+        assert signals['dns'] == {'mx_records': [f'mx.{domain}']}
+        assert signals['ip'] == {'reverse_dns': 'host.203.0.113.5'}
+
+    # The second probe was still queued behind the straggler at its deadline, so it was cancelled
+    assert slow_probe == ['slow.example']
@@ -0,0 +1,148 @@
+"""Test GeoLite2 downloads against a local MaxMind stub."""
+
+import hashlib
+import io
+import os
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from utils.storage import geoip_download
+from utils.storage.geoip_download import ChecksumMismatchError, DownloadError, download_edition, download_editions
+
+AUTH = ('123', 'test-key')
+
+def _archive(edition, payload):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name, data in ((f'{edition}_20260101/COPYRIGHT.txt', b'(c)'),
+                           (f'{edition}_20260101/{edition}.mmdb', payload)):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+class MaxMindStub(BaseHTTPRequestHandler):
+    """Serves /<edition>/download?suffix=tar.gz[.sha256], honouring Range requests."""
+    archives = {}
+    checksums = {}
+    # Edition -> bytes to send before dropping the connection, for the next full request
+    cut_after = {}
+    ranges = []
+
+    def do_GET(self):
+        edition = urlparse(self.path).path.strip('/').split('/')[0]
+        suffix = parse_qs(urlparse(self.path).query)['suffix'][0]
+        body = self.archives[edition]
+        if suffix == 'tar.gz.sha256':
+            text = f"{self.checksums.get(edition, hashlib.sha256(body).hexdigest())}  {edition}_20260101.tar.gz\n"
+            return self._send(200, text.encode())
+
+        start = 0
+        if 'Range' in self.headers:
+            start = int(self.headers['Range'].split('=')[1].rstrip('-'))
+            self.ranges.append((edition, start))
+            if start >= len(body):
+                return self._send(416, b'')
+        status = 206 if start else 200
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body) - start))
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        self.end_headers()
+
+        cut = self.cut_after.pop(edition, None)
+        if cut is not None:
+            self.wfile.write(body[start:start + cut])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def _send(self, status, data):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub(monkeypatch):
+    MaxMindStub.archives, MaxMindStub.checksums, MaxMindStub.cut_after, MaxMindStub.ranges = {}, {}, {}, []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MaxMindStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(geoip_download, 'MAXMIND_DOWNLOAD_URL', f'http://127.0.0.1:{server.server_port}')
+    yield MaxMindStub
+    server.shutdown()
+
+def test_interrupted_download_resumes_with_range(stub, tmp_path):
+    """A transfer cut off midway continues from the partial file and the member is extracted."""
+    payload = os.urandom(300_000)
+    stub.archives['GeoLite2-City'] = _archive('GeoLite2-City', payload)
+    stub.cut_after['GeoLite2-City'] = 200_000
+
+    db_path = download_edition('GeoLite2-City', tmp_path, AUTH)
+
+    assert db_path == tmp_path / 'GeoLite2-City.mmdb'
+    assert db_path.read_bytes() == payload
+    assert stub.ranges and stub.ranges[0][1] > 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['GeoLite2-City.mmdb']
+
+def test_checksum_mismatch_is_rejected(stub, tmp_path):
+    """An archive that never matches its published SHA256 is not installed."""
+    stub.archives['GeoLite2-ASN'] = _archive('GeoLite2-ASN', b'asn data')
+    stub.checksums['GeoLite2-ASN'] = '0' * 64
+
+    with pytest.raises(ChecksumMismatchError):
+        download_edition('GeoLite2-ASN', tmp_path, AUTH)
+    assert not (tmp_path / 'GeoLite2-ASN.mmdb').exists()
+
+def test_editions_download_concurrently(stub, tmp_path):
+    """Every edition is fetched, and one failure doesn't stop the others."""
+    for edition in ('GeoLite2-City', 'GeoLite2-Country'):
+        stub.archives[edition] = _archive(edition, edition.encode())
+    stub.archives['GeoLite2-ASN'] = b'not a tarball'
+
+    results = download_editions(['GeoLite2-City', 'GeoLite2-Country', 'GeoLite2-ASN'], tmp_path, AUTH)
+
+    assert results['GeoLite2-ASN'] is None
+    assert results['GeoLite2-City'].read_bytes() == b'GeoLite2-City'
+    assert results['GeoLite2-Country'].read_bytes() == b'GeoLite2-Country'
+
+def test_verified_archive_that_fails_extraction_is_discarded(stub, tmp_path):
+    """A matching but unreadable archive isn't kept, so the next attempt downloads afresh."""
+    stub.archives['GeoLite2-ASN'] = b'not a tarball'
+
+    with pytest.raises(DownloadError):
+        download_edition('GeoLite2-ASN', tmp_path, AUTH)
+    assert list(tmp_path.iterdir()) == []
+
+    stub.archives['GeoLite2-ASN'] = _archive('GeoLite2-ASN', b'asn data')
+    assert download_edition('GeoLite2-ASN', tmp_path, AUTH).read_bytes() == b'asn data'
+    assert stub.ranges == []
+
+def test_same_edition_downloads_do_not_share_files(stub, tmp_path):
+    """Refreshers of several workers fetching one edition into one directory each get a whole database."""
+    payload = os.urandom(300_000)
+    stub.archives['GeoLite2-City'] = _archive('GeoLite2-City', payload)
+    results, errors = [], []
+
+    def download():
+        try:
+            results.append(download_edition('GeoLite2-City', tmp_path, AUTH))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=download) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [path.read_bytes() == payload for path in results] == [True] * 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['GeoLite2-City.mmdb']
@@ -0,0 +1,182 @@
+"""Test the MaxMind lookup memo, reader hot swaps and update detection against stub readers."""
+
+import ipaddress
+import os
+import threading
+from types import SimpleNamespace
+import pytest
+from utils.storage import maxmind_geo
+from utils.storage.maxmind_geo import geoip_manager
+from utils.storage.s3_bucket import s3_manager
+from utils.storage.ttl_cache import TTLCache
+
+class StubReader:
+    """City reader answering every IP in one network with a fixed country."""
+
+    def __init__(self, country, network='203.0.113.0/24', on_query=None):
+        self.country = country
+        self.network = ipaddress.ip_network(network)
+        self.on_query = on_query
+        self.queries = []
+        self.closed = False
+
+    def city(self, ip):
+        if self.closed:
+            raise RuntimeError("reader is closed")
+        self.queries.append(ip)
+        if self.on_query is not None:
+            self.on_query()
+        in_network = ipaddress.ip_address(ip) in self.network
+        return SimpleNamespace(
+            city=SimpleNamespace(name='Somewhere'),
+            subdivisions=None,
+            country=SimpleNamespace(name=self.country, iso_code='XX'),
+            location=SimpleNamespace(latitude=1.0, longitude=2.0),
+            traits=SimpleNamespace(network=self.network if in_network else ipaddress.ip_network(f'{ip}/32')),
+        )
+
+    def metadata(self):
+        return SimpleNamespace(build_epoch=1)
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def manager(monkeypatch):
+    """The shared manager with a stub city reader and empty memo, restored afterwards."""
+    monkeypatch.setattr(geoip_manager, '_started', True)
+    monkeypatch.setattr(geoip_manager, '_readers', {'city': StubReader('Old')})
+    monkeypatch.setattr(geoip_manager, '_reader_info', {'city': {'swaps': 0, 'last_swap_ms': None}})
+    monkeypatch.setattr(geoip_manager, '_retired_readers', [])
+    monkeypatch.setattr(geoip_manager, '_lookup_cache', TTLCache(maxsize=100, ttl=60))
+    monkeypatch.setattr(geoip_manager, '_cached_prefix_lens', set())
+    monkeypatch.setattr(geoip_manager, '_lookup_cache_hits', 0)
+    monkeypatch.setattr(geoip_manager, '_lookup_cache_misses', 0)
+    return geoip_manager
+
+def lookup(manager, ip):
+    result = {}
+    manager._do_maxmind_lookups(ip, result)
+    return result
+
+def test_memo_serves_ips_and_their_networks(manager):
+    """Repeat IPs and other IPs of a cached network skip the reader; other networks don't."""
+    reader = manager._readers['city']
+
+    assert lookup(manager, '203.0.113.5')['network'] == '203.0.113.0/24'
+    assert lookup(manager, '203.0.113.5')['country'] == 'Old'
+    assert lookup(manager, '203.0.113.77')['country'] == 'Old'
+    lookup(manager, '198.51.100.1')
+
+    assert reader.queries == ['203.0.113.5', '198.51.100.1']
+    assert manager.get_cache_stats()['hits'] == 2
+    assert manager.get_cache_stats()['network_prefixes'] == 2
+
+def test_reader_swap_invalidates_memo(manager, monkeypatch):
+    """Swapping a reader bumps the generation and drops memoized answers of the old database."""
+    lookup(manager, '203.0.113.5')
+    generation = manager._readers_generation
+    new_reader = StubReader('New')
+    monkeypatch.setattr(manager, '_load_reader', lambda db_type: new_reader)
+
+    assert manager._swap_reader('city')
+    assert manager._readers_generation > generation
+    assert lookup(manager, '203.0.113.77')['country'] == 'New'
+    assert new_reader.queries == ['203.0.113.77']
+
+def test_lookup_racing_a_swap_is_not_memoized(manager, monkeypatch):
+    """An answer from a reader that was swapped out mid-lookup isn't cached."""
+    new_reader = StubReader('New')
+    monkeypatch.setattr(manager, '_load_reader', lambda db_type: new_reader)
+    manager._readers['city'].on_query = lambda: manager._swap_reader('city')
+
+    assert lookup(manager, '203.0.113.5')['country'] == 'Old'
+    assert lookup(manager, '203.0.113.5')['country'] == 'New'
+    assert manager.get_cache_stats()['hits'] == 0
+
+def test_swaps_under_concurrent_lookups_close_old_readers_after_grace(manager, monkeypatch):
+    """Lookups never hit a closed reader while swapping; retired readers close only after the grace period."""
+    readers = [manager._readers['city']]
+
+    def load_reader(db_type):
+        readers.append(StubReader(f'Gen{len(readers)}'))
+        return readers[-1]
+
+    monkeypatch.setattr(manager, '_load_reader', load_reader)
+    stop = threading.Event()
+    failures = []
+
+    def lookups():
+        while not stop.is_set():
+            fields, _ = manager._query_maxmind('203.0.113.5')
+            if not fields.get('country'):
+                failures.append(fields)
+
+    threads = [threading.Thread(target=lookups) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(20):
+        manager._swap_reader('city')
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    assert manager._reader_info['city']['swaps'] == 20
+    manager._close_retired_readers()
+    assert not any(reader.closed for reader in readers)
+
+    monkeypatch.setattr(maxmind_geo, 'READER_GRACE_PERIOD', 0.0)
+    manager._close_retired_readers()
+    assert all(reader.closed for reader in readers[:-1])
+    assert not readers[-1].closed and manager._readers['city'] is readers[-1]
+    assert manager._retired_readers == []
+
+@pytest.fixture
+def on_disk(manager, monkeypatch, tmp_path):
+    """A city database file served by a stub reader, with S3 reporting ETag "a"."""
+    path = tmp_path / 'GeoLite2-City.mmdb'
+    path.write_bytes(b'v1')
+    state = {'path': path, 'etag': '"a"', 'downloads': []}
+
+    def download_from_s3(db_type):
+        state['downloads'].append(db_type)
+        path.write_bytes(b'v2')
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+        return True
+
+    monkeypatch.setattr(manager, 'local_path', tmp_path)
+    monkeypatch.setattr(manager, 'databases', {'city': path.name})
+    monkeypatch.setattr(manager, '_open_mmap_reader', lambda db_path: StubReader('Disk'))
+    monkeypatch.setattr(manager, '_download_from_s3', download_from_s3)
+    monkeypatch.setattr(s3_manager, 'get_object_info', lambda key: {'etag': state['etag'], 'last_modified': None})
+    monkeypatch.setattr(manager, '_last_refresh_check', None)
+    monkeypatch.setattr(manager, '_last_refresh_error', None)
+    manager._reader_info['city'].update(etag='"a"', mtime=path.stat().st_mtime)
+    return state
+
+def test_refresh_swaps_only_on_etag_or_mtime_change(manager, on_disk):
+    """Unchanged databases are left alone; a new S3 ETag downloads and swaps; a replaced file swaps."""
+    assert manager.refresh_databases() == []
+    assert on_disk['downloads'] == []
+
+    on_disk['etag'] = '"b"'
+    assert manager.refresh_databases() == ['city']
+    assert on_disk['downloads'] == ['city']
+    assert manager._reader_info['city']['etag'] == '"b"'
+    assert manager.refresh_databases() == []
+
+    path = on_disk['path']
+    os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+    assert manager.refresh_databases() == ['city']
+    assert on_disk['downloads'] == ['city']
+
+def test_batch_lookups_read_raw_records_from_the_paired_reader(manager):
+    """lookup_ips() reads raw records through the reader's public maxminddb reader."""
+    record = {'city': {'names': {'en': 'Somewhere'}}, 'country': {'names': {'en': 'Raw'}, 'iso_code': 'XX'}}
+    manager._readers['city'].records = SimpleNamespace(get_with_prefix_len=lambda ip: (record, 24))
+
+    [result] = manager.lookup_ips(['203.0.113.5', '203.0.113.5'])
+
+    assert (result['city'], result['country'], result['network']) == ('Somewhere', 'Raw', '203.0.113.0/24')
+    assert manager._readers['city'].queries == []
@@ -0,0 +1,74 @@
+"""Test that health probes are served from cached background checks."""
+
+import time
+import pytest
+from flask import Flask
+from sqlalchemy import event
+from api import db
+from routes.rest import health
+from utils.monitoring.health_checks import HealthMonitor
+
+@pytest.fixture
+def app(monkeypatch):
+    monitor = HealthMonitor(interval=3600, stale_after=60, required=['database'])
+    monkeypatch.setattr(health, 'health_monitor', monitor)
+    app = Flask('health-test')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    app.register_blueprint(health.router, url_prefix='/api')
+    # Only the database matters here; keep GeoIP and OpenAI out of the test
+    monitor._checks = {'database': monitor._checks['database']}
+    yield app
+    monitor.stop()
+
+def test_probes_reuse_cached_results(app):
+    """Once the background run has finished, probes answer without connecting to the database."""
+    monitor = health.health_monitor
+    client = app.test_client()
+    assert client.get('/api/health/live').get_json() == {'status': 'alive'}
+    assert not monitor.is_running()
+    monitor.start()
+    deadline = time.time() + 5
+    while 'database' not in monitor.snapshot()['checks'] and time.time() < deadline:
+        time.sleep(0.01)
+
+    connects = []
+    with app.app_context():
+        event.listen(db.engine, 'connect', lambda *args: connects.append(args))
+    for _ in range(20):
+        response = client.get('/api/health/ready')
+        assert response.status_code == 200
+    body = client.get('/api/health').get_json()
+
+    assert connects == []
+    assert body['status'] == 'healthy' and body['database'] == 'connected'
+    assert body['stale'] is False and body['failing'] == []
+
+def test_readiness_fails_on_stale_or_failing_checks(app, monkeypatch):
+    """Old results from a stalled checker, or a required check that errors, take the instance out of rotation."""
+    monitor = health.health_monitor
+    # A checker thread that is alive but never runs the checks again
+    monkeypatch.setattr(monitor, '_loop', lambda: monitor._stop.wait())
+    monitor.start()
+    monitor.run_checks()
+    monitor._results['database']['checked_at'] -= 120
+
+    response = app.test_client().get('/api/health/ready')
+    assert response.status_code == 503
+    assert response.get_json()['failing'] == ['database'] and response.get_json()['stale'] is True
+
+    monitor.register('database', lambda: 1 / 0)
+    monitor.run_checks()
+    response = app.test_client().get('/api/health')
+    assert response.status_code == 503
+    assert response.get_json()['database'] == 'error'
+
+def test_probes_refresh_stale_results_without_a_checker(app):
+    """With no checker thread, a probe reruns missing or stale checks itself instead of starting one."""
+    monitor = health.health_monitor
+    client = app.test_client()
+
+    assert client.get('/api/health/ready').status_code == 200
+    monitor._results['database']['checked_at'] -= 120
+    assert client.get('/api/health/ready').status_code == 200
+    assert not monitor.is_running()
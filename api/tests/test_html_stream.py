@@ -0,0 +1,49 @@
+"""Test the streaming HTML page parser."""
+
+from utils.helpers.html_stream import parse_html, parse_html_stream
+
+PAGE = """<!doctype html><html lang="en-GB"><head>
+<meta charset="utf-8"><title> Acme  Café </title>
+<meta name="description" content="Widgets">
+<meta property="og:locale" content="en_GB">
+<script>var colour = "ignored";</script><style>.x{}</style>
+</head><body>
+<p>Visit us at 10 Downing Street, London SW1A 2AA</p>
+<noscript>Enable JavaScript</noscript>
+<a href="https://twitter.com/acme">Twitter</a> <a href="/about">About&nbsp;us</a>
+</body></html>"""
+
+def test_extracts_links_text_and_metadata():
+    """Anchors, visible text, title, lang and meta tags come out of one pass."""
+    page = parse_html(PAGE)
+
+    assert page['links'] == ['https://twitter.com/acme', '/about']
+    assert page['text'] == 'Visit us at 10 Downing Street, London SW1A 2AA Twitter About\xa0us'
+    assert page['title'] == 'Acme Café'
+    assert page['lang'] == 'en-GB'
+    assert page['meta'] == {'description': 'Widgets', 'og:locale': 'en_GB'}
+
+def test_stream_matches_whole_parse_across_chunk_boundaries():
+    """Splitting the bytes anywhere, even inside a UTF-8 sequence, gives the same result."""
+    data = PAGE.encode('utf-8')
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+    page = parse_html_stream(chunks)
+    whole = parse_html(PAGE)
+
+    assert {k: page[k] for k in ('links', 'text', 'title', 'meta')} == {k: whole[k] for k in ('links', 'text', 'title', 'meta')}
+    assert page['bytes_read'] == len(data) and not page['truncated']
+
+def test_byte_cap_stops_reading():
+    """Nothing past max_bytes is consumed from the stream."""
+    consumed = []
+
+    def chunks():
+        for i in range(1000):
+            consumed.append(i)
+            yield f'<p>paragraph {i}</p>'.encode()
+
+    page = parse_html_stream(chunks(), max_bytes=200)
+
+    assert page['truncated'] and page['bytes_read'] == 200
+    assert len(consumed) < 20
+    assert page['text'].startswith('paragraph 0 paragraph 1')
@@ -0,0 +1,50 @@
+"""Test the background analysis job manager."""
+
+import threading
+import pytest
+from utils.helpers.jobs import COMPLETE, FAILED, JobManager, QueueFullError
+
+def test_job_records_signal_events_in_order():
+    """Signals added by the work function are recorded between the status events."""
+    manager = JobManager(workers=1, max_pending=4)
+
+    def work(job):
+        job.add_event('ip_geolocation', {'country': 'GB'})
+        job.add_event('social', {'links': {}})
+        return {'ok': True}
+
+    job = manager.submit('https://example.com', work)
+    events = []
+    while not (job.finished and len(events) == len(job.events)):
+        events += job.wait_for_events(len(events), timeout=5)
+    manager.shutdown()
+
+    assert [e['event'] for e in events] == ['status', 'status', 'ip_geolocation', 'social', 'status']
+    assert events[-1]['data']['status'] == COMPLETE
+    assert manager.get(job.id).result == {'ok': True}
+
+def test_failed_job_reports_error():
+    """An exception in the work function marks the job as failed."""
+    manager = JobManager(workers=1, max_pending=4)
+
+    def work(job):
+        raise RuntimeError("boom")
+
+    job = manager.submit('https://example.com', work)
+    manager.shutdown()
+
+    assert job.status == FAILED
+    assert job.to_dict()['error'] == 'boom'
+
+def test_queue_full_rejects_new_jobs():
+    """Submissions beyond max_pending are refused until a job finishes."""
+    manager = JobManager(workers=1, max_pending=1)
+    release = threading.Event()
+
+    manager.submit('https://example.com', lambda job: release.wait(5) and {})
+    with pytest.raises(QueueFullError):
+        manager.submit('https://example.org', lambda job: {})
+    release.set()
+    manager.shutdown()
+
+    assert manager.stats()['pending'] == 0
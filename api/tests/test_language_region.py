@@ -0,0 +1,36 @@
+"""Test the tokenized language-region scorer."""
+
+import json
+from utils.helpers import spelling_variants
+from utils.helpers.spelling_variants import score_regions
+
+def test_whole_words_only():
+    """'color' counts for the US, but not inside 'Colorado'."""
+    assert score_regions("Visit Colorado and Coloradans") == {}
+    assert score_regions("Pick a color") == {'US': 1.0}
+
+def test_per_region_scores():
+    """Words credit every region that spells them that way."""
+    scores = score_regions("Our centre organises colourful programmes. Prices in rupees.")
+
+    assert scores['IN'] == 1.0
+    assert scores['UK'] == scores['AU'] == 0.8
+    assert scores['CA'] == 0.4
+    assert 'US' not in scores
+
+def test_canadian_mix():
+    """-our with -ize spelling points to Canada."""
+    scores = score_regions("We organize neighbourhood theatre nights")
+    assert max(scores, key=scores.get) == 'CA'
+
+def test_extra_dictionary_is_loaded_once(tmp_path, monkeypatch):
+    """Extra words come from SPELLING_VARIANTS_PATH, read when the index is first built."""
+    extra = tmp_path / 'variants.json'
+    extra.write_text(json.dumps({"AU": ["brekkie"]}))
+    monkeypatch.setenv("SPELLING_VARIANTS_PATH", str(extra))
+    monkeypatch.setattr(spelling_variants, '_index', None)
+
+    assert score_regions("brekkie") == {'AU': 1.0}
+    extra.write_text(json.dumps({"UK": ["brekkie"]}))
+    assert score_regions("brekkie") == {'AU': 1.0}
+    monkeypatch.setattr(spelling_variants, '_index', None)
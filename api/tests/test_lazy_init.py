@@ -0,0 +1,29 @@
+"""Test that importing the storage managers does no I/O until they are used."""
+
+import os
+import subprocess
+import sys
+
+def test_import_does_not_connect_or_download(tmp_path):
+    """With S3 and MaxMind configured but unreachable, import leaves both managers untouched."""
+    env = dict(os.environ)
+    env.update({
+        'S3_BUCKET_NAME': 'unreachable-bucket',
+        'AWS_ENDPOINT_URL_S3': 'http://192.0.2.1',
+        'MAXMIND_ACCOUNT_ID': '0',
+        'MAXMIND_LICENSE_KEY': 'test',
+        'GEOIP_DB_PATH': str(tmp_path / 'geoip'),
+        'PYTHONPATH': os.pathsep.join(p for p in sys.path if p),
+    })
+    code = (
+        "import sys\n"
+        "from utils.storage.maxmind_geo import geoip_manager\n"
+        "from utils.storage.s3_bucket import s3_manager\n"
+        "assert not geoip_manager._started\n"
+        "assert not s3_manager._client_ready\n"
+        "assert 'boto3' not in sys.modules\n"
+    )
+    completed = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, timeout=60)
+
+    assert completed.returncode == 0, completed.stderr
+    assert not (tmp_path / 'geoip').exists()
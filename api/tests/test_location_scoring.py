@@ -0,0 +1,62 @@
+"""Test that batch location scoring agrees with the scalar scorer."""
+
+import logging
+import random
+import pytest
+from utils.helpers.location_scoring import (
+    SOURCE_NAMES, batch_combine_location_signals, combine_location_signals,
+    location_signal_columns, location_source
+)
+
+np = pytest.importorskip("numpy")
+
+def _random_rows(count, seed=0):
+    rng = random.Random(seed)
+    # Confidences on a coarse grid hit half-way rounding cases often
+    grid = [i / 20 for i in range(21)] + [0.9, 0.7, 0.6, 0.35]
+
+    def confidence():
+        return rng.choice(grid) if rng.random() < 0.7 else rng.random()
+
+    rows = []
+    for _ in range(count):
+        ip = None
+        if rng.random() < 0.7:
+            ip = {'country': 'United States', 'city': rng.choice(['Austin', None]),
+                  'confidence': confidence(), 'source': 'maxmind'}
+        language = None
+        if rng.random() < 0.5:
+            language = {'US': confidence(), 'UK': confidence()}
+        addresses = []
+        if rng.random() < 0.3:
+            addresses = [{'address': f'{n} Main Street, Austin, TX 78701', 'confidence': confidence(), 'type': 'US'}
+                         for n in range(rng.randint(1, 3))]
+        rows.append((ip, language, addresses))
+    return rows
+
+def test_batch_matches_scalar():
+    """Confidence and final-location source agree exactly, row by row."""
+    rows = _random_rows(20000)
+    logging.disable(logging.INFO)
+    try:
+        expected = [combine_location_signals(ip, language, addresses, None, None) for ip, language, addresses in rows]
+    finally:
+        logging.disable(logging.NOTSET)
+
+    columns = location_signal_columns(*zip(*rows))
+    batch = batch_combine_location_signals(**columns)
+
+    assert batch['confidence'].tolist() == [result['confidence'] for result in expected]
+    assert batch['source'].tolist() == [location_source(result) for result in expected]
+    assert set(SOURCE_NAMES[code] for code in batch['source'].tolist()) == {'none', 'addresses', 'ip', 'language'}
+
+def test_half_way_rounding_matches_round():
+    """Totals that sit on a rounding boundary round the same way as round()."""
+    totals = [0.125, 0.285, 0.145, 0.675, 1.005, 0.015]
+    batch = batch_combine_location_signals(
+        ip_confidence=np.array(totals) / 0.25,
+        ip_has_city=np.zeros(len(totals), dtype=bool),
+        language_confidence=np.full(len(totals), np.nan),
+        address_confidence=np.full(len(totals), np.nan),
+    )
+    assert batch['confidence'].tolist() == [round(t / 0.25 * 0.25, 2) for t in totals]
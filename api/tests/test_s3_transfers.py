@@ -0,0 +1,166 @@
+"""Test S3Manager transfers against a local S3 stand-in."""
+
+import hashlib
+import json
+import os
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+import pytest
+from utils.storage import s3_bucket
+from utils.storage.s3_bucket import MANIFEST_NAME, S3Manager
+
+class S3Stub(BaseHTTPRequestHandler):
+    """Path-style HEAD/GET/PUT object API with ETags, Range, If-None-Match and If-Match."""
+    objects = {}
+    etags = {}
+    gets = []
+    # Key -> new body that replaces the object right after its next HEAD
+    replace_after_head = {}
+
+    def _key(self):
+        parts = urlparse(self.path).path.lstrip('/').split('/', 1)
+        return parts[1] if len(parts) > 1 else None
+
+    def _object_headers(self, key, length):
+        self.send_header('ETag', self.etags[key])
+        self.send_header('Content-Length', str(length))
+        self.send_header('Last-Modified', formatdate(usegmt=True))
+        self.send_header('Accept-Ranges', 'bytes')
+
+    def do_HEAD(self):
+        key = self._key()
+        if key is None:
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            return self.end_headers()
+        if key not in self.objects:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            return self.end_headers()
+        if self.headers.get('If-None-Match') == self.etags[key]:
+            self.send_response(304)
+            self.send_header('ETag', self.etags[key])
+            return self.end_headers()
+        self.send_response(200)
+        self._object_headers(key, len(self.objects[key]))
+        self.end_headers()
+        if key in self.replace_after_head:
+            put_object(key, self.replace_after_head.pop(key))
+
+    def do_GET(self):
+        key = self._key()
+        body = self.objects[key]
+        self.gets.append((key, self.headers.get('Range')))
+        if self.headers.get('If-Match') not in (None, self.etags[key]):
+            self.send_response(412)
+            self.send_header('Content-Length', '0')
+            return self.end_headers()
+        if 'Range' in self.headers:
+            start, end = self.headers['Range'].split('=')[1].split('-')
+            start, end = int(start), min(int(end or len(body) - 1), len(body) - 1)
+            self.send_response(206)
+            self._object_headers(key, end - start + 1)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(body)}')
+            self.end_headers()
+            return self.wfile.write(body[start:end + 1])
+        self.send_response(200)
+        self._object_headers(key, len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        key = self._key()
+        self.objects[key] = self.rfile.read(int(self.headers['Content-Length']))
+        self.etags[key] = f'"{hashlib.md5(self.objects[key]).hexdigest()}"'
+        self.send_response(200)
+        self.send_header('ETag', self.etags[key])
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def put_object(key, data, etag=None):
+    S3Stub.objects[key] = data
+    S3Stub.etags[key] = etag or f'"{hashlib.md5(data).hexdigest()}"'
+
+@pytest.fixture
+def s3(monkeypatch):
+    S3Stub.objects, S3Stub.etags, S3Stub.gets, S3Stub.replace_after_head = {}, {}, [], {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), S3Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for name, value in {
+        'S3_BUCKET_NAME': 'geo-bucket',
+        'AWS_ENDPOINT_URL_S3': f'http://127.0.0.1:{server.server_port}',
+        'AWS_ACCESS_KEY_ID': 'test',
+        'AWS_SECRET_ACCESS_KEY': 'test',
+        'AWS_DEFAULT_REGION': 'us-east-1',
+        'AWS_REQUEST_CHECKSUM_CALCULATION': 'when_required',
+        'AWS_RESPONSE_CHECKSUM_VALIDATION': 'when_required',
+    }.items():
+        monkeypatch.setenv(name, value)
+    # Small parts so a modest object takes the multipart path
+    monkeypatch.setattr(s3_bucket, 'S3_MULTIPART_THRESHOLD', 64 * 1024)
+    monkeypatch.setattr(s3_bucket, 'S3_MULTIPART_CHUNKSIZE', 64 * 1024)
+    yield S3Manager()
+    server.shutdown()
+
+def test_download_is_multipart_and_conditional(s3, tmp_path):
+    """A large object arrives in ranged parts; an unchanged one is revalidated, not re-fetched."""
+    data = os.urandom(300 * 1024)
+    put_object('geoip/GeoLite2-City.mmdb', data)
+    local = tmp_path / 'GeoLite2-City.mmdb'
+
+    assert s3.download_file('geoip/GeoLite2-City.mmdb', local)
+    assert local.read_bytes() == data
+    assert len(S3Stub.gets) == 5 and all(range_ for _, range_ in S3Stub.gets)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest['GeoLite2-City.mmdb']['etag'] == S3Stub.etags['geoip/GeoLite2-City.mmdb']
+
+    S3Stub.gets.clear()
+    assert s3.download_file('geoip/GeoLite2-City.mmdb', local)
+    assert S3Stub.gets == []
+
+    put_object('geoip/GeoLite2-City.mmdb', b'new release')
+    assert s3.download_file('geoip/GeoLite2-City.mmdb', local)
+    assert local.read_bytes() == b'new release'
+
+def test_corrupt_download_keeps_existing_file(s3, tmp_path):
+    """A body that doesn't match its ETag is discarded and the old file stays in place."""
+    local = tmp_path / 'GeoLite2-ASN.mmdb'
+    local.write_bytes(b'old database')
+    put_object('geoip/GeoLite2-ASN.mmdb', b'corrupted in transit', etag=f'"{hashlib.md5(b"original").hexdigest()}"')
+
+    assert not s3.download_file('geoip/GeoLite2-ASN.mmdb', local)
+    assert local.read_bytes() == b'old database'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['GeoLite2-ASN.mmdb']
+
+def test_uploaded_file_is_not_downloaded_again(s3, tmp_path):
+    """After an upload the local file is known to match the object."""
+    local = tmp_path / 'GeoLite2-Country.mmdb'
+    local.write_bytes(b'country data')
+
+    assert s3.upload_file(local, 'geoip/GeoLite2-Country.mmdb')
+    assert S3Stub.objects['geoip/GeoLite2-Country.mmdb'] == b'country data'
+    assert s3.download_file('geoip/GeoLite2-Country.mmdb', local)
+    assert S3Stub.gets == []
+
+def test_object_replaced_mid_download_is_not_recorded(s3, tmp_path):
+    """A new version appearing after the HEAD fails the pinned GETs; the old file and manifest stay."""
+    local = tmp_path / 'GeoLite2-City.mmdb'
+    local.write_bytes(b'old database')
+    # A multipart-style ETag, so only If-Match (not the MD5 check) can notice the change
+    put_object('geoip/GeoLite2-City.mmdb', os.urandom(200 * 1024), etag='"0123456789abcdef0123456789abcdef-2"')
+    S3Stub.replace_after_head['geoip/GeoLite2-City.mmdb'] = os.urandom(200 * 1024)
+
+    assert not s3.download_file('geoip/GeoLite2-City.mmdb', local)
+    assert local.read_bytes() == b'old database'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['GeoLite2-City.mmdb']
+
+    # The next attempt picks up the new version whole
+    assert s3.download_file('geoip/GeoLite2-City.mmdb', local)
+    assert local.read_bytes() == S3Stub.objects['geoip/GeoLite2-City.mmdb']
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest['GeoLite2-City.mmdb']['etag'] == S3Stub.etags['geoip/GeoLite2-City.mmdb']
@@ -0,0 +1,78 @@
+"""Test the Sentry sampling policy and the reports for unsampled slow requests."""
+
+import functools
+import time
+import pytest
+import sentry_sdk
+from flask import Flask
+from sentry_sdk.transport import Transport
+from utils.monitoring import error_tracking
+from utils.monitoring.sampling import SamplingPolicy, parse_overrides
+from utils.monitoring.tracing import span
+
+def test_sampler_uses_longest_prefix_and_parent_decision():
+    """Overrides beat the head rate, the most specific one wins, and upstream decisions are kept."""
+    policy = SamplingPolicy(rate=0.05, overrides=parse_overrides("/api=0.2, /api/analyze=1,/api/v1/bulk=oops"))
+
+    def context(path, parent=None):
+        return {'parent_sampled': parent, 'wsgi_environ': {'PATH_INFO': path}}
+
+    assert policy.traces_sampler(context('/graphql')) == 0.05
+    assert policy.traces_sampler(context('/api/v1/jobs')) == 0.2
+    assert policy.traces_sampler(context('/api/analyze')) == 1.0
+    assert policy.traces_sampler(context('/api/v1/bulk')) == 0.2
+    assert policy.traces_sampler(context('/api/health')) == 0.0
+    assert policy.traces_sampler(context('/api/health', parent=True)) == 1.0
+
+def test_should_report_is_rate_limited():
+    """Only slow or failed requests are reported, and no more than the per-minute budget."""
+    policy = SamplingPolicy(slow_request_seconds=1, slow_reports_per_minute=2)
+
+    assert not policy.should_report(0.5, 200)
+    assert policy.should_report(0.5, 503)
+    assert policy.should_report(2, 200)
+    assert not policy.should_report(2, 200)
+
+class CaptureTransport(Transport):
+    def __init__(self, captured):
+        super().__init__()
+        self.captured = captured
+
+    def capture_envelope(self, envelope):
+        self.captured.extend(item.payload.json for item in envelope.items if item.type == 'event')
+
+@pytest.fixture
+def events(monkeypatch):
+    captured = []
+    monkeypatch.setattr(sentry_sdk, 'init', functools.partial(sentry_sdk.init, transport=CaptureTransport(captured)))
+    yield captured
+    sentry_sdk.get_client().close()
+
+def test_unsampled_slow_request_reports_stage_timings(events):
+    """A request that wasn't traced but ran long is sent as a warning carrying its stage timings."""
+    app = Flask('sampling-test')
+    error_tracking.init_error_tracking(
+        app, 'http://public@127.0.0.1:9/1',
+        SamplingPolicy(rate=0.0, slow_request_seconds=0.05, slow_reports_per_minute=10)
+    )
+
+    @app.route('/fast')
+    def fast():
+        return 'ok'
+
+    @app.route('/slow')
+    def slow():
+        with span('stage.fetch'):
+            time.sleep(0.06)
+        return 'ok'
+
+    client = app.test_client()
+    assert client.get('/fast').status_code == 200
+    assert client.get('/slow').status_code == 200
+    sentry_sdk.flush()
+
+    assert len(events) == 1
+    assert events[0]['level'] == 'warning'
+    assert events[0]['message'].startswith('Slow request: GET /slow (200,')
+    assert events[0]['contexts']['timings']['stage.fetch'] >= 50
+    assert events[0]['tags']['endpoint'] == 'slow'
@@ -0,0 +1,102 @@
+"""Test flattening analysis signals into rows, the bulk upsert and re-saving a domain."""
+
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import Integer, String, UniqueConstraint, create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from api import db
+from api.models import analysis as analysis_models
+from utils.storage.signal_store import SignalStore, bulk_upsert, rows_from_signals
+
+class Base(DeclarativeBase):
+    pass
+
+class Link(Base):
+    __tablename__ = 'links'
+    __table_args__ = (UniqueConstraint('domain', 'platform'),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    domain: Mapped[str] = mapped_column(String(253))
+    platform: Mapped[str] = mapped_column(String(32))
+    url: Mapped[str] = mapped_column(String(255))
+    note: Mapped[str] = mapped_column(String(32), nullable=True)
+
+def test_rows_from_signals_covers_every_table():
+    """Geo, DNS, certificate and social signals land in their own tables under the host name."""
+    now = datetime(2026, 1, 1)
+    signals = {
+        'ip_geolocation': {
+            'ip': '104.16.0.1', 'hostname': None, 'country': 'Germany', 'country_code': 'DE',
+            'asn': 13335, 'asn_org': 'CLOUDFLARENET', 'is_cdn': True, 'cdn_provider': 'Cloudflare',
+            'additional_signals': {
+                'dns': {'a_records': ['104.16.0.1'], 'mx_records': ['mx.example.de'], 'soa_record': 'ns1 hostmaster'},
+                'ssl': {'common_name': 'example.de', 'organization': None, 'issuer': "Let's Encrypt"},
+            },
+        },
+        'social': {'links': {'github': 'https://github.com/example'}},
+    }
+    tables = rows_from_signals('https://Example.DE/about', signals, now)
+
+    assert tables['domains'] == [{'name': 'example.de', 'url': 'https://Example.DE/about',
+                                  'first_seen_at': now, 'last_analyzed_at': now}]
+    assert tables['ip_geo'][0]['asn'] == 13335 and tables['ip_geo'][0]['country_code'] == 'DE'
+    assert tables['domain_ips'][0]['ip'] == '104.16.0.1'
+    assert sorted(row['rdtype'] for row in tables['dns_records']) == ['A', 'MX', 'SOA']
+    assert all(len(row['value_hash']) == 64 for row in tables['dns_records'])
+    assert tables['certificates'][0]['issuer'] == "Let's Encrypt"
+    assert tables['social_links'] == [{'domain': 'example.de', 'platform': 'github',
+                                       'url': 'https://github.com/example', 'updated_at': now}]
+
+    empty = rows_from_signals('https://down.example', {'ip_geolocation': None})
+    assert len(empty['domains']) == 1
+    assert not any(empty[table] for table in empty if table != 'domains')
+
+def test_bulk_upsert_updates_only_listed_columns():
+    """Conflicting rows are updated in place, leaving columns outside update_columns alone."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        bulk_upsert(session, Link, [
+            {'domain': 'a.com', 'platform': 'x', 'url': 'https://x.com/a', 'note': 'first'},
+            {'domain': 'b.com', 'platform': 'x', 'url': 'https://x.com/b', 'note': 'first'},
+        ], ('domain', 'platform'), ('url',))
+        bulk_upsert(session, Link, [
+            {'domain': 'a.com', 'platform': 'x', 'url': 'https://x.com/a2', 'note': 'second'},
+        ], ('domain', 'platform'), ('url',))
+        session.commit()
+
+        rows = session.execute(select(Link.domain, Link.url, Link.note).order_by(Link.domain)).all()
+    assert rows == [('a.com', 'https://x.com/a2', 'first'), ('b.com', 'https://x.com/b', 'first')]
+
+def analysis(ip, asn, country_code, links):
+    return {
+        'ip_geolocation': {
+            'ip': ip, 'country_code': country_code, 'asn': asn,
+            'additional_signals': {'dns': {'a_records': [ip]}, 'ssl': {}},
+        },
+        'social': {'links': links},
+    }
+
+def test_resave_replaces_rows_the_new_analysis_dropped():
+    """A domain that moved to a new IP no longer matches its old ASN; uncollected signals are kept."""
+    app = Flask('signal-store-test')
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        store = SignalStore(db, analysis_models)
+
+        store.save([('https://example.com', analysis('1.1.1.1', 13335, 'DE', {'github': 'https://github.com/a'}))])
+        assert [row['ip'] for row in store.find_domains(asn=13335, country_code='DE')] == ['1.1.1.1']
+
+        store.save([('https://example.com', analysis('2.2.2.2', 16509, 'DE', {'x': 'https://x.com/a'}))])
+        assert store.find_domains(asn=13335, country_code='DE') == []
+        assert [row['ip'] for row in store.find_domains(asn=16509)] == ['2.2.2.2']
+        m = analysis_models
+        assert db.session.execute(select(m.DNSRecord.value)).scalars().all() == ['2.2.2.2']
+        assert db.session.execute(select(m.SocialLink.platform)).scalars().all() == ['x']
+
+        # A failed lookup and an unfetched page leave the stored rows alone
+        store.save([('https://example.com', {'ip_geolocation': None})])
+        assert [row['ip'] for row in store.find_domains(asn=16509)] == ['2.2.2.2']
+        assert db.session.execute(select(m.SocialLink.platform)).scalars().all() == ['x']
@@ -0,0 +1,37 @@
+"""Test single-pass social link extraction."""
+
+from bs4 import BeautifulSoup
+from utils.helpers.entity_detection import classify_social_host, extract_social_links
+
+def test_classify_social_host_matches_hosts_not_substrings():
+    """Platform hosts and their subdomains match; look-alike hosts don't."""
+    assert classify_social_host('x.com') == 'twitter'
+    assert classify_social_host('WWW.X.COM') == 'twitter'
+    assert classify_social_host('fb.com') == 'facebook'
+    assert classify_social_host('m.facebook.com.') == 'facebook'
+    assert classify_social_host('box.com') is None
+    assert classify_social_host('netflix.com') is None
+    assert classify_social_host('fb.com.example.io') is None
+    assert classify_social_host(None) is None
+
+def test_extract_social_links_first_link_per_platform():
+    """The first link per platform wins and results follow platform order."""
+    html = """
+        <a href="/about">About</a>
+        <a href="https://www.dropbox.com/s/x.pdf">Dropbox</a>
+        <a href="https://github.com/acme">GitHub</a>
+        <a href="//x.com/acme">X</a>
+        <a href="https://twitter.com/other">Twitter</a>
+        <a href="https://example.com/share?u=facebook.com">Share</a>
+    """
+    links, all_links = extract_social_links(BeautifulSoup(html, 'html.parser'), 'example.com')
+
+    assert links == {'twitter': 'https://x.com/acme', 'github': 'https://github.com/acme'}
+    assert list(links) == ['twitter', 'github']
+    assert all_links == ['https://x.com/acme', 'https://github.com/acme']
+
+def test_relative_links_on_a_social_site():
+    """Relative links are still resolved when the page itself is on a platform."""
+    soup = BeautifulSoup('<a href="/acme">Profile</a>', 'html.parser')
+    links, _ = extract_social_links(soup, 'https://github.com/acme')
+    assert links == {'github': 'https://github.com/acme'}
@@ -0,0 +1,53 @@
+"""Test stage spans, the per-request breakdown and the Prometheus output."""
+
+import concurrent.futures
+import contextvars
+import pytest
+from utils.monitoring import tracing
+from utils.monitoring.tracing import record_spans, render_prometheus, span, timed, timing_breakdown
+
+@pytest.fixture(autouse=True)
+def fresh_histograms():
+    for histogram in tracing.HISTOGRAMS:
+        histogram.reset()
+
+def test_spans_nest_across_threads_and_record_errors():
+    """Child spans share the trace and parent, including ones run in a pool with a copied context."""
+    @timed('stage.child')
+    def child():
+        return {'value': 'x' * 10}
+
+    @timed('stage.failing')
+    def failing():
+        raise ValueError("boom")
+
+    with record_spans() as spans, span('stage.root') as root:
+        child()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(contextvars.copy_context().run, child).result()
+        with pytest.raises(ValueError):
+            failing()
+
+    by_name = {}
+    for recorded in spans:
+        by_name.setdefault(recorded.name, []).append(recorded.to_dict())
+    assert len(by_name['stage.child']) == 2
+    assert all(s['parent_span_id'] == root.span_id and s['trace_id'] == root.trace_id
+               for s in by_name['stage.child'] + by_name['stage.failing'])
+    assert by_name['stage.child'][0]['attributes']['payload.bytes'] == len('{"value": "xxxxxxxxxx"}')
+    assert by_name['stage.failing'][0]['status'] == {'code': 'ERROR', 'message': 'ValueError: boom'}
+    assert set(timing_breakdown(spans)['stages_ms']) == {'stage.root', 'stage.child', 'stage.failing'}
+
+def test_prometheus_histograms_are_cumulative():
+    """Buckets count every observation at or below their bound, per stage and outcome."""
+    tracing.STAGE_DURATION.observe(0.003, 'geoip.maxmind', 'ok')
+    tracing.STAGE_DURATION.observe(0.2, 'geoip.maxmind', 'ok')
+    tracing.STAGE_DURATION.observe(60, 'geoip.maxmind', 'ok')
+
+    lines = render_prometheus().splitlines()
+
+    assert '# TYPE analysis_stage_duration_seconds histogram' in lines
+    assert 'analysis_stage_duration_seconds_bucket{stage="geoip.maxmind",outcome="ok",le="0.005"} 1' in lines
+    assert 'analysis_stage_duration_seconds_bucket{stage="geoip.maxmind",outcome="ok",le="0.25"} 2' in lines
+    assert 'analysis_stage_duration_seconds_bucket{stage="geoip.maxmind",outcome="ok",le="+Inf"} 3' in lines
+    assert 'analysis_stage_duration_seconds_count{stage="geoip.maxmind",outcome="ok"} 3' in lines
@@ -0,0 +1,42 @@
+"""Test the bounded LRU+TTL memo cache."""
+
+import time
+from utils.storage.ttl_cache import TTLCache
+
+def test_lru_eviction():
+    """Least recently used entries are evicted first and counted."""
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.set('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_ttl_expiry():
+    """Entries expire after their TTL and count as misses."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set('short', 'value', ttl=0.01)
+    cache.set('long', 'value')
+    time.sleep(0.02)
+
+    assert cache.get('short') is None
+    assert cache.get('long') == 'value'
+    stats = cache.stats()
+    assert stats['expirations'] == 1
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+def test_clear_keeps_counters():
+    """Clearing drops entries but not the counters."""
+    cache = TTLCache(maxsize=10)
+    cache.set('a', 1)
+    cache.get('a')
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get('a', 'missing') == 'missing'
+    assert cache.stats()['hits'] == 1
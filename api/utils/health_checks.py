@@ -1,7 +1,6 @@
 import os
 import logging
-from openai import OpenAI
-from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 
 logger = logging.getLogger(__name__)
@@ -24,50 +23,49 @@ def get_partial_response(url, reason="API not configured"):
     return response_data
 
 def check_openai_status():
-    """Check OpenAI API configuration and status"""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        logger.warning("OPENAI_API_KEY not found in environment variables")
+    """Check OpenAI API configuration from the environment, without building a client"""
+    if not os.environ.get("OPENAI_API_KEY"):
+        logger.debug("OPENAI_API_KEY not found in environment variables")
         return {
             "status": "unconfigured",
             "message": "OpenAI API key not configured"
         }
-    
+    return {
+        "status": "configured",
+        "message": "OpenAI API key configured"
+    }
+
+def check_database_status(engine: Engine):
+    """Check database connectivity through the app's pooled engine"""
     try:
-        client = OpenAI(api_key=api_key)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
         return {
-            "status": "configured",
-            "client": client,
-            "message": "OpenAI API configured successfully"
+            "status": "connected",
+            "message": "Database connection successful"
         }
     except Exception as e:
-        logger.warning(f"Failed to initialize OpenAI client: {str(e)}")
+        logger.warning(f"Database health check failed: {str(e)}")
         return {
             "status": "error",
-            "message": f"OpenAI API configuration error: {str(e)}"
+            "message": f"Database connection error: {str(e)}"
         }
 
-def check_database_status():
-    """Check database configuration and connectivity"""
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        logger.warning("DATABASE_URL not found in environment variables")
-        return {
-            "status": "unconfigured",
-            "message": "Database URL not configured"
-        }
-    
+def check_geoip_status():
+    """Check GeoIP database availability and hot-swap metrics"""
     try:
-        engine = create_engine(db_url)
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        from utils.storage.maxmind_geo import geoip_manager
+        stats = geoip_manager.get_refresh_stats()
+        loaded = [db_type for db_type, info in stats['editions'].items() if info['loaded']]
         return {
-            "status": "connected",
-            "message": "Database connection successful"
+            "status": "loaded" if loaded else "unavailable",
+            "message": f"GeoIP databases loaded: {loaded}" if loaded else "No GeoIP databases loaded",
+            **stats,
+            "cache": geoip_manager.get_cache_stats()
         }
     except Exception as e:
-        logger.warning(f"Database health check failed: {str(e)}")
+        logger.warning(f"GeoIP health check failed: {str(e)}")
         return {
             "status": "error",
-            "message": f"Database connection error: {str(e)}"
-        } 
\ No newline at end of file
+            "message": f"GeoIP status error: {str(e)}"
+        }
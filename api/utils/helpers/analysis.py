@@ -0,0 +1,174 @@
+# utils/helpers/analysis.py
+
+"""
+Website analysis pipeline.
+
+Runs the GeoIP, geolocation, entity detection and (with an OpenAI key) content
+analysis stages for a URL and assembles
+the response served by /api/analyze. Each stage produces a named signal so
+callers can reuse signals that are still fresh instead of recomputing them.
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, Optional
+from utils.helpers.content_analysis import analyze_content, content_analysis_enabled
+from utils.helpers.html_stream import PageContent, fetch_page_content
+from utils.helpers.url_parsing import normalize_url
+from utils.monitoring.tracing import timed
+
+logger = logging.getLogger(__name__)
+
+# How long each signal may be reused (seconds)
+SIGNAL_TTLS: Dict[str, float] = {
+    'ip_geolocation': float(os.getenv("ANALYSIS_TTL_IP_GEOLOCATION", "3600")),
+    'ip_location': float(os.getenv("ANALYSIS_TTL_IP_LOCATION", "3600")),
+    'social': float(os.getenv("ANALYSIS_TTL_SOCIAL", "21600")),
+    'location': float(os.getenv("ANALYSIS_TTL_LOCATION", "21600")),
+}
+
+# Signals that need the page HTML
+PAGE_SIGNALS = ('social', 'location')
+
+# Without an API key there is no content signal, and cached entries are complete without it
+if content_analysis_enabled():
+    SIGNAL_TTLS['content'] = float(os.getenv("ANALYSIS_TTL_CONTENT", "86400"))
+    PAGE_SIGNALS += ('content',)
+
+# Called with (signal name, value) as each stage completes
+SignalCallback = Callable[[str, Any], None]
+
+@timed('page.fetch', size=lambda page: page['bytes_read'])
+def fetch_page(url: str) -> PageContent:
+    """Fetch a page and extract its links, text and metadata while it streams in"""
+    return fetch_page_content(url)
+
+@timed('analysis.collect')
+def collect_signals(
+    url: str,
+    reuse: Optional[Dict[str, Any]] = None,
+    on_signal: Optional[SignalCallback] = None
+) -> Dict[str, Any]:
+    """
+    Run every analysis stage whose signal isn't supplied in ``reuse``.
+
+    Args:
+        url: URL to analyze
+        reuse: Signals that are still fresh and should not be recomputed
+        on_signal: Progress callback, called for reused and computed signals
+            alike as each becomes available, plus 'dns' and 'ssl' when a CDN
+            triggered those probes. The slow LLM 'content' stage runs last, so
+            it never delays the other signals.
+
+    Returns:
+        Dict of signal name to signal value. Page-based signals are missing
+        if the page could not be fetched.
+    """
+    from utils.storage.maxmind_geo import geoip_manager
+    from utils.helpers.geo_detection import (
+        get_ip_location, detect_language_region, extract_addresses, combine_location_signals
+    )
+    from utils.helpers.entity_detection import extract_social_links, analyze_social_equivalency
+
+    url = normalize_url(url)
+    signals: Dict[str, Any] = dict(reuse or {})
+
+    def emit(name: str, value: Any) -> None:
+        if on_signal is not None:
+            try:
+                on_signal(name, value)
+            except Exception as e:
+                logger.warning(f"Signal callback failed for {name}: {str(e)}")
+
+    if 'ip_geolocation' not in signals:
+        signals['ip_geolocation'] = geoip_manager.lookup_url(url)
+    emit('ip_geolocation', signals['ip_geolocation'])
+    additional = (signals['ip_geolocation'] or {}).get('additional_signals') or {}
+    for name in ('dns', 'ssl'):
+        if additional.get(name) is not None:
+            emit(name, additional[name])
+
+    if 'ip_location' not in signals:
+        signals['ip_location'] = get_ip_location(url)
+    emit('ip_location', signals['ip_location'])
+
+    # Reused page signals go out now, even if the page can't be fetched for the rest
+    for name in PAGE_SIGNALS:
+        if name in signals:
+            emit(name, signals[name])
+
+    if any(name not in signals for name in PAGE_SIGNALS):
+        try:
+            page = fetch_page(url)
+        except Exception as e:
+            logger.error(f"Could not fetch {url}: {str(e)}")
+            return signals
+
+        if 'social' not in signals:
+            social_links, _ = extract_social_links(page, url)
+            signals['social'] = {
+                'links': social_links,
+                'equivalency': analyze_social_equivalency(social_links)
+            }
+            emit('social', signals['social'])
+        if 'location' not in signals:
+            text = page['text']
+            signals['location'] = combine_location_signals(
+                signals['ip_location'],
+                detect_language_region(text),
+                extract_addresses(text),
+                None,
+                signals['social'].get('equivalency')
+            )
+            emit('location', signals['location'])
+        if 'content' in PAGE_SIGNALS and 'content' not in signals:
+            # Left out on failure, so the next request tries again
+            content = analyze_content(url, page)
+            if content is not None:
+                signals['content'] = content
+                emit('content', content)
+
+    return signals
+
+def build_response(url: str, signals: Dict[str, Any]) -> Dict[str, Any]:
+    """Assemble the /api/analyze response body from collected signals"""
+    from utils.health_checks import get_partial_response
+
+    social = signals.get('social') or {}
+    social_links = social.get('links') or {}
+    location = signals.get('location')
+
+    response: Dict[str, Any] = {
+        'url': url,
+        'ip_geolocation': signals.get('ip_geolocation'),
+        'social_links': social_links,
+        'social_equivalency': social.get('equivalency'),
+        'social_presence': {
+            'platforms': sorted(social_links),
+            'professional_networks': [p for p in ('linkedin', 'github') if p in social_links],
+        },
+        'location_signals': location,
+        'location_confidence': {
+            'determined_location': location['location'],
+            'confidence_score': location['confidence'],
+            'supporting_signals': location['signals_used'],
+        } if location else None,
+    }
+    content = signals.get('content')
+    if content:
+        response.update({'status': 'complete', **content})
+        return response
+
+    if any(name not in signals for name in ('social', 'location')):
+        reason = "page could not be fetched"
+    elif 'content' in PAGE_SIGNALS:
+        reason = "content analysis failed"
+    else:
+        reason = "content analysis not enabled"
+    response.update(get_partial_response(url, reason))
+    return response
+
+def run_analysis(url: str, reuse: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Analyze a URL and return the response body"""
+    url = normalize_url(url)
+    return build_response(url, collect_signals(url, reuse))
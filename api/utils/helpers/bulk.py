@@ -0,0 +1,326 @@
+# utils/helpers/bulk.py
+
+"""
+Bulk domain analysis.
+
+Reads domain lists (plain text, CSV or NDJSON), dedupes them by normalized URL
+and runs the analysis pipeline over them with bounded concurrency and per-host
+politeness limits. Results are produced as NDJSON records; an output file doubles
+as the checkpoint, so an interrupted run resumes where it stopped.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from flask import Flask
+from utils.helpers.url_parsing import normalize_url, validate_url
+
+logger = logging.getLogger(__name__)
+
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "32"))
+# Concurrent analyses allowed against one host
+BULK_PER_HOST = int(os.getenv("BULK_PER_HOST", "1"))
+# Minimum seconds between starting analyses of the same host
+BULK_HOST_DELAY = float(os.getenv("BULK_HOST_DELAY", "1.0"))
+
+# Analyzes one URL: (normalized URL, signals, cache status), like analyze_with_cache
+Analyzer = Callable[[str], Tuple[str, Dict[str, Any], str]]
+
+# Column names recognised in CSV headers and NDJSON objects, in order of preference
+URL_FIELDS = ('url', 'domain', 'website', 'host')
+
+def _entry_from_record(record: Any) -> Optional[str]:
+    if isinstance(record, str):
+        return record
+    if isinstance(record, dict):
+        for field in URL_FIELDS:
+            if isinstance(record.get(field), str):
+                return record[field]
+    return None
+
+def read_domains(lines: Iterable[str], fmt: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield raw domain/URL entries from an input file.
+
+    Args:
+        lines: Lines of the input
+        fmt: 'text', 'csv' or 'ndjson'; detected from the first non-blank line if None
+
+    Returns:
+        Iterator over entries as written in the input (not yet normalized)
+    """
+    lines = iter(lines)
+    head: List[str] = []
+    for line in lines:
+        head.append(line)
+        if line.strip():
+            break
+    if fmt is None:
+        first = head[-1].strip() if head else ''
+        if first.startswith(('{', '"')):
+            fmt = 'ndjson'
+        elif ',' in first or first.lower() in URL_FIELDS:
+            fmt = 'csv'
+        else:
+            fmt = 'text'
+
+    def all_lines() -> Iterator[str]:
+        yield from head
+        yield from lines
+
+    if fmt == 'ndjson':
+        for line in all_lines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = _entry_from_record(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed NDJSON line: {line[:100]}")
+                continue
+            if entry:
+                yield entry
+    elif fmt == 'csv':
+        reader = csv.reader(all_lines())
+        column = 0
+        for row_number, row in enumerate(reader):
+            if not row:
+                continue
+            if row_number == 0:
+                header = [cell.strip().lower() for cell in row]
+                named = [header.index(field) for field in URL_FIELDS if field in header]
+                if named:
+                    column = named[0]
+                    continue
+            if column < len(row) and row[column].strip():
+                yield row[column]
+    else:
+        for line in all_lines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def dedupe_urls(entries: Iterable[str]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Normalize and dedupe entries, keeping first-seen order.
+
+    Returns:
+        Tuple of (normalized URL, original entry) pairs and the invalid entries
+    """
+    unique: "OrderedDict[str, str]" = OrderedDict()
+    invalid: List[str] = []
+    for entry in entries:
+        entry = entry.strip()
+        url = normalize_url(entry) if entry else ''
+        if not url or not validate_url(url):
+            invalid.append(entry)
+            continue
+        unique.setdefault(url, entry)
+    return list(unique.items()), invalid
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or '').lower()
+
+def interleave_by_host(items: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Reorder items round-robin across hosts so one host's URLs don't run back to back"""
+    queues: "OrderedDict[str, deque]" = OrderedDict()
+    for item in items:
+        queues.setdefault(_host(item[0]), deque()).append(item)
+    ordered: List[Tuple[str, str]] = []
+    while queues:
+        for host in list(queues):
+            ordered.append(queues[host].popleft())
+            if not queues[host]:
+                del queues[host]
+    return ordered
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Read the URLs already completed in an output file.
+
+    A partially written last line (from an interrupted run) is truncated away so
+    appending new records keeps the file valid NDJSON.
+    """
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+
+    valid_bytes = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            valid_bytes += len(line)
+            if isinstance(record, dict) and record.get('url'):
+                done.add(record['url'])
+
+    if valid_bytes < os.path.getsize(path):
+        logger.warning(f"Truncating incomplete record at the end of {path}")
+        with open(path, 'r+b') as f:
+            f.truncate(valid_bytes)
+    return done
+
+class HostLimiter:
+    """
+    Per-host politeness: at most ``per_host`` concurrent analyses per host and at
+    least ``delay`` seconds between starting them.
+    """
+
+    def __init__(self, per_host: int = BULK_PER_HOST, delay: float = BULK_HOST_DELAY) -> None:
+        self.per_host = max(per_host, 1)
+        self.delay = delay
+        self._active: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, host: str) -> None:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait_for = self._next_start.get(host, 0.0) - now
+                if self._active.get(host, 0) < self.per_host and wait_for <= 0:
+                    self._active[host] = self._active.get(host, 0) + 1
+                    self._next_start[host] = now + self.delay
+                    return
+                self._condition.wait(timeout=wait_for if wait_for > 0 else None)
+
+    def release(self, host: str) -> None:
+        with self._condition:
+            self._active[host] -= 1
+            if not self._active[host]:
+                del self._active[host]
+            self._condition.notify_all()
+
+def _collect_uncached(url: str) -> Tuple[str, Dict[str, Any], str]:
+    from utils.helpers.analysis import collect_signals
+
+    return url, collect_signals(url), 'MISS'
+
+def analyze_one(
+    url: str,
+    entry: str,
+    limiter: HostLimiter,
+    app: Optional[Flask] = None,
+    analyze: Optional[Analyzer] = None
+) -> Dict[str, Any]:
+    """
+    Run the analysis pipeline for one URL and wrap it as an output record.
+
+    With an app the analysis runs inside its application context, so the
+    database-backed caches are used as they are for single analyses.
+    ``analyze`` defaults to collecting every signal without the result cache.
+    """
+    from utils.helpers.analysis import build_response
+
+    host = _host(url)
+    limiter.acquire(host)
+    start = time.perf_counter()
+    try:
+        with app.app_context() if app is not None else nullcontext():
+            key, signals, cache_status = (analyze or _collect_uncached)(url)
+            result = build_response(key, signals)
+        record = {'url': url, 'input': entry, 'status': 'ok', 'cache': cache_status, 'result': result}
+    except Exception as e:
+        logger.error(f"Bulk analysis failed for {url}: {str(e)}")
+        record = {'url': url, 'input': entry, 'status': 'error', 'error': str(e)}
+    finally:
+        limiter.release(host)
+    record['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+def run_bulk(
+    items: List[Tuple[str, str]],
+    concurrency: int = BULK_CONCURRENCY,
+    limiter: Optional[HostLimiter] = None,
+    app: Optional[Flask] = None,
+    analyze: Optional[Analyzer] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze URLs concurrently, yielding output records as they complete.
+
+    Args:
+        items: (normalized URL, original entry) pairs, e.g. from dedupe_urls
+        concurrency: Maximum analyses in flight
+        limiter: Per-host politeness limits (defaults from BULK_PER_HOST/BULK_HOST_DELAY)
+        app: Application whose context each worker runs in; without one the
+            content-hash cache is skipped
+        analyze: Per-URL analysis, e.g. BatchedAnalyzer.analyze to use the result
+            cache and signal tables (defaults to collecting every signal)
+
+    Returns:
+        Iterator over records in completion order
+    """
+    limiter = limiter or HostLimiter()
+    pending = iter(interleave_by_host(items))
+    in_flight: Set[Future] = set()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk") as executor:
+        try:
+            while True:
+                # Keep a small backlog beyond the workers so none sit idle
+                while len(in_flight) < concurrency * 2:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    in_flight.add(executor.submit(analyze_one, item[0], item[1], limiter, app, analyze))
+                if not in_flight:
+                    return
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+def run_bulk_to_file(
+    items: List[Tuple[str, str]],
+    output_path: str,
+    concurrency: int = BULK_CONCURRENCY,
+    limiter: Optional[HostLimiter] = None,
+    progress_every: int = 100,
+    app: Optional[Flask] = None,
+    analyze: Optional[Analyzer] = None
+) -> Dict[str, int]:
+    """
+    Analyze URLs into an NDJSON file, skipping URLs it already contains.
+
+    Each record is flushed as it is written, so the file is always a valid
+    checkpoint to resume from.
+
+    Returns:
+        Counts of skipped, ok and failed URLs
+    """
+    done = load_checkpoint(output_path)
+    todo = [item for item in items if item[0] not in done]
+    counts = {'skipped': len(items) - len(todo), 'ok': 0, 'error': 0}
+    if counts['skipped']:
+        logger.info(f"Resuming: {counts['skipped']} of {len(items)} URLs already in {output_path}")
+
+    start = time.monotonic()
+    with open(output_path, 'a', encoding='utf-8') as out:
+        for record in run_bulk(todo, concurrency, limiter, app, analyze):
+            out.write(json.dumps(record, default=str) + '\n')
+            out.flush()
+            counts[record['status']] += 1
+            finished = counts['ok'] + counts['error']
+            if progress_every and finished % progress_every == 0:
+                rate = finished / max(time.monotonic() - start, 1e-9)
+                logger.info(f"{finished}/{len(todo)} analyzed ({rate:.1f}/s, {counts['error']} failed)")
+    return counts
+
+def read_domains_from_bytes(data: bytes, fmt: Optional[str] = None) -> Iterator[str]:
+    """read_domains over an uploaded file's contents"""
+    return read_domains(io.StringIO(data.decode('utf-8-sig', errors='replace')), fmt)
@@ -0,0 +1,209 @@
+# utils/helpers/content_analysis.py
+
+"""
+LLM content analysis of fetched pages.
+
+Concurrent analyses (bulk runs, queued jobs, parallel requests) often reach this
+stage within milliseconds of each other. Instead of one chat completion per
+page, ContentBatcher holds each page for up to CONTENT_BATCH_WINDOW_MS, or until
+CONTENT_BATCH_SIZE pages are waiting, and sends them together in one prompt
+that asks for a JSON result per page. A page whose result is missing from the
+reply simply gets no content signal.
+
+Results are also kept in a content-hash cache (utils/storage/content_cache.py),
+so a page whose text hasn't changed is never sent to the model twice.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+from flask import has_app_context
+from utils.helpers.html_stream import PageContent
+from utils.helpers.openai_client import OPENAI_MODEL, chat_completion
+from utils.monitoring.tracing import span, timed
+from utils.storage.content_cache import ContentAnalysisCache, content_key, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to skip the stage even when an OpenAI key is configured
+CONTENT_ANALYSIS = os.getenv("CONTENT_ANALYSIS", "1").lower() not in ('0', 'false', 'no')
+CONTENT_BATCH_SIZE = int(os.getenv("CONTENT_BATCH_SIZE", "8"))
+CONTENT_BATCH_WINDOW_MS = float(os.getenv("CONTENT_BATCH_WINDOW_MS", "50"))
+# Page text sent per page (characters)
+CONTENT_MAX_CHARS = int(os.getenv("CONTENT_MAX_CHARS", "4000"))
+# Longest a caller waits for its batch, including queueing and retries
+CONTENT_TIMEOUT = float(os.getenv("CONTENT_TIMEOUT", "120"))
+
+# Bump whenever SYSTEM_PROMPT or the result format changes; it is part of the cache key
+PROMPT_VERSION = 2
+SYSTEM_PROMPT = (
+    "You identify the organization behind web pages. For every page in the input "
+    "return an object with the page's \"id\", an \"organization\" object with \"name\", "
+    "\"type\", \"location\" and \"industry\" (use \"N/A\" when unknown), a one-"
+    "paragraph \"analysis\" of what the organization does, and a \"content_analysis\" "
+    "object with \"primary_purpose\", \"target_audience\", \"content_type\" and "
+    "\"writing_style\" (short phrases) plus \"topics\" and \"key_highlights\" (lists of "
+    "at most five short phrases). Reply with a JSON object of the form {\"results\": [...]}."
+)
+CONTENT_FIELDS = ('primary_purpose', 'target_audience', 'content_type', 'writing_style')
+CONTENT_LISTS = ('topics', 'key_highlights')
+
+Item = Tuple[str, str, Future]
+
+def content_analysis_enabled() -> bool:
+    """Whether pages get a content signal: the stage is on and an API key is configured"""
+    return CONTENT_ANALYSIS and bool(os.environ.get("OPENAI_API_KEY"))
+
+def _build_messages(pages: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    payload = [{'id': i, 'url': url, 'text': text[:CONTENT_MAX_CHARS]} for i, (url, text) in enumerate(pages)]
+    return [
+        {'role': 'system', 'content': SYSTEM_PROMPT},
+        {'role': 'user', 'content': json.dumps({'pages': payload}, ensure_ascii=False)},
+    ]
+
+def _phrases(value: Any) -> List[str]:
+    return [str(item) for item in value if item][:5] if isinstance(value, list) else []
+
+def _parse_results(content: Optional[str], count: int) -> List[Optional[Dict[str, Any]]]:
+    """Per-page results in input order; None where the reply has no usable entry"""
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    try:
+        entries = json.loads(content or '{}').get('results') or []
+    except (ValueError, AttributeError):
+        logger.warning(f"Content analysis reply is not a JSON object: {(content or '')[:200]!r}")
+        return results
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get('id'), int) or not 0 <= entry['id'] < count:
+            continue
+        organization = entry.get('organization') if isinstance(entry.get('organization'), dict) else {}
+        content = entry.get('content_analysis') if isinstance(entry.get('content_analysis'), dict) else {}
+        results[entry['id']] = {
+            'analysis': str(entry.get('analysis') or ''),
+            'organization': {field: str(organization.get(field) or 'N/A')
+                             for field in ('name', 'type', 'location', 'industry')},
+            'content_analysis': {
+                **{field: str(content.get(field) or 'N/A') for field in CONTENT_FIELDS},
+                **{field: _phrases(content.get(field)) for field in CONTENT_LISTS},
+            },
+        }
+    return results
+
+def analyze_pages(pages: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyze several pages with a single chat completion.
+
+    Args:
+        pages: (url, visible text) pairs
+
+    Returns:
+        One result per page, in order ({'analysis', 'organization', 'content_analysis'}), or None
+        where the model returned nothing usable
+
+    Raises:
+        openai.OpenAIError: If the request fails
+    """
+    with span('llm.batch', pages=len(pages)) as current:
+        completion = chat_completion(_build_messages(pages), response_format={'type': 'json_object'})
+        if completion.usage is not None:
+            current.set_attribute('tokens', completion.usage.total_tokens)
+        return _parse_results(completion.choices[0].message.content, len(pages))
+
+class ContentBatcher:
+    """Collects pages submitted from many threads into batched analyze_pages() calls."""
+
+    def __init__(self, batch_size: int = CONTENT_BATCH_SIZE, window: float = CONTENT_BATCH_WINDOW_MS / 1000) -> None:
+        self.batch_size = max(batch_size, 1)
+        self.window = window
+        self._pending: List[Item] = []
+        # Whether a thread is waiting out the window and will send what's pending
+        self._collecting = False
+        self._condition = threading.Condition()
+
+    def submit(self, url: str, text: str) -> 'Future[Optional[Dict[str, Any]]]':
+        """
+        Queue a page; the returned future resolves when its batch has been answered.
+
+        The first page of a batch waits out the window in the calling thread, and
+        the page that fills a batch sends it at once, so no extra threads are used.
+        """
+        future: Future = Future()
+        batch: List[Item] = []
+        with self._condition:
+            self._pending.append((url, text, future))
+            if len(self._pending) >= self.batch_size:
+                batch, self._pending = self._pending, []
+                self._condition.notify_all()
+            elif not self._collecting:
+                self._collecting = True
+                deadline = time.monotonic() + self.window
+                while self._pending and len(self._pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch, self._pending = self._pending, []
+                self._collecting = False
+        if batch:
+            self._send(batch)
+        return future
+
+    def _send(self, batch: List[Item]) -> None:
+        try:
+            results = analyze_pages([(url, text) for url, text, _ in batch])
+        except Exception as e:
+            logger.error(f"Content analysis failed for a batch of {len(batch)}: {str(e)}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+_batcher = ContentBatcher()
+_content_cache: Optional[ContentAnalysisCache] = None
+
+def get_content_cache() -> Optional[ContentAnalysisCache]:
+    """Get the content-hash cache, or None outside an application context"""
+    global _content_cache
+    if not has_app_context():
+        return None
+    if _content_cache is None:
+        from api import db
+        from api.models.cache import ContentAnalysisCacheEntry
+
+        _content_cache = ContentAnalysisCache(db, ContentAnalysisCacheEntry)
+    return _content_cache
+
+@timed('llm.content')
+def analyze_content(url: str, page: PageContent) -> Optional[Dict[str, Any]]:
+    """
+    Content signal for a page: organization details, a short analysis and the
+    content_analysis block (purpose, audience, topics, highlights).
+
+    Returns:
+        The result, or None if the page has no text or the analysis failed
+    """
+    # Normalized and cut to what the model sees, so the cache key covers exactly the prompt input
+    text = normalize_text(' '.join(filter(None, [page.get('title'), page['text']])))[:CONTENT_MAX_CHARS]
+    if not text:
+        return None
+
+    cache = get_content_cache()
+    key = content_key(text, OPENAI_MODEL, PROMPT_VERSION)
+    with span('llm.content_cache') as current:
+        cached = cache.get(key) if cache is not None else None
+        current.set_attribute('cache.hit', cached is not None)
+    if cached is not None:
+        return cached
+
+    try:
+        result = _batcher.submit(url, text).result(timeout=CONTENT_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"No content analysis for {url}: {str(e)}")
+        return None
+    if result is not None and cache is not None:
+        cache.set(key, result, OPENAI_MODEL, PROMPT_VERSION)
+    return result
@@ -0,0 +1,142 @@
+# utils/helpers/dns_resolver.py
+
+"""
+Asynchronous DNS resolution utilities.
+
+Provides concurrent record lookups on top of ``dns.asyncresolver`` with per-query
+deadlines and a process-wide answer cache that respects record TTLs and also
+caches negative answers (NXDOMAIN/NoAnswer).
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, TypeVar, Union
+from utils.storage.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Per-query lifetime (seconds) covering all retries against all nameservers
+DNS_QUERY_TIMEOUT = float(os.getenv("DNS_QUERY_TIMEOUT", "3.0"))
+# How long to cache NXDOMAIN/NoAnswer results
+DNS_NEGATIVE_TTL = float(os.getenv("DNS_NEGATIVE_TTL", "300"))
+# Upper bound on how long a positive answer is cached, whatever its record TTL
+DNS_MAX_TTL = float(os.getenv("DNS_MAX_TTL", "3600"))
+
+_answer_cache = TTLCache(maxsize=int(os.getenv("DNS_CACHE_SIZE", "4096")))
+_resolver: Optional[dns.asyncresolver.Resolver] = None
+
+def get_resolver() -> dns.asyncresolver.Resolver:
+    """Get the shared async resolver (configured from the system resolv.conf)"""
+    global _resolver
+    if _resolver is None:
+        _resolver = dns.asyncresolver.Resolver()
+    return _resolver
+
+def set_resolver(resolver: Optional[dns.asyncresolver.Resolver]) -> None:
+    """Replace the shared resolver, e.g. to point at a specific nameserver. Clears the cache."""
+    global _resolver
+    _resolver = resolver
+    _answer_cache.clear()
+
+def clear_answer_cache() -> None:
+    """Drop all cached DNS answers"""
+    _answer_cache.clear()
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss/eviction counters for the DNS answer cache"""
+    return _answer_cache.stats()
+
+async def resolve(name: str, rdtype: str, lifetime: Optional[float] = None) -> List[str]:
+    """
+    Resolve one record type, serving repeat queries from the answer cache.
+
+    Args:
+        name: Domain name to query
+        rdtype: Record type, e.g. 'A', 'MX', 'TXT'
+        lifetime: Deadline for this query in seconds (defaults to DNS_QUERY_TIMEOUT)
+
+    Returns:
+        Record data as strings
+
+    Raises:
+        dns.resolver.NXDOMAIN, dns.resolver.NoAnswer: also when served from the negative cache
+        dns.exception.DNSException: on timeouts and other resolution failures (not cached)
+    """
+    key = (name.lower().rstrip('.'), rdtype.upper())
+    cached = _answer_cache.get(key)
+    if cached is not None:
+        if isinstance(cached, BaseException):
+            raise cached.with_traceback(None)
+        return list(cached)
+
+    try:
+        answer = await get_resolver().resolve(
+            name,
+            rdtype,
+            lifetime=DNS_QUERY_TIMEOUT if lifetime is None else lifetime
+        )
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+        _answer_cache.set(key, e, ttl=DNS_NEGATIVE_TTL)
+        raise
+
+    records = [str(rdata) for rdata in answer]
+    ttl = min(float(answer.rrset.ttl), DNS_MAX_TTL) if answer.rrset is not None else 0
+    if ttl > 0:
+        _answer_cache.set(key, records, ttl=ttl)
+    return records
+
+async def resolve_many(
+    name: str,
+    rdtypes: Iterable[str],
+    lifetime: Optional[float] = None,
+    deadline: Optional[float] = None
+) -> Dict[str, Union[List[str], BaseException]]:
+    """
+    Resolve several record types for one name concurrently.
+
+    Args:
+        name: Domain name to query
+        rdtypes: Record types to query
+        lifetime: Per-query deadline in seconds
+        deadline: Overall deadline in seconds; queries still running are cancelled
+
+    Returns:
+        Dict mapping each record type to its records, or to the exception it raised
+        (dns.exception.Timeout for queries cut off by the overall deadline)
+    """
+    tasks = {
+        rdtype: asyncio.ensure_future(resolve(name, rdtype, lifetime))
+        for rdtype in rdtypes
+    }
+    if not tasks:
+        return {}
+    await asyncio.wait(tasks.values(), timeout=deadline)
+
+    results: Dict[str, Union[List[str], BaseException]] = {}
+    for rdtype, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            results[rdtype] = dns.exception.Timeout(timeout=deadline)
+        elif task.exception() is not None:
+            results[rdtype] = task.exception()
+        else:
+            results[rdtype] = task.result()
+    return results
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from synchronous code, even when called inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # A loop is already running in this thread, so run ours in a helper thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
@@ -9,51 +9,109 @@ Provides functions for detecting and analyzing entities from website content.
 import logging
 import json
 from bs4 import BeautifulSoup, Tag
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 from utils.helpers.url_parsing import normalize_url
+from utils.helpers.html_stream import PageContent
+from utils.monitoring.tracing import timed
 import re
 import difflib
-from typing import Dict, List, Tuple, Optional, Any, Union, cast
+from typing import Dict, Iterable, List, Tuple, Optional, Any, Union, cast
 from types_def.data import SocialEquivalency
 
 logger = logging.getLogger(__name__)
 
-def extract_social_links(soup: BeautifulSoup, base_url: str) -> Tuple[Dict[str, Union[str, Dict[str, Any]]], List[str]]:
-    """Extract social media links more comprehensively"""
-    base_url = normalize_url(base_url)
-    social_patterns = {
-        'twitter': ['twitter.com', 'x.com'],
-        'linkedin': ['linkedin.com'],
-        'github': ['github.com'],
-        'instagram': ['instagram.com'],
-        'facebook': ['facebook.com', 'fb.com'],
-        'discord': ['discord.com', 'discord.gg'],
-    }
+# Hosts of each platform; subdomains (www., m., uk. ...) match too
+SOCIAL_PLATFORMS: Dict[str, Tuple[str, ...]] = {
+    'twitter': ('twitter.com', 'x.com'),
+    'linkedin': ('linkedin.com',),
+    'github': ('github.com',),
+    'instagram': ('instagram.com',),
+    'facebook': ('facebook.com', 'fb.com'),
+    'discord': ('discord.com', 'discord.gg'),
+}
 
-    social_links: Dict[str, Union[str, Dict[str, Any]]] = {}
-    all_links: List[str] = []  # Store all links for equivalency analysis
+# Host suffix -> platform, so classifying a link is one dict probe per host label
+_SOCIAL_HOSTS: Dict[str, str] = {
+    host: platform for platform, hosts in SOCIAL_PLATFORMS.items() for host in hosts
+}
 
-    for platform, domains in social_patterns.items():
-        for link in soup.find_all('a', href=True):
-            if not isinstance(link, Tag):
-                continue
-                
-            href = link.get('href')
-            if not href:
-                continue
+def classify_social_host(host: Optional[str]) -> Optional[str]:
+    """
+    Get the social platform a host belongs to.
+
+    Matches the platform's hosts and their subdomains only, so 'x.com' and
+    'www.x.com' are Twitter but 'box.com' and 'x.com.evil.io' are not.
+    """
+    if not host:
+        return None
+    host = host.lower().rstrip('.')
+    while True:
+        platform = _SOCIAL_HOSTS.get(host)
+        if platform is not None:
+            return platform
+        dot = host.find('.')
+        if dot < 0:
+            return None
+        host = host[dot + 1:]
+
+def social_links_from_hrefs(hrefs: Iterable[Any], base_url: str) -> Tuple[Dict[str, Union[str, Dict[str, Any]]], List[str]]:
+    """
+    Classify hrefs in one pass, keeping the first link found for each platform.
 
-            # Make relative URLs absolute
-            if not isinstance(href, str):
+    Args:
+        hrefs: Anchor hrefs in document order (non-strings are ignored)
+        base_url: Page URL used to resolve relative hrefs
+
+    Returns:
+        Tuple of platform -> link (in SOCIAL_PLATFORMS order) and those links as a list
+    """
+    base_url = normalize_url(base_url)
+    base_platform = classify_social_host(urlsplit(base_url).hostname)
+    found: Dict[str, str] = {}
+
+    for href in hrefs:
+        if not href or not isinstance(href, str):
+            continue
+
+        # Make relative URLs absolute
+        if not href.startswith(('http://', 'https://')):
+            # Paths relative to the page stay on its host; skip resolving them
+            # unless the page itself is on a social platform
+            if base_platform is None and not href.startswith('//') and ':' not in href.split('/', 1)[0]:
                 continue
-                
-            if not href.startswith(('http://', 'https://')):
-                href = urljoin(base_url, href)
+            href = urljoin(base_url, href)
 
-            if any(domain in href.lower() for domain in domains):
-                social_links[platform] = href
-                all_links.append(href)
+        try:
+            platform = classify_social_host(urlsplit(href).hostname)
+        except ValueError:
+            continue
+        if platform is not None and platform not in found:
+            found[platform] = href
+            if len(found) == len(SOCIAL_PLATFORMS):
                 break
 
+    social_links: Dict[str, Union[str, Dict[str, Any]]] = {
+        platform: found[platform] for platform in SOCIAL_PLATFORMS if platform in found
+    }
+    return social_links, [cast(str, link) for link in social_links.values()]
+
+@timed('page.social_links')
+def extract_social_links(
+    page: Union[BeautifulSoup, PageContent],
+    base_url: str
+) -> Tuple[Dict[str, Union[str, Dict[str, Any]]], List[str]]:
+    """
+    Extract social media links, walking the page's anchors once.
+
+    Args:
+        page: Parsed page, either streamed (see utils.helpers.html_stream) or a soup
+        base_url: Page URL used to resolve relative links
+    """
+    if isinstance(page, BeautifulSoup):
+        hrefs: Iterable[Any] = (link.get('href') for link in page.find_all('a', href=True) if isinstance(link, Tag))
+    else:
+        hrefs = page['links']
+    social_links, all_links = social_links_from_hrefs(hrefs, base_url)
     logger.info(f"Found social links: {json.dumps(social_links)}")
     return social_links, all_links
 
@@ -11,14 +11,17 @@ import socket
 import json
 import re
 from typing import Dict, List, Optional, Union, Any, cast
-import geoip2.database
 from utils.storage.maxmind_geo import geoip_manager
 from utils.helpers.url_parsing import normalize_url
+from utils.helpers.spelling_variants import score_regions
+from utils.helpers.location_scoring import combine_location_signals  # noqa: F401 (re-exported)
+from utils.monitoring.tracing import timed
 from urllib.parse import urlparse
 from types_def.data import GeoLocation, LocationSignals, AddressInfo, LanguageRegion
 
 logger = logging.getLogger(__name__)
 
+@timed('geo.ip_location')
 def get_ip_location(url: str) -> Optional[GeoLocation]:
     """Get location information from IP address with fallback mechanisms"""
     try:
@@ -30,45 +33,42 @@ def get_ip_location(url: str) -> Optional[GeoLocation]:
         
         # Try MaxMind City database first
         if 'city' in geoip_manager.databases:
-            city_path = geoip_manager.local_path / geoip_manager.databases['city']
-            if city_path.exists():
+            city_reader = geoip_manager.get_reader('city')
+            if city_reader is not None:
                 try:
-                    with geoip2.database.Reader(str(city_path)) as reader:
-                        city_response = reader.city(ip)
-                        location_data.update({
-                            'country': city_response.country.name,
-                            'city': city_response.city.name,
-                            'latitude': city_response.location.latitude,
-                            'longitude': city_response.location.longitude,
-                        })
+                    city_response = city_reader.city(ip)
+                    location_data.update({
+                        'country': city_response.country.name,
+                        'city': city_response.city.name,
+                        'latitude': city_response.location.latitude,
+                        'longitude': city_response.location.longitude,
+                    })
                 except Exception as e:
                     logger.error(f"Error reading city database: {e}")
 
         # Add ASN data if available
         if 'asn' in geoip_manager.databases:
-            asn_path = geoip_manager.local_path / geoip_manager.databases['asn']
-            if asn_path.exists():
+            asn_reader = geoip_manager.get_reader('asn')
+            if asn_reader is not None:
                 try:
-                    with geoip2.database.Reader(str(asn_path)) as reader:
-                        asn_response = reader.asn(ip)
-                        location_data.update({
-                            'autonomous_system_number': asn_response.autonomous_system_number,
-                            'autonomous_system_org': asn_response.autonomous_system_organization,
-                        })
+                    asn_response = asn_reader.asn(ip)
+                    location_data.update({
+                        'autonomous_system_number': asn_response.autonomous_system_number,
+                        'autonomous_system_org': asn_response.autonomous_system_organization,
+                    })
                 except Exception as e:
                     logger.error(f"Error reading ASN database: {e}")
 
         # Add country-specific data if available
         if 'country' in geoip_manager.databases and not location_data.get('country'):
-            country_path = geoip_manager.local_path / geoip_manager.databases['country']
-            if country_path.exists():
+            country_reader = geoip_manager.get_reader('country')
+            if country_reader is not None:
                 try:
-                    with geoip2.database.Reader(str(country_path)) as reader:
-                        country_response = reader.country(ip)
-                        location_data.update({
-                            'country': country_response.country.name,
-                            'continent': country_response.continent.name
-                        })
+                    country_response = country_reader.country(ip)
+                    location_data.update({
+                        'country': country_response.country.name,
+                        'continent': country_response.continent.name
+                    })
                 except Exception as e:
                     logger.error(f"Error reading country database: {e}")
 
@@ -117,146 +117,103 @@ def get_ip_location(url: str) -> Optional[GeoLocation]:
         logger.error(f"IP geolocation error: {str(e)}")
         return None
 
+@timed('page.language_region')
 def detect_language_region(text: str) -> Optional[Dict[str, float]]:
-    """Detect region based on language patterns"""
-    try:
-        # Dictionary of region-specific spellings
-        us_spellings = {'color', 'flavor', 'center', 'theater', 'analyze', 'customize', 'honor'}
-        non_us_spellings = {'colour', 'flavour', 'centre', 'theatre', 'analyse', 'customise', 'honour'}
+    """
+    Detect region based on language patterns
 
-        text_lower = text.lower()
-        us_count = sum(1 for word in us_spellings if word in text_lower)
-        non_us_count = sum(1 for word in non_us_spellings if word in text_lower)
+    Scores whole words against the regional spelling/vocabulary dictionaries in
+    one pass over the text (see utils.helpers.spelling_variants.score_regions).
 
-        total = us_count + non_us_count
-        if total == 0:
+    Returns:
+        Share of matched words pointing to each region (US, UK, CA, AU, IN),
+        for regions with at least one hit; None if no word matched
+    """
+    try:
+        result = score_regions(text)
+        if not result:
             logger.info("No regional spelling patterns found")
             return None
 
-        result = {
-            'US': us_count / total if total > 0 else 0,
-            'Non-US': non_us_count / total if total > 0 else 0,
-        }
         logger.info(f"Language region signals detected: {json.dumps(result)}")
         return result
     except Exception as e:
         logger.error(f"Language region detection error: {str(e)}")
         return None
 
+_US_STATES = (
+    'AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|'
+    'NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY'
+)
+_US_STREET_SUFFIXES = 'Road|Street|Ave|Avenue|Blvd|Boulevard|Rd|St|Dr|Drive|Lane|Ln|Place|Pl|Circle|Cir|Court|Ct|Highway|Hwy|Way'
+_NON_US_STREET_SUFFIXES = 'Road|Street|Avenue|Lane|Court|Way|Close|Drive|Park|Gardens|Grove|Terrace'
+
+# Addresses end in a ZIP code or a UK-style postcode; one scan finds those anchors
+_ADDRESS_ANCHOR_RE = re.compile(
+    r'(?P<zip>\b\d{5}(?:-\d{4})?\b)|(?P<postcode>\b[A-Z]{1,2}[0-9][0-9A-Z]?\s+[0-9][A-Z]{2}\b)',
+    re.IGNORECASE
+)
+# Run over the reversed text before an anchor: the letters-only part of the address
+# then the (reversed) house number. The two classes are disjoint, so this is linear.
+_REVERSED_PREFIX_RE = re.compile(r'([A-Za-z\s,]*)(\d+)')
+# What must lie between the house number and the anchor
+_US_BODY_RE = re.compile(
+    rf'\s+[A-Za-z\s,]+(?:{_US_STREET_SUFFIXES})[,\s]+(?:[A-Za-z\s]+,\s*)?(?:{_US_STATES})[,\s]+',
+    re.IGNORECASE
+)
+_NON_US_BODY_RE = re.compile(
+    rf'\s+[A-Za-z\s,]+(?:{_NON_US_STREET_SUFFIXES})[,\s]+(?:[A-Za-z\s]+,\s*)?',
+    re.IGNORECASE
+)
+# Longest address accepted, house number to postcode; bounds the work per anchor
+MAX_ADDRESS_LENGTH = 160
+
+@timed('page.addresses')
 def extract_addresses(text: str) -> List[AddressInfo]:
-    """Extract potential address information from text"""
-    # Simple pattern for US addresses
-    us_address_pattern = r'\b\d+\s+[A-Za-z\s,]+(?:Road|Street|Ave|Avenue|Blvd|Boulevard|Rd|St|Dr|Drive|Lane|Ln|Place|Pl|Circle|Cir|Court|Ct|Highway|Hwy|Way)[,\s]+(?:[A-Za-z\s]+,\s*)?(?:AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)[,\s]+\d{5}(?:-\d{4})?\b'
-
-    # Non-US address pattern
-    non_us_address_pattern = r'\b\d+\s+[A-Za-z\s,]+(?:Road|Street|Avenue|Lane|Court|Way|Close|Drive|Park|Gardens|Grove|Terrace)[,\s]+(?:[A-Za-z\s]+,\s*)?[A-Z]{1,2}[0-9][0-9A-Z]?\s+[0-9][A-Z]{2}\b'
-
-    addresses: List[AddressInfo] = []
-    us_addresses = re.findall(us_address_pattern, text, re.IGNORECASE)
-    non_us_addresses = re.findall(non_us_address_pattern, text, re.IGNORECASE)
-
-    for addr in us_addresses:
-        addresses.append({
-            'address': addr,
-            'confidence': 0.9,
-            'type': 'US'
-        })
-    for addr in non_us_addresses:
-        addresses.append({
-            'address': addr,
-            'confidence': 0.9,
-            'type': 'Non-US'
-        })
+    """
+    Extract potential address information from text
+
+    Finds ZIP code and postcode anchors in a single scan, then checks the
+    bounded stretch of text before each anchor for a house number, street
+    suffix and (for US addresses) state. Work per anchor is capped by
+    MAX_ADDRESS_LENGTH, so time is linear in the length of the text. Repeated
+    addresses are returned once; US addresses are listed before non-US ones.
+    """
+    found: Dict[str, List[str]] = {'US': [], 'Non-US': []}
+    seen = set()
+    last_end = 0
+
+    for anchor in _ADDRESS_ANCHOR_RE.finditer(text):
+        window_start = max(anchor.start() - MAX_ADDRESS_LENGTH, last_end)
+        prefix = _REVERSED_PREFIX_RE.match(text[window_start:anchor.start()][::-1])
+        if prefix is None:
+            continue
+        number_start = anchor.start() - prefix.end()
+        # The house number must start on a word boundary and be complete
+        if number_start > 0 and (text[number_start - 1].isalnum() or text[number_start - 1] == '_'):
+            continue
+
+        body = text[number_start + len(prefix.group(2)):anchor.start()]
+        if anchor.lastgroup == 'zip':
+            kind, body_re = 'US', _US_BODY_RE
+        else:
+            kind, body_re = 'Non-US', _NON_US_BODY_RE
+        if not body_re.fullmatch(body):
+            continue
+
+        address = text[number_start:anchor.end()]
+        last_end = anchor.end()
+        key = ' '.join(address.split()).lower()
+        if key not in seen:
+            seen.add(key)
+            found[kind].append(address)
+
+    addresses: List[AddressInfo] = [
+        {'address': address, 'confidence': 0.9, 'type': kind}
+        for kind in ('US', 'Non-US')
+        for address in found[kind]
+    ]
 
     if addresses:
         logger.info(f"Extracted addresses: {json.dumps(addresses)}")
     return addresses
-
-def combine_location_signals(
-    ip_location: Optional[GeoLocation],
-    language_region: Optional[Dict[str, float]],
-    extracted_addresses: List[AddressInfo],
-    content_location: Optional[str],
-    social_equivalency: Optional[Dict[str, Any]]
-) -> LocationSignals:
-    """Combine different location signals using a weighted probability model"""
-    try:
-        location_weights = {
-            'ip_geolocation': 0.25,
-            'language_patterns': 0.1,
-            'extracted_addresses': 0.3,
-            'content_mentions': 0.25,
-            'social_equivalency': 0.1
-        }
-
-        location_scores: Dict[str, Any] = {}
-        confidence: float = 0.0
-        signals_used: List[str] = []
-        final_location: Optional[str] = None
-
-        # Process IP location
-        if ip_location:
-            # Safely get confidence value as float
-            ip_confidence = float(ip_location['confidence'])
-            confidence_score = ip_confidence * location_weights['ip_geolocation']
-
-            location_scores['ip'] = {
-                'country': ip_location['country'],
-                'city': ip_location['city'],
-                'confidence': confidence_score
-            }
-            confidence += confidence_score
-            signals_used.append(f"IP Geolocation ({ip_location['source']})")
-
-        # Process language patterns
-        if language_region:
-            max_region = max(language_region.items(), key=lambda x: x[1])
-            confidence_score = float(max_region[1]) * location_weights['language_patterns']
-            location_scores['language'] = {
-                'region': max_region[0],
-                'confidence': confidence_score
-            }
-            confidence += confidence_score
-            signals_used.append(f"Language Analysis ({max_region[0]})")
-
-        # Process extracted addresses
-        if extracted_addresses:
-            # Safely get max confidence as float
-            max_confidence = max(float(addr['confidence']) for addr in extracted_addresses)
-            confidence_score = max_confidence * location_weights['extracted_addresses']
-            
-            location_scores['addresses'] = {
-                'locations': extracted_addresses,
-                'confidence': confidence_score
-            }
-            confidence += confidence_score
-            signals_used.append("Address Extraction")
-
-        # Determine final location
-        if location_scores:
-            if 'addresses' in location_scores and extracted_addresses:
-                final_location = extracted_addresses[0]['address']
-            elif 'ip' in location_scores and location_scores['ip'].get('city'):
-                final_location = f"{location_scores['ip']['city']}, {location_scores['ip']['country']}"
-            elif 'language' in location_scores:
-                final_location = f"Likely {location_scores['language']['region']} based on language patterns"
-
-        result: LocationSignals = {
-            'location': final_location,
-            'confidence': round(confidence, 2),
-            'signals': location_scores,
-            'signals_used': signals_used,
-            'error': None
-        }
-
-        logger.info(f"Final combined location result: {json.dumps(result)}")
-        return result
-    except Exception as e:
-        logger.error(f"Error combining location signals: {str(e)}")
-        return {
-            'location': None,
-            'confidence': 0,
-            'signals': {},
-            'signals_used': [],
-            'error': str(e)
-        } 
\ No newline at end of file
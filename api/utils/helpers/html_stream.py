@@ -0,0 +1,193 @@
+# utils/helpers/html_stream.py
+
+"""
+Streaming HTML parsing.
+
+Pulls links, visible text and page metadata out of HTML in a single pass over a
+byte stream, without building a document tree. Reading stops at a byte cap, so
+memory per page stays bounded however large the page is.
+"""
+
+import codecs
+import logging
+import os
+import re
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple, TypedDict
+from utils.helpers.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+# Most HTML read from one page (bytes); the rest of the page is ignored
+PAGE_MAX_BYTES = int(os.getenv("PAGE_MAX_BYTES", str(2 * 1024 * 1024)))
+PAGE_CHUNK_SIZE = 64 * 1024
+
+# Elements whose content is never visible text
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'math'})
+
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+class PageContent(TypedDict):
+    """What the page stage extracts from a document."""
+    links: List[str]
+    text: str
+    title: Optional[str]
+    lang: Optional[str]
+    meta: Dict[str, str]
+    bytes_read: int
+    truncated: bool
+
+class PageParser(HTMLParser):
+    """Event-driven parser collecting anchor hrefs, visible text and metadata."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.links: List[str] = []
+        self.text: List[str] = []
+        self.title_parts: List[str] = []
+        self.lang: Optional[str] = None
+        self.meta: Dict[str, str] = {}
+        # Text since the last tag; incremental feeds can split one run into pieces
+        self._run: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def _flush_run(self) -> None:
+        if self._run:
+            data = ''.join(self._run).strip()
+            if data:
+                self.text.append(data)
+            self._run = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush_run()
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.links.append(href.strip())
+        elif tag == 'meta':
+            values = dict(attrs)
+            name = (values.get('name') or values.get('property') or values.get('http-equiv') or '').lower()
+            if name and values.get('content') is not None and name not in self.meta:
+                self.meta[name] = values['content'] or ''
+        elif tag == 'html' and self.lang is None:
+            self.lang = dict(attrs).get('lang') or None
+        elif tag == 'title':
+            self._in_title = True
+
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # Self-closing tags never open a skipped region
+        if tag in SKIP_TAGS:
+            self._flush_run()
+            return
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_run()
+        if tag == 'title':
+            self._in_title = False
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if not self._skip_depth:
+            self._run.append(data)
+
+    def result(self, bytes_read: int, truncated: bool) -> PageContent:
+        self._flush_run()
+        title = ' '.join(''.join(self.title_parts).split()) or None
+        return {
+            'links': self.links,
+            'text': ' '.join(self.text),
+            'title': title,
+            'lang': self.lang,
+            'meta': self.meta,
+            'bytes_read': bytes_read,
+            'truncated': truncated,
+        }
+
+def _sniff_encoding(head: bytes) -> Optional[str]:
+    """Find a <meta charset> declaration in the first bytes of a document"""
+    match = _CHARSET_RE.search(head[:4096].decode('ascii', errors='ignore'))
+    if match:
+        try:
+            return codecs.lookup(match.group(1)).name
+        except LookupError:
+            return None
+    return None
+
+def parse_html_stream(
+    chunks: Iterable[bytes],
+    encoding: Optional[str] = None,
+    max_bytes: int = PAGE_MAX_BYTES
+) -> PageContent:
+    """
+    Parse HTML from a stream of byte chunks.
+
+    Args:
+        chunks: Raw document bytes, in order
+        encoding: Charset from the Content-Type header; sniffed from the document
+            (falling back to UTF-8) when None
+        max_bytes: Stop reading after this many bytes
+
+    Returns:
+        Links, visible text and metadata found in the bytes read
+    """
+    parser = PageParser()
+    decoder = None
+    bytes_read = 0
+    truncated = False
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if bytes_read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - bytes_read]
+            truncated = True
+        if decoder is None:
+            encoding = encoding or _sniff_encoding(chunk) or 'utf-8'
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            except LookupError:
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        bytes_read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if truncated:
+            break
+
+    if decoder is not None:
+        parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return parser.result(bytes_read, truncated)
+
+def parse_html(html: str) -> PageContent:
+    """Parse an HTML string that is already in memory"""
+    parser = PageParser()
+    parser.feed(html)
+    parser.close()
+    return parser.result(len(html), False)
+
+def fetch_page_content(url: str, max_bytes: int = PAGE_MAX_BYTES) -> PageContent:
+    """
+    Fetch a page through the shared HTTP session and parse it while it downloads.
+
+    Raises:
+        requests.RequestException: If the request fails or returns an error status
+    """
+    with get_http_session().get(url, headers={'Accept': 'text/html,*/*'}, stream=True) as response:
+        response.raise_for_status()
+        match = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+        page = parse_html_stream(
+            response.iter_content(chunk_size=PAGE_CHUNK_SIZE),
+            encoding=match.group(1) if match else None,
+            max_bytes=max_bytes
+        )
+    if page['truncated']:
+        logger.info(f"Stopped reading {url} after {page['bytes_read']} bytes")
+    return page
@@ -0,0 +1,51 @@
+# utils/helpers/http_client.py
+
+"""
+Shared HTTP client.
+
+Provides one pooled, keep-alive ``requests`` session with strict default timeouts,
+so outbound probes and downloads reuse connections instead of opening new ones.
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Optional, Tuple
+
+# (connect, read) timeouts in seconds applied when a call doesn't pass its own
+HTTP_TIMEOUT: Tuple[float, float] = (
+    float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("HTTP_READ_TIMEOUT", "10")),
+)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+
+USER_AGENT = 'Mozilla/5.0 (compatible; WebEntityScraper/1.0)'
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout to every request."""
+
+    def __init__(self, timeout: Tuple[float, float] = HTTP_TIMEOUT) -> None:
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+_session: Optional[TimeoutSession] = None
+_session_lock = threading.Lock()
+
+def get_http_session() -> TimeoutSession:
+    """Get the shared pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = TimeoutSession()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({'User-Agent': USER_AGENT})
+                _session = session
+    return _session
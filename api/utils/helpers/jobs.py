@@ -0,0 +1,198 @@
+# utils/helpers/jobs.py
+
+"""
+Background analysis jobs.
+
+Runs analyses on a bounded worker pool and records each signal as an event as it
+completes, so clients can poll a job or follow it over server-sent events.
+"""
+
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from utils.storage.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+# Jobs accepted but not yet finished before new submissions are refused
+ANALYSIS_MAX_PENDING = int(os.getenv("ANALYSIS_MAX_PENDING", "100"))
+# How long finished jobs stay available for polling (seconds)
+ANALYSIS_JOB_RETENTION = float(os.getenv("ANALYSIS_JOB_RETENTION", "3600"))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETE = 'complete'
+FAILED = 'failed'
+FINISHED_STATES = (COMPLETE, FAILED)
+
+class QueueFullError(Exception):
+    """Raised when too many jobs are pending to accept another."""
+
+class Job:
+    """
+    One analysis job.
+
+    Events are appended in order and never removed, so a reader can resume from
+    any index it has already seen.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._condition = threading.Condition()
+
+    def add_event(self, event: str, data: Any) -> None:
+        """Record an event and wake any waiting readers"""
+        with self._condition:
+            self.events.append({'event': event, 'data': data, 'time': time.time()})
+            self._condition.notify_all()
+
+    def set_status(self, status: str, **fields: Any) -> None:
+        """Update the status and add a matching event"""
+        with self._condition:
+            self.status = status
+            for name, value in fields.items():
+                setattr(self, name, value)
+            # Same lock as the status change, so a finished job always has its final event
+            self.add_event('status', {'status': status, 'error': self.error})
+
+    def wait_for_events(self, after: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait until there are events past index ``after``.
+
+        Args:
+            after: Number of events the caller has already seen
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            New events, or an empty list on timeout
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: len(self.events) > after, timeout=timeout)
+            return self.events[after:]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_events: bool = True) -> Dict[str, Any]:
+        with self._condition:
+            job = {
+                'id': self.id,
+                'url': self.url,
+                'status': self.status,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'signals_completed': [e['event'] for e in self.events if e['event'] != 'status'],
+                'result': self.result,
+                'error': self.error,
+            }
+            if include_events:
+                job['events'] = list(self.events)
+            return job
+
+class JobManager:
+    """
+    Runs jobs on a bounded thread pool and keeps finished jobs for a while.
+
+    Args:
+        workers: Number of jobs run concurrently
+        max_pending: Maximum number of queued or running jobs
+        retention: Seconds a job stays retrievable after submission
+    """
+
+    def __init__(
+        self,
+        workers: int = ANALYSIS_WORKERS,
+        max_pending: int = ANALYSIS_MAX_PENDING,
+        retention: float = ANALYSIS_JOB_RETENTION
+    ) -> None:
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-job")
+        self._jobs = TTLCache(maxsize=max(max_pending * 10, 1000), ttl=retention)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, url: str, work: Callable[[Job], Dict[str, Any]]) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            url: URL being analyzed
+            work: Called on a worker thread with the job; should add an event per
+                completed signal and return the final result
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"{self._pending} jobs pending (max {self.max_pending})")
+            self._pending += 1
+
+        job = Job(url)
+        self._jobs.set(job.id, job)
+        job.add_event('status', {'status': QUEUED, 'error': None})
+        try:
+            self._executor.submit(self._run, job, work)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = self._pending
+        return {'pending': pending, 'max_pending': self.max_pending, 'retained': len(self._jobs)}
+
+    def _run(self, job: Job, work: Callable[[Job], Dict[str, Any]]) -> None:
+        job.set_status(RUNNING, started_at=time.time())
+        try:
+            result = work(job)
+            job.set_status(COMPLETE, result=result, finished_at=time.time())
+        except Exception as e:
+            logger.error(f"Analysis job {job.id} for {job.url} failed: {str(e)}")
+            job.set_status(FAILED, error=str(e), finished_at=time.time())
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager() -> JobManager:
+    """Get the shared job manager, creating it on first use"""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = JobManager()
+    return _job_manager
+
+def shutdown_job_manager(wait: bool = True) -> None:
+    """Stop the shared job manager if one was started, letting running jobs finish when wait is set"""
+    global _job_manager
+    with _job_manager_lock:
+        manager, _job_manager = _job_manager, None
+    if manager is not None:
+        manager.shutdown(wait=wait)
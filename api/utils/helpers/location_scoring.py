@@ -0,0 +1,217 @@
+# utils/helpers/location_scoring.py
+
+"""
+Location signal scoring.
+
+Combines IP, language and address signals into one weighted location estimate,
+either for a single site (combine_location_signals) or for many stored rows at
+once (batch_combine_location_signals, which needs NumPy from the ``batch``
+extra).
+"""
+
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence, TYPE_CHECKING
+from types_def.data import GeoLocation, LocationSignals, AddressInfo
+from utils.monitoring.tracing import timed
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LOCATION_WEIGHTS: Dict[str, float] = {
+    'ip_geolocation': 0.25,
+    'language_patterns': 0.1,
+    'extracted_addresses': 0.3,
+    'content_mentions': 0.25,
+    'social_equivalency': 0.1
+}
+
+# Where the final location of a row came from, as returned by the batch scorer
+SOURCE_NONE = 0
+SOURCE_ADDRESSES = 1
+SOURCE_IP = 2
+SOURCE_LANGUAGE = 3
+SOURCE_NAMES = ('none', 'addresses', 'ip', 'language')
+
+@timed('location.combine')
+def combine_location_signals(
+    ip_location: Optional[GeoLocation],
+    language_region: Optional[Dict[str, float]],
+    extracted_addresses: List[AddressInfo],
+    content_location: Optional[str],
+    social_equivalency: Optional[Dict[str, Any]]
+) -> LocationSignals:
+    """Combine different location signals using a weighted probability model"""
+    try:
+        location_weights = LOCATION_WEIGHTS
+
+        location_scores: Dict[str, Any] = {}
+        confidence: float = 0.0
+        signals_used: List[str] = []
+        final_location: Optional[str] = None
+
+        # Process IP location
+        if ip_location:
+            # Safely get confidence value as float
+            ip_confidence = float(ip_location['confidence'])
+            confidence_score = ip_confidence * location_weights['ip_geolocation']
+
+            location_scores['ip'] = {
+                'country': ip_location['country'],
+                'city': ip_location['city'],
+                'confidence': confidence_score
+            }
+            confidence += confidence_score
+            signals_used.append(f"IP Geolocation ({ip_location['source']})")
+
+        # Process language patterns
+        if language_region:
+            max_region = max(language_region.items(), key=lambda x: x[1])
+            confidence_score = float(max_region[1]) * location_weights['language_patterns']
+            location_scores['language'] = {
+                'region': max_region[0],
+                'confidence': confidence_score
+            }
+            confidence += confidence_score
+            signals_used.append(f"Language Analysis ({max_region[0]})")
+
+        # Process extracted addresses
+        if extracted_addresses:
+            # Safely get max confidence as float
+            max_confidence = max(float(addr['confidence']) for addr in extracted_addresses)
+            confidence_score = max_confidence * location_weights['extracted_addresses']
+            
+            location_scores['addresses'] = {
+                'locations': extracted_addresses,
+                'confidence': confidence_score
+            }
+            confidence += confidence_score
+            signals_used.append("Address Extraction")
+
+        # Determine final location
+        if location_scores:
+            if 'addresses' in location_scores and extracted_addresses:
+                final_location = extracted_addresses[0]['address']
+            elif 'ip' in location_scores and location_scores['ip'].get('city'):
+                final_location = f"{location_scores['ip']['city']}, {location_scores['ip']['country']}"
+            elif 'language' in location_scores:
+                final_location = f"Likely {location_scores['language']['region']} based on language patterns"
+
+        result: LocationSignals = {
+            'location': final_location,
+            'confidence': round(confidence, 2),
+            'signals': location_scores,
+            'signals_used': signals_used,
+            'error': None
+        }
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Final combined location result: {json.dumps(result)}")
+        return result
+    except Exception as e:
+        logger.error(f"Error combining location signals: {str(e)}")
+        return {
+            'location': None,
+            'confidence': 0,
+            'signals': {},
+            'signals_used': [],
+            'error': str(e)
+        }
+
+def location_source(result: LocationSignals) -> int:
+    """Which signal a combine_location_signals result took its final location from"""
+    signals = result.get('signals') or {}
+    if 'addresses' in signals:
+        return SOURCE_ADDRESSES
+    if 'ip' in signals and signals['ip'].get('city'):
+        return SOURCE_IP
+    if 'language' in signals:
+        return SOURCE_LANGUAGE
+    return SOURCE_NONE
+
+def location_signal_columns(
+    ip_locations: Sequence[Optional[GeoLocation]],
+    language_regions: Sequence[Optional[Dict[str, float]]],
+    extracted_addresses: Sequence[Optional[List[AddressInfo]]]
+) -> Dict[str, "np.ndarray"]:
+    """
+    Turn per-site signals, as passed to combine_location_signals, into the columns
+    batch_combine_location_signals takes. Missing signals become NaN.
+    """
+    import numpy as np
+
+    return {
+        'ip_confidence': np.array(
+            [float(ip['confidence']) if ip else math.nan for ip in ip_locations], dtype=np.float64),
+        'ip_has_city': np.array([bool(ip and ip.get('city')) for ip in ip_locations], dtype=bool),
+        'language_confidence': np.array(
+            [float(max(region.values())) if region else math.nan for region in language_regions],
+            dtype=np.float64),
+        'address_confidence': np.array(
+            [max(float(a['confidence']) for a in addresses) if addresses else math.nan
+             for addresses in extracted_addresses],
+            dtype=np.float64),
+    }
+
+def batch_combine_location_signals(
+    ip_confidence: "np.ndarray",
+    ip_has_city: "np.ndarray",
+    language_confidence: "np.ndarray",
+    address_confidence: "np.ndarray",
+    weights: Optional[Dict[str, float]] = None
+) -> Dict[str, "np.ndarray"]:
+    """
+    Score many rows of location signals at once.
+
+    Gives exactly the confidence and final-location choice that
+    combine_location_signals gives for each row, so stored signals can be
+    re-scored in bulk after the weights change.
+
+    Args:
+        ip_confidence: IP geolocation confidence per row, NaN where there is none
+        ip_has_city: Whether the IP location has a city
+        language_confidence: Highest language-region share per row, NaN where none
+        address_confidence: Highest extracted-address confidence per row, NaN where none
+        weights: Overrides for LOCATION_WEIGHTS
+
+    Returns:
+        Dict with 'confidence' (float64, rounded to 2 places) and 'source'
+        (int8 SOURCE_* codes; see SOURCE_NAMES)
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    import numpy as np
+
+    weights = {**LOCATION_WEIGHTS, **(weights or {})}
+    ip_confidence = np.asarray(ip_confidence, dtype=np.float64)
+    language_confidence = np.asarray(language_confidence, dtype=np.float64)
+    address_confidence = np.asarray(address_confidence, dtype=np.float64)
+    has_ip = ~np.isnan(ip_confidence)
+    has_language = ~np.isnan(language_confidence)
+    has_addresses = ~np.isnan(address_confidence)
+
+    # Same operations in the same order as the scalar version; adding 0.0 for a
+    # missing signal leaves the running total unchanged
+    total = np.zeros(ip_confidence.shape, dtype=np.float64)
+    total += np.where(has_ip, ip_confidence * weights['ip_geolocation'], 0.0)
+    total += np.where(has_language, language_confidence * weights['language_patterns'], 0.0)
+    total += np.where(has_addresses, address_confidence * weights['extracted_addresses'], 0.0)
+
+    # np.round scales by 100 and can differ from round() on values within float
+    # error of a half; redo just those with round()
+    confidence = np.round(total, 2)
+    scaled = total * 100
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6):
+        confidence[i] = round(float(total[i]), 2)
+
+    source = np.select(
+        [has_addresses, has_ip & np.asarray(ip_has_city, dtype=bool), has_language],
+        [SOURCE_ADDRESSES, SOURCE_IP, SOURCE_LANGUAGE],
+        default=SOURCE_NONE
+    ).astype(np.int8)
+
+    return {'confidence': confidence, 'source': source}
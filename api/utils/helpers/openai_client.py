@@ -0,0 +1,119 @@
+# utils/helpers/openai_client.py
+
+"""
+Shared OpenAI client.
+
+One client per process keeps a single keep-alive connection pool to the API;
+building a new one per call pays for a fresh pool and TLS handshake every time.
+chat_completion() bounds the calls in flight with a semaphore and retries rate
+limited (429) and overloaded (5xx) responses with jittered exponential backoff,
+honouring Retry-After. OPENAI_BASE_URL points the client at any
+OpenAI-compatible server.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from openai.types.chat import ChatCompletion
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+# Most chat completions in flight per process; callers beyond it wait for a slot
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "4"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
+OPENAI_RETRY_BASE_DELAY = float(os.getenv("OPENAI_RETRY_BASE_DELAY", "0.5"))
+OPENAI_RETRY_MAX_DELAY = float(os.getenv("OPENAI_RETRY_MAX_DELAY", "30"))
+
+class OpenAIUnavailableError(Exception):
+    """No OpenAI API key is configured."""
+
+_client: Optional['OpenAI'] = None
+_client_key: Optional[str] = None
+_client_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+
+def get_openai_client() -> Optional['OpenAI']:
+    """
+    Get the shared client, creating it on first use.
+
+    Returns:
+        The client, or None when OPENAI_API_KEY is not set
+
+    Raises:
+        openai.OpenAIError: If the client can't be created
+    """
+    global _client, _client_key
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    # A rotated key gets a new client
+    if _client is None or _client_key != api_key:
+        with _client_lock:
+            if _client is None or _client_key != api_key:
+                from openai import OpenAI
+                # Retries are handled by chat_completion(), outside the concurrency slot
+                _client = OpenAI(
+                    api_key=api_key,
+                    base_url=os.environ.get("OPENAI_BASE_URL") or None,
+                    timeout=OPENAI_TIMEOUT,
+                    max_retries=0
+                )
+                _client_key = api_key
+    return _client
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (starting at 1).
+
+    A numeric Retry-After from the server wins; otherwise "full jitter": a
+    random delay up to an exponentially growing cap, so clients that were
+    throttled together don't retry together.
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), OPENAI_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return random.uniform(0, min(OPENAI_RETRY_MAX_DELAY, OPENAI_RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+def chat_completion(messages: List[Dict[str, Any]], **kwargs: Any) -> 'ChatCompletion':
+    """
+    Create a chat completion through the shared client.
+
+    Args:
+        messages: Chat messages
+        kwargs: Further ``chat.completions.create`` arguments; model defaults to OPENAI_MODEL
+
+    Raises:
+        OpenAIUnavailableError: If no API key is configured
+        openai.OpenAIError: If the request fails, or is still throttled after
+            OPENAI_MAX_RETRIES retries
+    """
+    import openai
+
+    client = get_openai_client()
+    if client is None:
+        raise OpenAIUnavailableError("OPENAI_API_KEY is not set")
+    kwargs.setdefault('model', OPENAI_MODEL)
+
+    attempt = 0
+    while True:
+        try:
+            with _slots:
+                return client.chat.completions.create(messages=messages, **kwargs)
+        except (openai.RateLimitError, openai.InternalServerError) as e:
+            attempt += 1
+            if attempt > OPENAI_MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt, e.response.headers.get('retry-after'))
+            logger.warning(f"OpenAI returned {e.status_code}, retry {attempt} in {delay:.2f}s")
+            # Wait without holding a slot, so other calls can use it
+            time.sleep(delay)
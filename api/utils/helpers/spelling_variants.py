@@ -0,0 +1,183 @@
+# utils/helpers/spelling_variants.py
+
+"""
+Regional spelling and vocabulary dictionaries.
+
+Words are grouped by the set of regions (US, UK, CA, AU, IN) whose writing they
+point to, and expanded from stems with the usual inflections. The word -> regions
+index is built on first use and shared afterwards; extra words can be added from
+a JSON file named by SPELLING_VARIANTS_PATH (``{"UK,AU": ["word", ...], ...}``).
+score_regions() scores text against it in a single tokenizing pass.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REGIONS: Tuple[str, ...] = ('US', 'UK', 'CA', 'AU', 'IN')
+
+US = frozenset({'US'})
+NORTH_AMERICA = frozenset({'US', 'CA'})
+# -our, -re, -ence, doubled l and -ogue spellings are shared by all Commonwealth English
+COMMONWEALTH = frozenset({'UK', 'CA', 'AU', 'IN'})
+# -ise, ae/oe and similar British forms that Canadian English does not use
+BRITISH = frozenset({'UK', 'AU', 'IN'})
+
+# colour/color, flavour/flavor, ...
+_OUR_STEMS = (
+    'colo flavo hono labo neighbo favo behavio harbo humo rumo vapo savo endeavo armo '
+    'rigo vigo odo tumo splendo fervo ardo clamo parlo cando valo'
+)
+_OUR_ENDINGS = ('', 's', 'ed', 'ing', 'ful', 'able', 'ably', 'ite', 'ites', 'er', 'ers', 'hood', 'hoods', 'less', 'al')
+
+# centre/center, theatre/theater, ...
+_RE_STEMS = 'cent theat lit fib calib somb spect lust meag sab'
+_RE_ENDINGS = (('re', 'er'), ('res', 'ers'), ('red', 'ered'), ('ring', 'ering'))
+
+# organise/organize, realise/realize, ...
+_ISE_STEMS = (
+    'organ real recogn apolog author categor critic emphas final maxim minim special summar '
+    'util visual standard normal personal central capital character civil familiar global '
+    'memor mobil modern monet optim priorit custom legal local rational synchron stabil '
+    'subsid symbol harmon jeopard hospital immun industrial initial monopol neutral patron '
+    'revolution sanit scrutin terror trivial vandal victim digit commercial decentral '
+    'democrat energ fertil formal human ideal magnet mechan miniat moistur penal polar '
+    'popular privat regular sensit social steril tantal tranquil'
+)
+_ISE_ENDINGS = ('ise', 'ised', 'ises', 'ising', 'isation', 'isations', 'iser', 'isers')
+
+# analyse/analyze, paralyse/paralyze, ...
+_YSE_STEMS = 'anal paral catal dial electrol hydrol'
+_YSE_ENDINGS = ('yse', 'ysed', 'ysing', 'yser', 'ysers')
+
+# travelled/traveled, cancelling/canceling, ...
+_LL_STEMS = (
+    'travel cancel label model fuel signal counsel level marvel channel dial duel equal '
+    'jewel quarrel rival shovel tunnel total grovel snorkel pummel tassel'
+)
+_LL_ENDINGS = ('ed', 'ing', 'er', 'ers', 'or', 'ors')
+
+# (Commonwealth or British form, US form or '' when the US form is also used elsewhere)
+_COMMONWEALTH_PAIRS = (
+    'defence:defense offence:offense pretence:pretense licence: licences: '
+    'catalogue:catalog catalogues:catalogs catalogued:cataloged cataloguing:cataloging '
+    'grey:gray greyish:grayish plough:plow ploughs:plows mould:mold mouldy:moldy moult:molt '
+    'smoulder:smolder jewellery:jewelry enrolment:enrollment enrolments:enrollments '
+    'fulfil:fulfill fulfilment:fulfillment skilful:skillful wilful:willful '
+    'instalment:installment instalments:installments storey: storeys: practise: practised: '
+    'practising: cheque: cheques:'
+)
+_BRITISH_PAIRS = (
+    'paediatric:pediatric paediatrics:pediatrics paediatrician:pediatrician '
+    'orthopaedic:orthopedic orthopaedics:orthopedics anaesthesia:anesthesia '
+    'anaesthetic:anesthetic anaesthetist:anesthesiologist haemoglobin:hemoglobin '
+    'haemorrhage:hemorrhage leukaemia:leukemia oestrogen:estrogen oesophagus:esophagus '
+    'foetus:fetus foetal:fetal manoeuvre:maneuver manoeuvres:maneuvers encyclopaedia:encyclopedia '
+    'diarrhoea:diarrhea gynaecology:gynecology aluminium:aluminum tyre: tyres: '
+    'programme: programmes: sceptical:skeptical sceptic:skeptic scepticism:skepticism '
+    'pyjamas:pajamas cosy:cozy kerb: kerbs: mum:mom mums:moms'
+)
+
+# Vocabulary (institutions, currencies, everyday words) specific to one region or a few
+_VOCABULARY: Dict[FrozenSet[str], str] = {
+    US: 'llc usps irs zipcode gasoline faucet faucets sidewalk sidewalks realtor realtors freeway '
+        'freeways cellphone usd',
+    frozenset({'UK'}): 'hmrc nhs plc lorry lorries quid ofcom ofsted gbp sterling fca dvla postcodes',
+    frozenset({'AU'}): 'abn acn pty aud arvo servo ute utes asic centrelink superannuation aussie',
+    frozenset({'CA'}): 'toque loonie toonie hst rrsp tfsa',
+    frozenset({'IN'}): 'lakh lakhs crore crores rupee rupees inr pvt gstin pincode prepone aadhaar sebi upi',
+    frozenset({'UK', 'AU'}): 'postcode fortnight fortnightly',
+    frozenset({'UK', 'AU', 'IN'}): 'petrol',
+}
+
+_WORD_RE = re.compile(r"[a-z]+")
+
+_index: Optional[Dict[str, FrozenSet[str]]] = None
+_index_lock = threading.Lock()
+
+def _add(index: Dict[str, FrozenSet[str]], words: Iterable[str], regions: FrozenSet[str]) -> None:
+    for word in words:
+        word = word.strip().lower()
+        if word:
+            index[word] = index.get(word, frozenset()) | regions
+
+def _build_index() -> Dict[str, FrozenSet[str]]:
+    index: Dict[str, FrozenSet[str]] = {}
+
+    for stem in _OUR_STEMS.split():
+        _add(index, (stem + 'ur' + ending for ending in _OUR_ENDINGS), COMMONWEALTH)
+        _add(index, (stem + 'r' + ending for ending in _OUR_ENDINGS), US)
+    for stem in _RE_STEMS.split():
+        _add(index, (stem + commonwealth for commonwealth, _ in _RE_ENDINGS), COMMONWEALTH)
+        _add(index, (stem + us for _, us in _RE_ENDINGS), US)
+    for stem in _ISE_STEMS.split():
+        _add(index, (stem + ending for ending in _ISE_ENDINGS), BRITISH)
+        _add(index, (stem + ending.replace('is', 'iz', 1) for ending in _ISE_ENDINGS), NORTH_AMERICA)
+    for stem in _YSE_STEMS.split():
+        _add(index, (stem + ending for ending in _YSE_ENDINGS), BRITISH)
+        _add(index, (stem + ending.replace('ys', 'yz', 1) for ending in _YSE_ENDINGS), NORTH_AMERICA)
+    for stem in _LL_STEMS.split():
+        _add(index, (stem + 'l' + ending for ending in _LL_ENDINGS), COMMONWEALTH)
+        _add(index, (stem + ending for ending in _LL_ENDINGS), US)
+    for pairs, regions in ((_COMMONWEALTH_PAIRS, COMMONWEALTH), (_BRITISH_PAIRS, BRITISH)):
+        for pair in pairs.split():
+            other, _, us = pair.partition(':')
+            _add(index, (other,), regions)
+            _add(index, (us,), US if regions is COMMONWEALTH else NORTH_AMERICA)
+    for regions, words in _VOCABULARY.items():
+        _add(index, words.split(), regions)
+
+    path = os.getenv("SPELLING_VARIANTS_PATH")
+    if path:
+        try:
+            with open(path, encoding='utf-8') as f:
+                extra = json.load(f)
+            for key, words in extra.items():
+                regions = frozenset(region.strip().upper() for region in key.split(','))
+                _add(index, words, regions & frozenset(REGIONS))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Could not load spelling variants from {path}: {str(e)}")
+
+    return index
+
+def get_variant_index() -> Dict[str, FrozenSet[str]]:
+    """Get the word -> regions index, building it on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = _build_index()
+                logger.debug(f"Loaded {len(_index)} regional spelling variants")
+    return _index
+
+def score_regions(text: str) -> Dict[str, float]:
+    """
+    Score text against the regional dictionaries.
+
+    Tokenizes the text once and looks each distinct word up in the index, so the
+    cost grows with the text and not with the dictionaries. A word counts for
+    every region that writes it that way.
+
+    Returns:
+        Share of matched words pointing to each region, in REGIONS order, for
+        regions with at least one hit (empty if no word matched)
+    """
+    index = get_variant_index()
+    counts = Counter(_WORD_RE.findall(text.lower()))
+
+    hits: Dict[str, int] = {}
+    total = 0
+    for word in counts.keys() & index.keys():
+        total += counts[word]
+        for region in index[word]:
+            hits[region] = hits.get(region, 0) + counts[word]
+
+    if total == 0:
+        return {}
+    return {region: hits[region] / total for region in REGIONS if region in hits}
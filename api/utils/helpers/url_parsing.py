@@ -1,5 +1,5 @@
 import logging
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +21,20 @@ def validate_url(url):
         return False
 
 def normalize_url(url):
-    """Normalize URL format"""
-    if not url.startswith(('http://', 'https://')):
-        return f'https://{url}'
-    return url 
\ No newline at end of file
+    """Normalize URL format
+
+    Adds https:// when no protocol is given, lowercases the scheme and host,
+    drops default ports, fragments and a bare trailing slash, so that spellings
+    of the same site map to one key.
+    """
+    url = url.strip()
+    if not url.lower().startswith(('http://', 'https://')):
+        url = f'https://{url}'
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(':', 1)[-1]) in (('https', '443'), ('http', '80')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = '' if parts.path == '/' else parts.path
+    return urlunsplit((scheme, netloc, path, parts.query, '')) 
\ No newline at end of file
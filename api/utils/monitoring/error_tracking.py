@@ -1,38 +1,61 @@
 from typing import Optional
 import sentry_sdk
 from sentry_sdk.integrations.flask import FlaskIntegration
-from flask import Flask, Response
+from flask import Flask, Response, g, request
 import os
+import time
 import logging
+from utils.monitoring.sampling import SamplingPolicy
+from utils.monitoring.tracing import start_recording, stop_recording, timing_breakdown
 
 logger = logging.getLogger(__name__)
 
-def init_error_tracking(app: Flask, dsn: Optional[str] = None) -> None:
+# Share of sampled requests that run the profiler; 0 keeps it off
+SENTRY_PROFILE_SESSION_SAMPLE_RATE = float(os.getenv("SENTRY_PROFILE_SESSION_SAMPLE_RATE", "0"))
+# Request headers, cookies, user IPs and bodies are only attached when opted in
+SENTRY_SEND_DEFAULT_PII = os.getenv("SENTRY_SEND_DEFAULT_PII", "false").lower() in ('1', 'true', 'yes')
+
+def init_error_tracking(app: Flask, dsn: Optional[str] = None, policy: Optional[SamplingPolicy] = None) -> None:
     """
     Initialize error tracking with GlitchTip/Sentry SDK
     
+    Errors are always sent. Performance transactions are sampled per request
+    by the policy, and the profiler only runs while a sampled one is open.
+    
     Args:
         app: Flask application instance
         dsn: GlitchTip DSN string. If None, error tracking will be disabled.
+        policy: Sampling policy; defaults to one built from the SENTRY_* settings
     """
     if not dsn:
-        logger.warning("No DSN provided for error tracking. Error tracking is disabled.")
+        logger.info("No DSN provided for error tracking. Error tracking is disabled.")
         return
         
     environment = os.environ.get('FLASK_ENV', 'development')
+    policy = policy or SamplingPolicy()
+    profiling = {}
+    if SENTRY_PROFILE_SESSION_SAMPLE_RATE > 0:
+        # 'trace' lifecycle: the profiler starts with a sampled transaction and stops after the last one
+        profiling = {
+            'profile_session_sample_rate': SENTRY_PROFILE_SESSION_SAMPLE_RATE,
+            'profile_lifecycle': 'trace',
+        }
     
     try:
         sentry_sdk.init(
             dsn=dsn,
             integrations=[FlaskIntegration()],
             environment=environment,
-            # Disable performance monitoring to focus on errors
-            traces_sample_rate=1.0,
+            traces_sampler=policy.traces_sampler,
             # Disable debug mode to reduce noise
             debug=False,
-            send_default_pii=True
+            send_default_pii=SENTRY_SEND_DEFAULT_PII,
+            **profiling
+        )
+        logger.info(
+            f"Error tracking initialized for environment: {environment} "
+            f"(traces sampled at {policy.rate}, profiling at {SENTRY_PROFILE_SESSION_SAMPLE_RATE})"
         )
-        logger.info(f"Error tracking initialized for environment: {environment}")
         
     except Exception as e:
         logger.error(f"Failed to initialize error tracking: {str(e)}")
@@ -42,4 +65,38 @@ def init_error_tracking(app: Flask, dsn: Optional[str] = None) -> None:
     def trigger_error() -> Response:
         # Explicitly capture message before error
         sentry_sdk.capture_message("Triggering test error", level="error")
-        raise ZeroDivisionError("Test error triggered via /debug-glitchtip") 
\ No newline at end of file
+        raise ZeroDivisionError("Test error triggered via /debug-glitchtip") 
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.sentry_started = time.perf_counter()
+        g.sentry_spans, g.sentry_spans_token = start_recording()
+
+    @app.after_request
+    def report_unsampled_request(response: Response) -> Response:
+        started = g.get('sentry_started')
+        if started is None:
+            return response
+        duration = time.perf_counter() - started
+        transaction = sentry_sdk.get_current_scope().transaction
+        if (transaction is None or not transaction.sampled) and policy.should_report(duration, response.status_code):
+            # The transaction wasn't kept, so send the stage timings collected for the request instead
+            with sentry_sdk.new_scope() as scope:
+                scope.set_tag('endpoint', request.endpoint or request.path)
+                scope.set_tag('status_code', response.status_code)
+                scope.set_context('timings', {
+                    'duration_ms': round(duration * 1000, 2),
+                    **timing_breakdown(g.sentry_spans)['stages_ms'],
+                })
+                sentry_sdk.capture_message(
+                    f"{'Slow' if response.status_code < 500 else 'Failed'} request: "
+                    f"{request.method} {request.path} ({response.status_code}, {duration:.2f}s)",
+                    level="warning"
+                )
+        return response
+
+    @app.teardown_request
+    def stop_request_timer(_error: Optional[BaseException]) -> None:
+        token = g.pop('sentry_spans_token', None)
+        if token is not None:
+            stop_recording(token)
@@ -1,73 +1,183 @@
-import os
+# utils/monitoring/health_checks.py
+
+"""
+Background health monitoring.
+
+Dependency checks (database, OpenAI, GeoIP) run on a background thread every
+HEALTH_CHECK_INTERVAL seconds, through the app's pooled engine and the shared
+clients. Probes read the last results, so a load balancer polling every second
+costs no database round trips. The thread is started with the server (gunicorn's
+post_fork, or main.py's development server), never by a probe; without it,
+probes run the checks on demand when the results are missing or stale.
+
+Liveness only says the process is serving requests. Readiness also requires the
+checks named in HEALTH_READINESS_CHECKS to be passing, and their results to be
+no older than HEALTH_CHECK_STALE_AFTER seconds: a checker that stopped running
+can't keep reporting an old "connected".
+"""
+
 import logging
-from openai import OpenAI
-from sqlalchemy import create_engine
-from sqlalchemy.sql import text
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from flask import Flask
+# The individual checks live in utils.health_checks; imported here for existing callers too
+from utils.health_checks import check_database_status, check_geoip_status, check_openai_status, get_partial_response
 
 logger = logging.getLogger(__name__)
 
-def get_partial_response(url, reason="API not configured"):
-    """Generate a graceful partial response when services are unavailable"""
-    response_data = {
-        "url": url,
-        "analysis": f"OpenAI analysis not available - {reason}",
-        "status": "partial",
-        # Add minimal organization data to prevent frontend errors
-        "organization": {
-            "name": "Analysis Limited",
-            "type": "Partial Analysis",
-            "location": "N/A",
-            "industry": "N/A"
-        }
-    }
-    logger.info(f"Returning partial response: {response_data}")
-    return response_data
-
-def check_openai_status():
-    """Check OpenAI API configuration and status"""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
-        logger.warning("OPENAI_API_KEY not found in environment variables")
-        return {
-            "status": "unconfigured",
-            "message": "OpenAI API key not configured"
-        }
-    
-    try:
-        client = OpenAI(api_key=api_key)
-        return {
-            "status": "configured",
-            "client": client,
-            "message": "OpenAI API configured successfully"
-        }
-    except Exception as e:
-        logger.warning(f"Failed to initialize OpenAI client: {str(e)}")
-        return {
-            "status": "error",
-            "message": f"OpenAI API configuration error: {str(e)}"
-        }
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+HEALTH_CHECK_STALE_AFTER = float(os.getenv("HEALTH_CHECK_STALE_AFTER", "60"))
+# Comma-separated check names that must pass for the instance to take traffic
+HEALTH_READINESS_CHECKS = os.getenv("HEALTH_READINESS_CHECKS", "database")
 
-def check_database_status():
-    """Check database configuration and connectivity"""
-    db_url = os.environ.get("DATABASE_URL")
-    if not db_url:
-        logger.warning("DATABASE_URL not found in environment variables")
-        return {
-            "status": "unconfigured",
-            "message": "Database URL not configured"
-        }
-    
-    try:
-        engine = create_engine(db_url)
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+PASSING_STATUSES = frozenset({'connected', 'configured', 'loaded'})
+
+class HealthMonitor:
+    """Runs registered checks periodically and serves their cached results."""
+
+    def __init__(
+        self,
+        interval: float = HEALTH_CHECK_INTERVAL,
+        stale_after: float = HEALTH_CHECK_STALE_AFTER,
+        required: Optional[List[str]] = None
+    ) -> None:
+        self.interval = interval
+        self.stale_after = stale_after
+        self.required = required if required is not None else [
+            name.strip() for name in HEALTH_READINESS_CHECKS.split(',') if name.strip()
+        ]
+        self._app: Optional[Flask] = None
+        self._checks: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._results_lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """Bind the app whose context checks run in, and register the standard checks"""
+        from api import db
+
+        self._app = app
+        self.register('database', lambda: check_database_status(db.engine))
+        self.register('openai', check_openai_status)
+        self.register('geoip', check_geoip_status)
+
+    def register(self, name: str, check: Callable[[], Dict[str, Any]]) -> None:
+        """Add a check; it returns a dict with at least 'status' and 'message'"""
+        self._checks[name] = check
+
+    def run_checks(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every check now and cache the results.
+
+        A check that raises is recorded as an error rather than stopping the others.
+
+        Returns:
+            Check name -> result, with checked_at (Unix time) and duration_ms added
+        """
+        with self._run_lock:
+            for name, check in list(self._checks.items()):
+                started = time.perf_counter()
+                try:
+                    if self._app is not None:
+                        with self._app.app_context():
+                            result = check()
+                    else:
+                        result = check()
+                except Exception as e:
+                    logger.warning(f"Health check {name} raised: {e}")
+                    result = {'status': 'error', 'message': str(e)}
+                result = dict(result, checked_at=time.time(),
+                              duration_ms=round((time.perf_counter() - started) * 1000, 2))
+                with self._results_lock:
+                    self._results[name] = result
+            with self._results_lock:
+                return dict(self._results)
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Start the background checker; with an interval <= 0 checks run on demand instead"""
+        interval = self.interval if interval is None else interval
+        if interval <= 0:
+            return
+        with self._start_lock:
+            # After a fork the thread object is copied but the thread is gone
+            if self.is_running():
+                return
+            self.interval = interval
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="health-monitor", daemon=True)
+            self._thread.start()
+        logger.info(f"Started health monitor (every {interval:.0f}s)")
+
+    def stop(self) -> None:
+        """Stop the background checker"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_checks()
+            except Exception as e:
+                logger.error(f"Health monitor error: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def is_running(self) -> bool:
+        """Whether the background checker thread is alive in this process"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Cached results with their age; never blocks on a dependency while the checker runs.
+
+        Probes don't start the checker (server start-up does, e.g. gunicorn's
+        post_fork). Without one, missing or stale results are refreshed on demand.
+
+        Returns:
+            Dict with 'checks' (per check: result, age_seconds, stale) and the
+            overall 'checked_at' (oldest result) and 'stale' flag
+        """
+        with self._results_lock:
+            results = {name: dict(result) for name, result in self._results.items()}
+        if not self.is_running() and (not results or self._is_stale(results)):
+            results = {name: dict(result) for name, result in self.run_checks().items()}
+
+        now = time.time()
+        for result in results.values():
+            result['age_seconds'] = round(now - result['checked_at'], 1)
+            result['stale'] = result['age_seconds'] > self.stale_after
+        checked_at = min((result['checked_at'] for result in results.values()), default=None)
         return {
-            "status": "connected",
-            "message": "Database connection successful"
+            'checks': results,
+            'checked_at': checked_at,
+            'stale': self._is_stale(results),
         }
-    except Exception as e:
-        logger.warning(f"Database health check failed: {str(e)}")
-        return {
-            "status": "error",
-            "message": f"Database connection error: {str(e)}"
-        } 
\ No newline at end of file
+
+    def _is_stale(self, results: Dict[str, Dict[str, Any]]) -> bool:
+        now = time.time()
+        return any(now - result['checked_at'] > self.stale_after for result in results.values())
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Whether every required check has a fresh, passing result.
+
+        Returns:
+            (ready, snapshot with a 'failing' list of the required checks holding it back)
+        """
+        snapshot = self.snapshot()
+        failing = []
+        for name in self.required:
+            result = snapshot['checks'].get(name)
+            if result is None or result['stale'] or result['status'] not in PASSING_STATUSES:
+                failing.append(name)
+        snapshot['failing'] = failing
+        return not failing, snapshot
+
+health_monitor = HealthMonitor()
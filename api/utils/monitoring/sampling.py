@@ -0,0 +1,115 @@
+# utils/monitoring/sampling.py
+
+"""
+Which requests get a Sentry performance transaction.
+
+Transactions (and the profiles tied to them) are sampled at the head: the
+decision is made when a request starts, at SENTRY_TRACES_SAMPLE_RATE or at the
+rate of the longest matching path prefix in SENTRY_TRACES_SAMPLE_OVERRIDES.
+Slow and failing requests can only be recognised once they finish, so
+error_tracking reports the ones that weren't sampled as lightweight events
+instead, up to SENTRY_SLOW_REPORTS_PER_MINUTE a minute per process.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+SENTRY_TRACES_SAMPLE_RATE = float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.01"))
+# Comma-separated path prefix=rate pairs, e.g. "/api/analyze=0.1,/api/v1/bulk=0"
+SENTRY_TRACES_SAMPLE_OVERRIDES = os.getenv("SENTRY_TRACES_SAMPLE_OVERRIDES", "")
+SENTRY_SLOW_REQUEST_SECONDS = float(os.getenv("SENTRY_SLOW_REQUEST_SECONDS", "5"))
+SENTRY_SLOW_REPORTS_PER_MINUTE = int(os.getenv("SENTRY_SLOW_REPORTS_PER_MINUTE", "30"))
+
+# Probes and scrapes are frequent and uninteresting; overrides can still sample them
+DEFAULT_OVERRIDES: Dict[str, float] = {'/api/health': 0.0, '/metrics': 0.0}
+
+def _clamp(rate: float) -> float:
+    return min(max(rate, 0.0), 1.0)
+
+def parse_overrides(value: str) -> Dict[str, float]:
+    """
+    Parse "prefix=rate" pairs; malformed entries are logged and skipped.
+
+    Args:
+        value: e.g. "/api/analyze=0.1,/api/v1/bulk=0"
+
+    Returns:
+        Path prefix -> sample rate between 0 and 1
+    """
+    overrides: Dict[str, float] = {}
+    for entry in value.split(','):
+        if not entry.strip():
+            continue
+        prefix, _, rate = entry.partition('=')
+        try:
+            overrides[prefix.strip()] = _clamp(float(rate))
+        except ValueError:
+            logger.warning(f"Ignoring malformed sample rate override: {entry!r}")
+    return overrides
+
+class SamplingPolicy:
+    """Head sample rates per path, plus the rules for reporting unsampled slow or failing requests."""
+
+    def __init__(
+        self,
+        rate: float = SENTRY_TRACES_SAMPLE_RATE,
+        overrides: Optional[Mapping[str, float]] = None,
+        slow_request_seconds: float = SENTRY_SLOW_REQUEST_SECONDS,
+        slow_reports_per_minute: int = SENTRY_SLOW_REPORTS_PER_MINUTE
+    ) -> None:
+        self.rate = _clamp(rate)
+        merged = dict(DEFAULT_OVERRIDES)
+        merged.update(overrides if overrides is not None else parse_overrides(SENTRY_TRACES_SAMPLE_OVERRIDES))
+        # Longest prefix first, so the most specific override wins
+        self.overrides = dict(sorted(merged.items(), key=lambda item: len(item[0]), reverse=True))
+        self.slow_request_seconds = slow_request_seconds
+        self.slow_reports_per_minute = slow_reports_per_minute
+        self._window_start = 0.0
+        self._window_reports = 0
+        self._lock = threading.Lock()
+
+    def rate_for(self, path: str) -> float:
+        """Sample rate of a request path"""
+        for prefix, rate in self.overrides.items():
+            if path.startswith(prefix):
+                return rate
+        return self.rate
+
+    def traces_sampler(self, sampling_context: Dict[str, Any]) -> float:
+        """
+        Sentry ``traces_sampler`` callback.
+
+        A decision already made upstream (a sampled ``sentry-trace`` header) is
+        kept, so distributed traces stay whole.
+        """
+        parent_sampled = sampling_context.get('parent_sampled')
+        if parent_sampled is not None:
+            return float(parent_sampled)
+        environ = sampling_context.get('wsgi_environ') or {}
+        path = environ.get('PATH_INFO') or sampling_context.get('transaction_context', {}).get('name') or ''
+        return self.rate_for(path)
+
+    def should_report(self, duration: float, status_code: int) -> bool:
+        """
+        Whether a finished request that wasn't sampled deserves an event.
+
+        Unhandled exceptions are captured by the SDK on their own; this covers
+        requests that were slow or answered with a 5xx.
+        """
+        if duration < self.slow_request_seconds and status_code < 500:
+            return False
+        # Fixed one-minute window, so an incident can't flood the error tracker
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_reports = 0
+            if self._window_reports >= self.slow_reports_per_minute:
+                return False
+            self._window_reports += 1
+            return True
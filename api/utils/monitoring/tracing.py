@@ -0,0 +1,243 @@
+# utils/monitoring/tracing.py
+
+"""
+Stage timing for the analysis pipeline.
+
+``span()`` (a context manager) and ``timed()`` (a decorator) measure one stage
+and record its duration, outcome and payload size in two places:
+
+- Process-wide histograms, rendered in the Prometheus text format by
+  render_prometheus() for the /metrics endpoint. Each gunicorn worker keeps its
+  own histograms, so a scrape covers only the worker that answered it.
+- The span list of the current request, when one is being recorded with
+  record_spans(). Spans use OpenTelemetry's field names (trace and span IDs,
+  parent span, start and end in Unix nanoseconds, status, attributes), so they
+  can be forwarded to an OTLP collector as they are.
+
+Work handed to a thread pool keeps its parent span and request only when it is
+submitted with ``contextvars.copy_context().run``.
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, cast
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+DURATION_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS: Tuple[float, ...] = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Set to 0 to turn span recording into a no-op
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1").lower() not in ('0', 'false', 'no')
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values, safe to update from any thread."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Per-bucket counts (the last slot is +Inf), then sum and count
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = f"{label_text}," if label_text else ''
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float('inf'),), series):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative:g}')
+            suffix = f"{{{label_text}}}" if label_text else ''
+            lines.append(f"{self.name}_sum{suffix} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]:g}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+STAGE_DURATION = Histogram(
+    'analysis_stage_duration_seconds', "Time spent in each analysis stage.",
+    ('stage', 'outcome'), DURATION_BUCKETS
+)
+STAGE_PAYLOAD = Histogram(
+    'analysis_stage_payload_bytes', "Size of the data each analysis stage produced.",
+    ('stage',), SIZE_BUCKETS
+)
+HISTOGRAMS: List[Histogram] = [STAGE_DURATION, STAGE_PAYLOAD]
+
+class Span:
+    """One timed stage; set attributes or the payload size while it runs."""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'attributes', 'size', 'start_ns', 'end_ns', 'error')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.size: Optional[int] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_size(self, size: Optional[int]) -> None:
+        self.size = size
+
+    @property
+    def duration(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        attributes = dict(self.attributes)
+        if self.size is not None:
+            attributes['payload.bytes'] = self.size
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_span_id': self.parent_id,
+            'start_time_unix_nano': self.start_ns,
+            'end_time_unix_nano': self.end_ns,
+            'duration_ms': round(self.duration * 1000, 2),
+            'status': {'code': 'ERROR', 'message': self.error} if self.error else {'code': 'OK'},
+            'attributes': attributes,
+        }
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+# Every active record_spans() list; nested recorders each receive the span
+_recorded: contextvars.ContextVar[Tuple[List[Span], ...]] = contextvars.ContextVar('recorded_spans', default=())
+
+def payload_size(value: Any) -> Optional[int]:
+    """Approximate size in bytes of a stage result, as its JSON encoding"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return None
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Time a stage.
+
+    The span is marked as failed, and the exception re-raised, if the block raises.
+
+    Args:
+        name: Stage name, e.g. 'geoip.maxmind'; becomes the ``stage`` metric label
+        attributes: Initial span attributes
+    """
+    parent = _current_span.get()
+    current = Span(name, parent.trace_id if parent else secrets.token_hex(16),
+                   parent.span_id if parent else None, attributes)
+    if not TRACING_ENABLED:
+        yield current
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        STAGE_DURATION.observe(current.duration, name, 'error' if current.error else 'ok')
+        if current.size is not None:
+            STAGE_PAYLOAD.observe(current.size, name)
+        for recorded in _recorded.get():
+            recorded.append(current)
+
+def timed(name: str, size: Optional[Callable[[Any], Optional[int]]] = payload_size) -> Callable[[F], F]:
+    """
+    Decorator form of span().
+
+    Args:
+        name: Stage name
+        size: Computes the payload size from the return value (None to skip)
+    """
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name) as current:
+                result = func(*args, **kwargs)
+                if size is not None and TRACING_ENABLED:
+                    current.set_size(size(result))
+                return result
+        return cast(F, wrapper)
+    return decorator
+
+def start_recording() -> Tuple[List[Span], contextvars.Token]:
+    """
+    Begin collecting spans for code that can't wrap its work in record_spans(),
+    such as a pair of request hooks.
+
+    Returns:
+        The span list, and the token to pass to stop_recording()
+    """
+    spans: List[Span] = []
+    return spans, _recorded.set(_recorded.get() + (spans,))
+
+def stop_recording(token: contextvars.Token) -> None:
+    _recorded.reset(token)
+
+@contextmanager
+def record_spans() -> Iterator[List[Span]]:
+    """Collect every span finished in this context (and contexts copied from it) into a list"""
+    spans, token = start_recording()
+    try:
+        yield spans
+    finally:
+        stop_recording(token)
+
+def timing_breakdown(spans: Sequence[Span]) -> Dict[str, Any]:
+    """Summarize recorded spans for a response: total per stage plus the spans themselves"""
+    stages: Dict[str, float] = {}
+    for recorded in spans:
+        stages[recorded.name] = round(stages.get(recorded.name, 0.0) + recorded.duration * 1000, 2)
+    return {
+        'stages_ms': stages,
+        'spans': [recorded.to_dict() for recorded in sorted(spans, key=lambda s: s.start_ns)],
+    }
+
+def render_prometheus() -> str:
+    """All histograms in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return '\n'.join(lines) + '\n'
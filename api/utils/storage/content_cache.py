@@ -0,0 +1,151 @@
+# utils/storage/content_cache.py
+
+"""
+Content-hash cache for LLM content analysis.
+
+An analysis depends only on the page text, the model and the prompt, so results
+are keyed on a hash of those three and survive URL cache expiry and
+``refresh=1``. Re-analyzing a page whose text hasn't changed skips the LLM call.
+Changing OPENAI_MODEL or the prompt version starts from an empty cache.
+
+The table is bounded by CONTENT_CACHE_MAX_BYTES of stored payload. The least
+recently used rows are evicted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from utils.storage.signal_store import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# last_used_at is rewritten at most this often per row, so hits rarely cost a write
+TOUCH_INTERVAL = timedelta(hours=1)
+
+def normalize_text(text: str) -> str:
+    """Canonical form of extracted page text: NFKC with whitespace runs collapsed"""
+    return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+def content_key(text: str, model: str, prompt_version: int) -> str:
+    """Cache key of an analysis: SHA256 over the model, prompt version and normalized text"""
+    digest = hashlib.sha256(f"{model}\0{prompt_version}\0".encode('utf-8'))
+    digest.update(normalize_text(text).encode('utf-8'))
+    return digest.hexdigest()
+
+class ContentAnalysisCache:
+    """
+    Stores content analyses through Flask-SQLAlchemy; must be used inside an app context.
+
+    Read and write failures are logged and treated as misses, so the cache
+    never fails an analysis.
+
+    Args:
+        db: The application's SQLAlchemy extension
+        model: Model with content_hash, model, prompt_version, payload, size,
+            created_at and last_used_at columns
+        max_bytes: Most payload bytes kept before the least recently used rows are evicted
+    """
+
+    def __init__(self, db: Any, model: Any, max_bytes: int = CONTENT_CACHE_MAX_BYTES) -> None:
+        self.db = db
+        self.model = model
+        self.max_bytes = max_bytes
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several keys in one query.
+
+        Returns:
+            Key -> cached analysis, for the keys that were found
+        """
+        keys = list(set(keys))
+        if not keys:
+            return {}
+        session = self.db.session
+        try:
+            rows = session.execute(
+                self.db.select(self.model).where(self.model.content_hash.in_(keys))
+            ).scalars().all()
+            now = datetime.utcnow()
+            stale = [row.id for row in rows if now - row.last_used_at > TOUCH_INTERVAL]
+            if stale:
+                session.execute(
+                    self.db.update(self.model).where(self.model.id.in_(stale)).values(last_used_at=now)
+                )
+                session.commit()
+            return {row.content_hash: json.loads(row.payload) for row in rows}
+        except Exception as e:
+            logger.warning(f"Content cache read failed: {str(e)}")
+            session.rollback()
+            return {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, entries: Dict[str, Dict[str, Any]], model: str, prompt_version: int) -> None:
+        """Store analyses by key, then evict the oldest rows if the cache is over its size bound"""
+        if not entries:
+            return
+        now = datetime.utcnow()
+        rows: List[Dict[str, Any]] = []
+        for key, analysis in entries.items():
+            payload = json.dumps(analysis, default=str)
+            rows.append({
+                'content_hash': key, 'model': model, 'prompt_version': prompt_version,
+                'payload': payload, 'size': len(payload.encode('utf-8')),
+                'created_at': now, 'last_used_at': now,
+            })
+        session = self.db.session
+        try:
+            bulk_upsert(session, self.model, rows, ('content_hash',), ('payload', 'size', 'last_used_at'))
+            session.commit()
+        except Exception as e:
+            logger.warning(f"Content cache write failed: {str(e)}")
+            session.rollback()
+            return
+        self.evict()
+
+    def set(self, key: str, analysis: Dict[str, Any], model: str, prompt_version: int) -> None:
+        self.set_many({key: analysis}, model, prompt_version)
+
+    def evict(self) -> int:
+        """
+        Delete least recently used rows until the payload total fits max_bytes.
+
+        Returns:
+            Number of rows deleted
+        """
+        session = self.db.session
+        try:
+            total = session.execute(self.db.select(self.db.func.sum(self.model.size))).scalar() or 0
+            excess = total - self.max_bytes
+            if excess <= 0:
+                return 0
+
+            victims: List[int] = []
+            rows = session.execute(
+                self.db.select(self.model.id, self.model.size)
+                .order_by(self.model.last_used_at, self.model.id)
+                .execution_options(yield_per=500)
+            )
+            for row_id, size in rows:
+                if excess <= 0:
+                    break
+                victims.append(row_id)
+                excess -= size
+            rows.close()
+            for start in range(0, len(victims), 500):
+                session.execute(self.db.delete(self.model).where(self.model.id.in_(victims[start:start + 500])))
+            session.commit()
+            logger.info(f"Evicted {len(victims)} content analyses to stay under {self.max_bytes} bytes")
+            return len(victims)
+        except Exception as e:
+            logger.warning(f"Content cache eviction failed: {str(e)}")
+            session.rollback()
+            return 0
@@ -0,0 +1,260 @@
+# utils/storage/geoip_download.py
+
+"""
+GeoLite2 database downloads from MaxMind.
+
+Each edition's tarball is downloaded to a ``.part`` file. An interrupted transfer
+resumes from where it stopped with an HTTP Range request instead of starting
+over. The archive is checked against the SHA256 that MaxMind publishes next to
+it, and the ``.mmdb`` member is then streamed out of the compressed tar
+straight into place. download_editions() fetches several editions concurrently.
+
+Every worker process runs its own refresher, so a download holds an exclusive
+lock on its ``.part`` file from the first byte until the database is in place;
+another process downloading the same edition waits for it instead of writing
+to the same file.
+"""
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import concurrent.futures
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+import requests
+from utils.helpers.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+# Base of the download endpoint; point it at a mirror or a local stub for testing
+MAXMIND_DOWNLOAD_URL = os.getenv("MAXMIND_DOWNLOAD_URL", "https://download.maxmind.com/geoip/databases")
+# Attempts per edition; every attempt after the first resumes the partial download
+MAXMIND_DOWNLOAD_ATTEMPTS = int(os.getenv("MAXMIND_DOWNLOAD_ATTEMPTS", "4"))
+MAXMIND_DOWNLOAD_WORKERS = int(os.getenv("MAXMIND_DOWNLOAD_WORKERS", "4"))
+
+# Progress lost when a transfer breaks is at most one chunk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+class DownloadError(Exception):
+    """An edition could not be downloaded, verified or extracted."""
+
+class ChecksumMismatchError(DownloadError):
+    """A downloaded archive does not match its published SHA256."""
+
+def edition_url(edition_id: str, suffix: str = 'tar.gz') -> str:
+    """Download URL of an edition's archive (or of its checksum, with suffix 'tar.gz.sha256')"""
+    return f"{MAXMIND_DOWNLOAD_URL.rstrip('/')}/{edition_id}/download?suffix={suffix}"
+
+def fetch_sha256(edition_id: str, auth: Tuple[str, str]) -> str:
+    """
+    Get the published SHA256 of an edition's archive.
+
+    The checksum file has the ``sha256sum`` format: ``<hex digest>  <file name>``.
+
+    Raises:
+        DownloadError: If the checksum can't be fetched or parsed
+    """
+    try:
+        response = get_http_session().get(edition_url(edition_id, 'tar.gz.sha256'), auth=auth)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise DownloadError(f"Could not fetch checksum for {edition_id}: {e}") from e
+
+    digest = response.text.split()[0].lower() if response.text.split() else ''
+    if len(digest) != 64 or any(c not in '0123456789abcdef' for c in digest):
+        raise DownloadError(f"Malformed checksum for {edition_id}: {response.text[:100]!r}")
+    return digest
+
+def _hash_file(path: Path) -> Any:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest
+
+def _transfer(url: str, part_path: Path, auth: Tuple[str, str]) -> Any:
+    """
+    Append the rest of the archive to part_path, resuming from its current size.
+
+    Returns:
+        SHA256 state covering the whole file once the transfer completes
+
+    Raises:
+        requests.RequestException: If the connection fails mid-transfer
+    """
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+    with get_http_session().get(url, auth=auth, headers=headers, stream=True) as response:
+        if response.status_code == 416:
+            # Nothing left to send: the partial file is already complete
+            return _hash_file(part_path)
+        response.raise_for_status()
+
+        if offset and response.status_code == 206:
+            logger.info(f"Resuming {part_path.name} at byte {offset}")
+            digest = _hash_file(part_path)
+            mode = 'ab'
+        else:
+            # The server ignored the Range header (or there was nothing to resume)
+            digest = hashlib.sha256()
+            mode = 'wb'
+
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+    return digest
+
+def extract_mmdb(archive_path: Path, dest_dir: Path) -> Path:
+    """
+    Stream the .mmdb member of a GeoLite2 tarball into dest_dir.
+
+    The member is decompressed straight into a temporary file next to the target,
+    which then replaces it, so open readers keep mapping the old file.
+
+    Raises:
+        DownloadError: If the archive contains no .mmdb file
+    """
+    # 'r|gz' reads the archive front to back without seeking or an index
+    with tarfile.open(archive_path, mode='r|gz') as tar:
+        for member in tar:
+            if not (member.isfile() and member.name.endswith('.mmdb')):
+                continue
+            source = tar.extractfile(member)
+            if source is None:
+                continue
+            db_path = dest_dir / os.path.basename(member.name)
+            # Unique per extraction, so processes extracting the same edition don't share a file
+            with tempfile.NamedTemporaryFile(dir=dest_dir, prefix=f".{db_path.name}.",
+                                             suffix='.download', delete=False) as f:
+                tmp_path = Path(f.name)
+            try:
+                with source, open(tmp_path, 'wb') as f:
+                    shutil.copyfileobj(source, f, DOWNLOAD_CHUNK_SIZE)
+                os.replace(tmp_path, db_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            return db_path
+    raise DownloadError(f"No .mmdb file in {archive_path.name}")
+
+@contextmanager
+def _locked(part_path: Path) -> Iterator[int]:
+    """
+    Hold an exclusive lock on part_path (created if missing) for the duration.
+
+    The file may have been finished and unlinked by the previous holder while
+    this process waited, so the lock only counts once it is held on the file
+    that is still at part_path.
+
+    Returns:
+        The locked file descriptor
+    """
+    while True:
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                current = os.stat(part_path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current == os.fstat(fd).st_ino:
+                break
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+def download_edition(edition_id: str, dest_dir: Path, auth: Tuple[str, str]) -> Path:
+    """
+    Download, verify and extract one edition.
+
+    Args:
+        edition_id: e.g. 'GeoLite2-City'
+        dest_dir: Directory the .mmdb file is placed in
+        auth: MaxMind (account ID, license key)
+
+    Returns:
+        Path of the extracted database
+
+    Raises:
+        DownloadError: If the download fails after MAXMIND_DOWNLOAD_ATTEMPTS
+            attempts, or the archive fails verification twice
+    """
+    expected = fetch_sha256(edition_id, auth)
+    part_path = dest_dir / f"{edition_id}.tar.gz.part"
+    url = edition_url(edition_id)
+    mismatches = 0
+    last_error: Optional[Exception] = None
+
+    with _locked(part_path) as fd:
+        for attempt in range(1, MAXMIND_DOWNLOAD_ATTEMPTS + 1):
+            try:
+                digest = _transfer(url, part_path, auth)
+            except requests.RequestException as e:
+                last_error = e
+                logger.warning(f"Download of {edition_id} interrupted (attempt {attempt}): {e}")
+                continue
+
+            if digest.hexdigest() == expected:
+                try:
+                    db_path = extract_mmdb(part_path, dest_dir)
+                except (tarfile.TarError, OSError) as e:
+                    raise DownloadError(f"Could not extract {edition_id}: {e}") from e
+                finally:
+                    # Also when extraction fails: a kept archive would verify and fail again on every retry
+                    part_path.unlink()
+                logger.info(f"✓ Downloaded and verified {edition_id} ({db_path.stat().st_size} bytes)")
+                return db_path
+
+            # A stale partial file from an older release; start again from scratch.
+            # Truncated rather than unlinked, so the lock stays on the file at part_path
+            os.ftruncate(fd, 0)
+            mismatches += 1
+            last_error = ChecksumMismatchError(f"{edition_id} archive does not match SHA256 {expected}")
+            logger.warning(str(last_error))
+            if mismatches > 1:
+                part_path.unlink()
+                raise last_error
+
+        raise DownloadError(f"Could not download {edition_id}: {last_error}")
+
+def download_editions(
+    edition_ids: Iterable[str],
+    dest_dir: Path,
+    auth: Tuple[str, str],
+    workers: int = MAXMIND_DOWNLOAD_WORKERS
+) -> Dict[str, Optional[Path]]:
+    """
+    Download several editions concurrently.
+
+    Returns:
+        Edition ID -> database path, or None for editions that failed (failures are logged)
+    """
+    edition_ids = list(edition_ids)
+    results: Dict[str, Optional[Path]] = {}
+    if not edition_ids:
+        return results
+
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(workers, len(edition_ids)), thread_name_prefix="geoip-download"
+    ) as executor:
+        futures = {executor.submit(download_edition, edition, dest_dir, auth): edition for edition in edition_ids}
+        for future in concurrent.futures.as_completed(futures):
+            edition = futures[future]
+            try:
+                results[edition] = future.result()
+            except Exception as e:
+                logger.error(f"✗ MaxMind download failed for {edition}: {e}")
+                results[edition] = None
+    return results
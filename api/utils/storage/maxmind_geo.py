@@ -2,20 +2,30 @@
 
 import os
 import logging
-import requests
-import tarfile
 import socket
+import threading
+import concurrent.futures
+import contextvars
+import time
+import ipaddress
 import geoip2.database
 import geoip2.errors
+import maxminddb
 import dns.resolver
 import dns.exception
 import ssl
+import http.client
 import OpenSSL.crypto
 from OpenSSL import crypto
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, cast, Type, TypeVar, ClassVar
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union, Any, cast, Type, TypeVar, ClassVar
 from utils.storage.s3_bucket import s3_manager
+from utils.storage.geoip_download import download_edition, download_editions
+from utils.storage.ttl_cache import TTLCache
+from utils.helpers.dns_resolver import resolve, resolve_many, run_sync
+from utils.helpers.http_client import HTTP_TIMEOUT, USER_AGENT
+from utils.monitoring.tracing import span, timed
 from types_def.utils.storage.maxmind_geo import GeoIPManager as GeoIPManagerProtocol
 
 logger = logging.getLogger(__name__)
@@ -29,6 +39,65 @@ CDN_ASNS = {
     15169: "Google Cloud CDN",
 }
 
+# Database files looked up when an edition is not listed in GEOIPUPDATE_EDITION_IDS
+DEFAULT_DATABASES = {
+    'city': "GeoLite2-City.mmdb",
+    'country': "GeoLite2-Country.mmdb",
+    'asn': "GeoLite2-ASN.mmdb",
+}
+
+# Overall deadline (seconds) for collecting additional signals behind a CDN
+GEO_SIGNALS_DEADLINE = float(os.getenv("GEO_SIGNALS_DEADLINE", "10"))
+
+# Per-collector timeouts (seconds), each capped by GEO_SIGNALS_DEADLINE
+SIGNAL_COLLECTOR_TIMEOUTS = {
+    'dns': float(os.getenv("GEO_SIGNAL_TIMEOUT_DNS", "6")),
+    'ip': float(os.getenv("GEO_SIGNAL_TIMEOUT_IP", "5")),
+    'connection': float(os.getenv("GEO_SIGNAL_TIMEOUT_CONNECTION", "8")),
+}
+
+# Same-host redirects the connection probe follows on its socket
+PROBE_MAX_REDIRECTS = 3
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Worker threads per signal collector
+GEO_SIGNAL_WORKERS = int(os.getenv("GEO_SIGNAL_WORKERS", "16"))
+
+# Seconds a swapped-out reader stays open so in-flight lookups can finish on the old mmap
+READER_GRACE_PERIOD = 60.0
+
+class MaxMindReader(geoip2.database.Reader):
+    """
+    geoip2 reader paired with a maxminddb reader on the same file, for raw records.
+
+    geoip2 has no public raw-record API, so batch lookups read records through
+    the paired reader instead. Both map the same file, so the second mapping
+    shares its pages, and the pair is swapped, retired and closed as one.
+
+    Args:
+        db_path: Path of the .mmdb file
+        mode: maxminddb open mode, e.g. MODE_MMAP_EXT or MODE_MMAP
+    """
+
+    def __init__(self, db_path: Path, mode: int) -> None:
+        super().__init__(str(db_path), mode=mode)
+        try:
+            self.records = maxminddb.open_database(str(db_path), mode)
+        except BaseException:
+            super().close()
+            raise
+
+    def close(self) -> None:
+        super().close()
+        self.records.close()
+
+def _record_name(record: Dict[str, Any], key: str) -> Optional[str]:
+    """Get the English name from a raw MaxMind record section (e.g. 'city', 'country')"""
+    section = record.get(key)
+    if not section:
+        return None
+    return section.get('names', {}).get('en')
+
 class GeoIPManager:
     """Manages MaxMind GeoIP database files and access."""
     
@@ -39,6 +108,11 @@ class GeoIPManager:
     s3_prefix: str
     local_path: Path
     databases: Dict[str, str]
+    _readers: Dict[str, MaxMindReader]
+    _readers_lock: threading.Lock
+    _reader_info: Dict[str, Dict[str, Any]]
+    _retired_readers: List[Tuple[float, Dict[str, MaxMindReader]]]
+    _refresher: Optional[threading.Thread]
     
     def __new__(cls) -> 'GeoIPManager':
         if cls._instance is None:
@@ -58,6 +132,33 @@ class GeoIPManager:
         self.s3_key = "geoip/GeoLite2-City.mmdb"
         self.s3_prefix = "geoip"
         self.databases = {}
+        self._readers = {}
+        self._readers_lock = threading.Lock()
+        self._reader_info = {}
+        self._retired_readers = []
+        self._readers_generation = 0
+        self._lookup_cache = TTLCache(
+            maxsize=int(os.getenv("GEOIP_CACHE_SIZE", "65536")),
+            ttl=float(os.getenv("GEOIP_CACHE_TTL", "3600"))
+        )
+        self._cached_prefix_lens: Set[Tuple[int, int]] = set()
+        self._lookup_cache_hits = 0
+        self._lookup_cache_misses = 0
+        # One pool per additional signal collector in lookup_url, so stragglers of
+        # one collector (e.g. hosts that never answer the connection probe) can
+        # only delay that collector and not starve the others
+        self._signal_executors = {
+            name: concurrent.futures.ThreadPoolExecutor(
+                max_workers=GEO_SIGNAL_WORKERS,
+                thread_name_prefix=f"geo-signals-{name}"
+            )
+            for name in SIGNAL_COLLECTOR_TIMEOUTS
+        }
+        self._refresher = None
+        self._refresher_stop = threading.Event()
+        self._refresh_interval: Optional[float] = None
+        self._last_refresh_check: Optional[float] = None
+        self._last_refresh_error: Optional[str] = None
         
         # Default to ~/Developer/volumes/GeoIP for local development
         self.local_path = Path.home() / "Developer" / "volumes" / "GeoIP"
@@ -73,9 +174,6 @@ class GeoIPManager:
         else:
             logger.info(f"Using default path: {self.local_path}")
         
-        # Ensure we can write to the directory
-        self._ensure_directory_access()
-        
         # Get database editions from environment
         editions = os.getenv("GEOIPUPDATE_EDITION_IDS", "GeoLite2-City GeoLite2-Country").split()
         logger.info(f"Configured database editions: {editions}")
@@ -83,9 +181,40 @@ class GeoIPManager:
         for edition in editions:
             db_type = edition.replace('GeoLite2-', '').lower()
             self.databases[db_type] = f"{edition}.mmdb"
-        
-        # Check databases on startup
-        self._verify_databases()
+
+        # Databases are checked, downloaded and opened by warmup(), on first use at the latest
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def warmup(self) -> None:
+        """
+        Make the databases ready for lookups: download missing ones, open the
+        readers and start the refresher.
+
+        Runs once, on the first lookup if not called before. Servers should call
+        it at startup so the first request doesn't pay for it.
+        """
+        if self._started:
+            return
+        with self._start_lock:
+            if self._started:
+                return
+            start = time.perf_counter()
+
+            # Ensure we can write to the directory
+            self._ensure_directory_access()
+
+            # Check databases on startup
+            self._verify_databases()
+
+            # Keep one memory-mapped reader per edition for the lifetime of the process
+            self.open_readers()
+
+            # Pick up new database releases without a restart
+            self.start_refresher()
+
+            self._started = True
+            logger.info(f"GeoIP Manager ready in {(time.perf_counter() - start) * 1000:.0f}ms")
 
     def _ensure_directory_access(self):
         """Ensure we have read/write access to the directory"""
@@ -106,6 +235,246 @@ class GeoIPManager:
             self.local_path.mkdir(parents=True, exist_ok=True)
             logger.info(f"Falling back to {self.local_path}")
     
+    def _database_filename(self, db_type: str) -> str:
+        """Get the configured filename for a database type"""
+        return self.databases.get(db_type, DEFAULT_DATABASES.get(db_type, f"GeoLite2-{db_type}.mmdb"))
+
+    def _load_reader(self, db_type: str) -> Optional[MaxMindReader]:
+        """Open a reader for one database type and record which file version it serves"""
+        db_path = self.local_path / self._database_filename(db_type)
+        if not db_path.exists():
+            return None
+        try:
+            reader = self._open_mmap_reader(db_path)
+        except Exception as e:
+            logger.error(f"✗ Could not open {db_type} database at {db_path}: {e}")
+            return None
+
+        info = self._reader_info.setdefault(db_type, {'swaps': 0, 'last_swap_ms': None})
+        info.update({
+            'path': str(db_path),
+            'mtime': db_path.stat().st_mtime,
+            'build_epoch': reader.metadata().build_epoch,
+            'loaded_at': time.time(),
+        })
+        logger.info(f"✓ Opened {db_type} database reader at {db_path}")
+        return reader
+
+    def _open_reader_set(self) -> Dict[str, MaxMindReader]:
+        """Open a memory-mapped reader for every database present on disk"""
+        readers: Dict[str, MaxMindReader] = {}
+        for db_type in {**DEFAULT_DATABASES, **self.databases}:
+            reader = self._load_reader(db_type)
+            if reader is not None:
+                readers[db_type] = reader
+        return readers
+
+    @staticmethod
+    def _open_mmap_reader(db_path: Path) -> MaxMindReader:
+        """Open a memory-mapped reader, preferring the C extension when it is installed"""
+        try:
+            return MaxMindReader(db_path, maxminddb.MODE_MMAP_EXT)
+        except ValueError:
+            # maxminddb C extension not available - use the pure Python mmap reader
+            return MaxMindReader(db_path, maxminddb.MODE_MMAP)
+
+    def open_readers(self) -> None:
+        """Open the shared database readers (no-op for editions already open)"""
+        with self._readers_lock:
+            if self._readers:
+                return
+            self._readers = self._open_reader_set()
+            self._invalidate_lookup_cache()
+
+    def close_readers(self) -> None:
+        """Close all shared database readers, including ones retired by a swap"""
+        with self._readers_lock:
+            readers, self._readers = self._readers, {}
+            self._retire_readers(readers)
+            self._invalidate_lookup_cache()
+        self._close_retired_readers(force=True)
+
+    def reopen_readers(self) -> None:
+        """Re-open all readers, e.g. after the database files were replaced on disk"""
+        new_readers = self._open_reader_set()
+        with self._readers_lock:
+            old_readers, self._readers = self._readers, new_readers
+            self._retire_readers(old_readers)
+            self._invalidate_lookup_cache()
+
+    def get_reader(self, db_type: str) -> Optional[geoip2.database.Reader]:
+        """Get the shared reader for a database type ('city', 'country' or 'asn')"""
+        if not self._started:
+            self.warmup()
+        return self._readers.get(db_type)
+
+    def _swap_reader(self, db_type: str) -> bool:
+        """Atomically replace the reader for one database type with a freshly opened one"""
+        start = time.perf_counter()
+        new_reader = self._load_reader(db_type)
+        if new_reader is None:
+            return False
+
+        # Lookups grab the readers dict once, so replacing the reference is atomic for them
+        with self._readers_lock:
+            readers = dict(self._readers)
+            old_reader = readers.get(db_type)
+            readers[db_type] = new_reader
+            self._readers = readers
+            if old_reader is not None:
+                self._retire_readers({db_type: old_reader})
+            self._invalidate_lookup_cache()
+
+        swap_ms = (time.perf_counter() - start) * 1000
+        info = self._reader_info[db_type]
+        info['swaps'] += 1
+        info['last_swap_ms'] = round(swap_ms, 2)
+        logger.info(f"✓ Swapped in new {db_type} database in {swap_ms:.1f}ms")
+        return True
+
+    def _retire_readers(self, readers: Dict[str, MaxMindReader]) -> None:
+        """Queue replaced readers for closing once in-flight lookups have finished"""
+        if readers:
+            self._retired_readers.append((time.monotonic(), readers))
+
+    def _close_retired_readers(self, force: bool = False) -> None:
+        """Close retired readers older than the grace period (or all of them if forced)"""
+        cutoff = time.monotonic() - READER_GRACE_PERIOD
+        with self._readers_lock:
+            expired = [readers for retired_at, readers in self._retired_readers if force or retired_at <= cutoff]
+            self._retired_readers = [
+                (retired_at, readers) for retired_at, readers in self._retired_readers
+                if not (force or retired_at <= cutoff)
+            ]
+        for readers in expired:
+            for db_type, reader in readers.items():
+                try:
+                    reader.close()
+                except Exception as e:
+                    logger.warning(f"Error closing {db_type} database reader: {e}")
+
+    def refresh_databases(self) -> List[str]:
+        """
+        Check for newer database releases and hot-swap any that changed.
+
+        A database is considered changed when its S3 ETag differs from the one we
+        last downloaded, when no S3 copy exists and the local file is older than
+        GEOIP_MAX_AGE_DAYS (a new MaxMind download is attempted), or when the file
+        on disk was replaced by another process (e.g. geoipupdate).
+
+        Returns:
+            List of database types that were swapped in
+        """
+        logger.info("Checking for GeoIP database updates...")
+        self._last_refresh_check = time.time()
+        self._last_refresh_error = None
+        max_age = float(os.getenv("GEOIP_MAX_AGE_DAYS", "7")) * 86400
+        swapped: List[str] = []
+
+        for db_type, filename in self.databases.items():
+            try:
+                db_path = self.local_path / filename
+                s3_key = f"{self.s3_prefix}/{filename}"
+                local_mtime = db_path.stat().st_mtime if db_path.exists() else None
+
+                s3_info = s3_manager.get_object_info(s3_key)
+                if s3_info is not None:
+                    known_etag = self._reader_info.get(db_type, {}).get('etag') or s3_manager.local_etag(db_path, s3_key)
+                    s3_modified = s3_info['last_modified'].timestamp() if s3_info.get('last_modified') else None
+                    is_newer = (
+                        local_mtime is None
+                        or (known_etag is not None and known_etag != s3_info['etag'])
+                        or (known_etag is None and s3_modified is not None and s3_modified > local_mtime)
+                    )
+                    if is_newer:
+                        logger.info(f"Newer {db_type} database found in S3 (ETag {s3_info['etag']})")
+                        self._download_from_s3(db_type)
+                    self._reader_info.setdefault(db_type, {'swaps': 0, 'last_swap_ms': None})['etag'] = s3_info['etag']
+                elif local_mtime is None or time.time() - local_mtime > max_age:
+                    logger.info(f"{db_type} database is missing or older than {max_age / 86400:.0f} days, checking MaxMind...")
+                    if self._download_from_maxmind(db_type):
+                        s3_manager.upload_file(db_path, s3_key)
+
+                # Swap whenever the file on disk is not the one currently being served
+                loaded_mtime = self._reader_info.get(db_type, {}).get('mtime')
+                if db_path.exists() and (db_type not in self._readers or db_path.stat().st_mtime != loaded_mtime):
+                    if self._swap_reader(db_type):
+                        swapped.append(db_type)
+            except Exception as e:
+                self._last_refresh_error = f"{db_type}: {e}"
+                logger.error(f"✗ Failed to refresh {db_type} database: {e}")
+
+        self._close_retired_readers()
+        if swapped:
+            logger.info(f"✓ Hot-swapped GeoIP databases: {swapped}")
+        return swapped
+
+    def start_refresher(self, interval: Optional[float] = None) -> None:
+        """Start the background thread that periodically calls refresh_databases()"""
+        if interval is None:
+            interval = float(os.getenv("GEOIP_REFRESH_INTERVAL", "21600"))
+        if interval <= 0:
+            logger.info("GeoIP database refresher disabled")
+            return
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+
+        self._refresh_interval = interval
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="geoip-refresher",
+            daemon=True
+        )
+        self._refresher.start()
+        logger.info(f"Started GeoIP database refresher (every {interval:.0f}s)")
+
+    def stop_refresher(self) -> None:
+        """Stop the background refresher thread"""
+        self._refresher_stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+            self._refresher = None
+
+    def _refresh_loop(self, interval: float) -> None:
+        """Background loop that checks for database updates every ``interval`` seconds"""
+        while not self._refresher_stop.wait(interval):
+            try:
+                self.refresh_databases()
+            except Exception as e:
+                self._last_refresh_error = str(e)
+                logger.error(f"GeoIP refresher error: {e}")
+
+    def get_refresh_stats(self) -> Dict[str, Any]:
+        """
+        Get hot-swap metrics for the loaded databases.
+
+        Returns:
+            Dict with refresher state and, per database type, the build date,
+            stale age (seconds since the database was built), load time and the
+            duration of the last swap
+        """
+        now = time.time()
+        editions: Dict[str, Any] = {}
+        for db_type, info in self._reader_info.items():
+            editions[db_type] = {
+                'loaded': db_type in self._readers,
+                'build_epoch': info.get('build_epoch'),
+                'stale_age_seconds': round(now - info['build_epoch']) if info.get('build_epoch') else None,
+                'loaded_at': info.get('loaded_at'),
+                'swaps': info.get('swaps', 0),
+                'last_swap_ms': info.get('last_swap_ms'),
+                'etag': info.get('etag'),
+            }
+        return {
+            'refresher_running': self._refresher is not None and self._refresher.is_alive(),
+            'refresh_interval': self._refresh_interval,
+            'last_check': self._last_refresh_check,
+            'last_error': self._last_refresh_error,
+            'editions': editions,
+        }
+
     def get_database_path(self):
         """Get path to GeoIP database, downloading if necessary"""
         db_path = self.local_path / self.city_db
@@ -175,36 +544,7 @@ class GeoIPManager:
     
     def download_from_maxmind(self):
         """Download database from MaxMind"""
-        license_key = os.getenv("MAXMIND_LICENSE_KEY")
-        if not license_key:
-            logger.info("✗ MAXMIND_LICENSE_KEY not set - skipping MaxMind download")
-            return False
-            
-        try:
-            logger.info("Downloading from MaxMind servers...")
-            url = f"https://download.maxmind.com/app/geoip_download?edition_id=GeoLite2-City&license_key={license_key}&suffix=tar.gz"
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Save and extract
-            logger.info("Download complete, extracting database...")
-            tar_path = self.local_path / "GeoLite2-City.tar.gz"
-            with open(tar_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    
-            with tarfile.open(tar_path) as tar:
-                for member in tar.getmembers():
-                    if member.name.endswith('.mmdb'):
-                        member.name = os.path.basename(member.name)
-                        tar.extract(member, self.local_path)
-                        
-            tar_path.unlink()  # Clean up tar file
-            logger.info("✓ Successfully extracted GeoIP database")
-            return True
-        except Exception as e:
-            logger.error(f"✗ MaxMind download failed: {e}")
-            return False
+        return self._download_from_maxmind('city')
     
     def upload_to_s3(self):
         """Upload database to S3 for future use"""
@@ -232,67 +572,70 @@ class GeoIPManager:
     
     def _download_missing_databases(self, db_types):
         """Download missing database files"""
+        from_maxmind = []
         for db_type in db_types:
-            filename = self.databases[db_type]
-            s3_key = f"{self.s3_prefix}/{filename}"
-            
             # Try S3 first
             logger.info(f"Attempting to download {db_type} database from S3...")
-            if s3_manager.download_file(s3_key, self.local_path / filename):
+            if self._download_from_s3(db_type):
                 logger.info(f"✓ Successfully downloaded {db_type} database from S3")
-                continue
-            
-            # Fallback to MaxMind
-            logger.info(f"Attempting to download {db_type} database from MaxMind...")
-            if self._download_from_maxmind(db_type):
-                logger.info(f"✓ Successfully downloaded {db_type} database from MaxMind")
-                # Cache to S3 for future use
-                s3_manager.upload_file(self.local_path / filename, s3_key)
             else:
+                from_maxmind.append(db_type)
+        if not from_maxmind:
+            return
+
+        # Fallback to MaxMind, fetching every remaining edition at once
+        auth = self._maxmind_auth()
+        editions = {Path(self._database_filename(db_type)).stem: db_type for db_type in from_maxmind}
+        results = download_editions(editions, self.local_path, auth) if auth else {}
+        for edition_id, db_type in editions.items():
+            if results.get(edition_id) is None:
                 logger.error(f"✗ Failed to download {db_type} database")
+                continue
+            logger.info(f"✓ Successfully downloaded {db_type} database from MaxMind")
+            # Cache to S3 for future use
+            filename = self._database_filename(db_type)
+            s3_manager.upload_file(self.local_path / filename, f"{self.s3_prefix}/{filename}")
 
-    def _download_from_maxmind(self, db_type):
-        """Download specific database from MaxMind"""
+    def _download_from_s3(self, db_type: str) -> bool:
+        """Download a database from S3, unless the local copy is already current"""
+        filename = self._database_filename(db_type)
+        # S3Manager downloads to a temporary file and renames it into place, so
+        # open readers keep mapping the old file
+        return s3_manager.download_file(f"{self.s3_prefix}/{filename}", self.local_path / filename)
+
+    @staticmethod
+    def _maxmind_auth() -> Optional[Tuple[str, str]]:
+        """MaxMind (account ID, license key), or None when not configured"""
         account_id = os.getenv("MAXMIND_ACCOUNT_ID")
         license_key = os.getenv("MAXMIND_LICENSE_KEY")
-        # Preserve original case from environment variable
-        edition_id = next(
-            edition for edition in os.getenv("GEOIPUPDATE_EDITION_IDS", "").split()
-            if edition.lower().endswith(db_type.lower())
-        )
-        
         if not (account_id and license_key):
             logger.info("✗ MaxMind credentials not configured")
+            return None
+        return account_id, license_key
+
+    def _download_from_maxmind(self, db_type):
+        """Download specific database from MaxMind"""
+        # Preserve original case from the configured edition
+        edition_id = Path(self._database_filename(db_type)).stem
+        auth = self._maxmind_auth()
+        if auth is None:
             return False
-        
+
         try:
             logger.info(f"Downloading {edition_id} from MaxMind...")
-            url = f"https://download.maxmind.com/app/geoip_download?edition_id={edition_id}&license_key={license_key}&suffix=tar.gz"
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            
-            # Save and extract
-            logger.info("Download complete, extracting database...")
-            tar_path = self.local_path / f"{edition_id}.tar.gz"
-            with open(tar_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    
-            with tarfile.open(tar_path) as tar:
-                for member in tar.getmembers():
-                    if member.name.endswith('.mmdb'):
-                        member.name = os.path.basename(member.name)
-                        tar.extract(member, self.local_path)
-                        
-            tar_path.unlink()  # Clean up tar file
-            logger.info(f"✓ Successfully extracted {edition_id} database")
+            download_edition(edition_id, self.local_path, auth)
             return True
         except Exception as e:
             logger.error(f"✗ MaxMind download failed for {edition_id}: {e}")
             return False
 
+    @timed('geoip.dns_signals')
     def _get_dns_location_signals(self, domain: str) -> Dict[str, Any]:
-        """Get location signals from DNS records"""
+        """Get location signals from DNS records (synchronous wrapper)"""
+        return run_sync(self._get_dns_location_signals_async(domain))
+
+    async def _get_dns_location_signals_async(self, domain: str) -> Dict[str, Any]:
+        """Get location signals from DNS records, querying all record types concurrently"""
         signals = {
             'mx_records': [],
             'txt_records': [],
@@ -306,34 +649,42 @@ class GeoIPManager:
         }
         
         try:
+            answers = await resolve_many(
+                domain,
+                ('A', 'AAAA', 'MX', 'TXT', 'SOA'),
+                deadline=float(os.getenv("DNS_SIGNALS_DEADLINE", "5.0"))
+            )
+
             # A Records (IPv4)
-            try:
-                a_records = dns.resolver.resolve(domain, 'A')
-                signals['a_records'] = [str(rdata) for rdata in a_records]
+            a_records = answers['A']
+            if isinstance(a_records, BaseException):
+                logger.warning(f"Could not retrieve A records: {a_records}")
+            else:
+                signals['a_records'] = a_records
                 logger.info(f"Found A records: {signals['a_records']}")
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as e:
-                logger.warning(f"Could not retrieve A records: {e}")
 
             # AAAA Records (IPv6)
-            try:
-                aaaa_records = dns.resolver.resolve(domain, 'AAAA')
-                signals['aaaa_records'] = [str(rdata) for rdata in aaaa_records]
+            aaaa_records = answers['AAAA']
+            if isinstance(aaaa_records, BaseException):
+                logger.warning(f"Could not retrieve AAAA records: {aaaa_records}")
+            else:
+                signals['aaaa_records'] = aaaa_records
                 logger.info(f"Found AAAA records: {signals['aaaa_records']}")
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as e:
-                logger.warning(f"Could not retrieve AAAA records: {e}")
 
             # MX Records
-            try:
-                mx_records = dns.resolver.resolve(domain, 'MX')
-                signals['mx_records'] = [str(rdata) for rdata in mx_records]
+            mx_records = answers['MX']
+            if isinstance(mx_records, BaseException):
+                logger.warning(f"Could not retrieve MX records: {mx_records}")
+            else:
+                signals['mx_records'] = mx_records
                 logger.info(f"Found MX records: {signals['mx_records']}")
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as e:
-                logger.warning(f"Could not retrieve MX records: {e}")
 
             # TXT Records and IP extraction
-            try:
-                txt_records = dns.resolver.resolve(domain, 'TXT')
-                signals['txt_records'] = [str(rdata) for rdata in txt_records]
+            txt_records = answers['TXT']
+            if isinstance(txt_records, BaseException):
+                logger.warning(f"Could not retrieve TXT records: {txt_records}")
+            else:
+                signals['txt_records'] = txt_records
                 # Extract IPs from SPF and other records
                 for record in signals['txt_records']:
                     if 'ip4:' in record:
@@ -342,16 +693,18 @@ class GeoIPManager:
                         signals['txt_ips'].extend(extracted_ips)
                         
                         # Look up location data for extracted IPs
+                        city_reader = self.get_reader('city')
                         for ip in extracted_ips:
+                            if city_reader is None:
+                                break
                             try:
-                                with geoip2.database.Reader(str(self.local_path / self.databases.get('city', 'GeoLite2-City.mmdb'))) as reader:
-                                    response = reader.city(ip)
-                                    signals['txt_ip_locations'][ip] = {
-                                        'city': response.city.name,
-                                        'country': response.country.name,
-                                        'latitude': response.location.latitude,
-                                        'longitude': response.location.longitude
-                                    }
+                                response = city_reader.city(ip)
+                                signals['txt_ip_locations'][ip] = {
+                                    'city': response.city.name,
+                                    'country': response.country.name,
+                                    'latitude': response.location.latitude,
+                                    'longitude': response.location.longitude
+                                }
                             except Exception as e:
                                 logger.warning(f"Could not get location for IP {ip}: {e}")
                                 
@@ -360,32 +713,45 @@ class GeoIPManager:
                     logger.info(f"Extracted IPs from TXT: {signals['txt_ips']}")
                 if signals['txt_ip_locations']:
                     logger.info(f"Found locations for TXT IPs: {signals['txt_ip_locations']}")
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as e:
-                logger.warning(f"Could not retrieve TXT records: {e}")
 
             # SOA Record with parsing
-            try:
-                soa_records = dns.resolver.resolve(domain, 'SOA')
-                if soa_records:
-                    soa = str(soa_records[0])
-                    signals['soa_record'] = soa
-                    # Parse SOA components
-                    parts = soa.split()
-                    if len(parts) >= 2:
-                        signals['soa_primary'] = parts[0]  # Primary nameserver
-                        signals['soa_contact'] = parts[1]  # Contact info
-                    logger.info(f"Found SOA record: {soa}")
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as e:
-                logger.warning(f"Could not retrieve SOA record: {e}")
+            soa_records = answers['SOA']
+            if isinstance(soa_records, BaseException):
+                logger.warning(f"Could not retrieve SOA record: {soa_records}")
+            elif soa_records:
+                soa = soa_records[0]
+                signals['soa_record'] = soa
+                # Parse SOA components
+                parts = soa.split()
+                if len(parts) >= 2:
+                    signals['soa_primary'] = parts[0]  # Primary nameserver
+                    signals['soa_contact'] = parts[1]  # Contact info
+                logger.info(f"Found SOA record: {soa}")
 
         except Exception as e:
             logger.error(f"Error getting DNS signals: {e}")
 
         return signals
 
-    def _get_ssl_location_signals(self, domain: str) -> Dict[str, Optional[str]]:
-        """Get location signals from SSL certificate"""
-        signals: Dict[str, Optional[str]] = {
+    @timed('geoip.connection_probe')
+    def _probe_connection(self, domain: str, port: int = 443) -> Dict[str, Any]:
+        """
+        Collect certificate, header and timing signals over a single connection.
+
+        The certificate is read from the TLS handshake and the header requests
+        (see _headers_over_socket) are then sent on the same socket, so both
+        signal sets cost one TCP+TLS handshake. A second, unverified handshake is
+        only made when certificate verification fails.
+
+        Args:
+            domain: Domain to probe
+            port: TLS port
+
+        Returns:
+            Dict with 'ssl' (certificate signals), 'headers' (header signals) and
+            'connection' (connect/handshake/first-byte timings in ms, TLS version)
+        """
+        ssl_signals: Dict[str, Optional[str]] = {
             'organization': None,
             'country': None,
             'state': None,
@@ -396,104 +762,205 @@ class GeoIPManager:
             'issuer_country': None,  # Adding issuer country
             'issuer_common_name': None  # Adding issuer CN
         }
-        
+        header_signals = self._parse_header_signals({})
+        connection: Dict[str, Any] = {
+            'tcp_connect_ms': None,
+            'tls_handshake_ms': None,
+            'first_byte_ms': None,
+            'tls_version': None,
+            'cipher': None,
+            'verified': None,
+            'error': None
+        }
+
         try:
-            # First attempt: Use requests with a session to ensure we can access the socket
-            session = requests.Session()
-            response = session.get(f'https://{domain}', verify=True)
-            
-            # Get the underlying socket from the connection
-            if hasattr(response.raw, '_connection') and \
-               hasattr(response.raw._connection, 'sock') and \
-               response.raw._connection.sock is not None:
-                cert = response.raw._connection.sock.getpeercert()
-                logger.info(f"Raw certificate data: {cert}")
-                
-                if cert:
-                    # Get subject information
-                    if 'subject' in cert:
-                        for key, value in cert['subject']:
-                            if not isinstance(value, str):
-                                continue
-                            if key == 'organizationName':
-                                signals['organization'] = value
-                            elif key == 'countryName':
-                                signals['country'] = value
-                            elif key == 'stateOrProvinceName':
-                                signals['state'] = value
-                            elif key == 'localityName':
-                                signals['locality'] = value
-                            elif key == 'commonName':
-                                signals['common_name'] = value
-                    
-                    # Get issuer information
-                    if 'issuer' in cert:
-                        for key, value in cert['issuer']:
-                            if not isinstance(value, str):
-                                continue
-                            if key == 'organizationName':
-                                signals['issuer'] = value
-                            elif key == 'countryName':
-                                signals['issuer_country'] = value
-                            elif key == 'commonName':
-                                signals['issuer_common_name'] = value
-                        
-                    logger.info(f"Found certificate info via requests: {signals}")
-                    return signals
+            try:
+                ssock = self._open_tls_connection(domain, port, True, connection)
+            except ssl.SSLCertVerificationError as e:
+                error_msg = f"SSL verification failed: {str(e)}"
+                logger.warning(error_msg)
+                ssl_signals['error'] = error_msg
+                # Fall back to an unverified connection so we can still read the certificate
+                ssock = self._open_tls_connection(domain, port, False, connection)
+
+            with ssock:
+                try:
+                    if connection['verified']:
+                        cert = ssock.getpeercert()
+                        logger.info(f"Raw certificate data: {cert}")
+                        ssl_signals.update(self._parse_peer_cert(cert or {}))
+                    else:
+                        cert_bin = ssock.getpeercert(binary_form=True)
+                        if not cert_bin:
+                            raise ValueError("No certificate data received")
+                        ssl_signals.update(self._parse_der_cert(cert_bin))
+                    logger.info(f"Found certificate info via TLS handshake: {ssl_signals}")
+                except Exception as e:
+                    error_msg = f"SSL certificate lookup failed: {str(e)}"
+                    logger.error(error_msg)
+                    if not ssl_signals['error']:  # Don't overwrite previous error
+                        ssl_signals['error'] = error_msg
+
+                header_signals = self._headers_over_socket(ssock, domain, port, connection)
 
-        except requests.exceptions.SSLError as e:
-            error_msg = f"SSL verification failed: {str(e)}"
-            logger.warning(error_msg)
-            signals['error'] = error_msg
         except Exception as e:
-            error_msg = f"Error getting certificate info via requests: {str(e)}"
+            error_msg = f"Connection probe failed: {str(e)}"
             logger.error(error_msg)
-            signals['error'] = error_msg
-            
-        # Fallback to direct SSL connection without verification
-        try:
-            context = ssl.create_default_context()
+            connection['error'] = error_msg
+            if not ssl_signals['error']:
+                ssl_signals['error'] = error_msg
+
+        logger.info(f"Connection probe timings for {domain}: {connection}")
+        return {'ssl': ssl_signals, 'headers': header_signals, 'connection': connection}
+
+    def _open_tls_connection(self, domain: str, port: int, verify: bool, connection: Dict[str, Any]) -> ssl.SSLSocket:
+        """Open a TLS connection to domain:port, recording timings in ``connection``"""
+        context = ssl.create_default_context()
+        if not verify:
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
-            
-            with socket.create_connection((domain, 443), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    cert_bin = ssock.getpeercert(binary_form=True)
-                    if not cert_bin:
-                        raise ValueError("No certificate data received")
-                    x509 = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_ASN1, cert_bin)
-                    
-                    # Get subject components
-                    subject_components = dict(x509.get_subject().get_components())
-                    logger.info(f"Certificate subject components: {subject_components}")
-                    
-                    # Get issuer components
-                    issuer_components = dict(x509.get_issuer().get_components())
-                    logger.info(f"Certificate issuer components: {issuer_components}")
-                    
-                    # Map the components to our signals
-                    # Note: Components are in bytes, so we need to decode them
-                    signals.update({
-                        'organization': subject_components.get(b'O', b'').decode('utf-8') or None,
-                        'country': subject_components.get(b'C', b'').decode('utf-8') or None,
-                        'state': subject_components.get(b'ST', b'').decode('utf-8') or None,
-                        'locality': subject_components.get(b'L', b'').decode('utf-8') or None,
-                        'common_name': subject_components.get(b'CN', b'').decode('utf-8') or None,
-                        'issuer': issuer_components.get(b'O', b'').decode('utf-8') or None,
-                        'issuer_country': issuer_components.get(b'C', b'').decode('utf-8') or None,
-                        'issuer_common_name': issuer_components.get(b'CN', b'').decode('utf-8') or None
-                    })
-                    
-                    logger.info(f"Found certificate info via direct SSL: {signals}")
-            
+
+        start = time.perf_counter()
+        sock = socket.create_connection((domain, port), timeout=HTTP_TIMEOUT[0])
+        connected = time.perf_counter()
+        try:
+            sock.settimeout(HTTP_TIMEOUT[1])
+            ssock = context.wrap_socket(sock, server_hostname=domain)
+        except Exception:
+            sock.close()
+            raise
+        handshake_done = time.perf_counter()
+
+        cipher = ssock.cipher()
+        connection.update({
+            'tcp_connect_ms': round((connected - start) * 1000, 1),
+            'tls_handshake_ms': round((handshake_done - connected) * 1000, 1),
+            'tls_version': ssock.version(),
+            'cipher': cipher[0] if cipher else None,
+            'verified': verify
+        })
+        return ssock
+
+    def _headers_over_socket(
+        self,
+        ssock: ssl.SSLSocket,
+        domain: str,
+        port: int,
+        connection: Dict[str, Any]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Request the site's root on an open TLS socket and parse the response headers.
+
+        Every request is sent keep-alive on the same socket: a HEAD that the
+        server rejects (405/501) is retried as a one-byte ranged GET, and
+        same-host redirects are followed up to PROBE_MAX_REDIRECTS times. A
+        redirect to another host would need a new handshake, so it ends the
+        probe with the redirect's own headers, as does a server that closes the
+        connection after a response.
+        """
+        host = domain.encode('idna').decode('ascii')
+        authority = host if port == 443 else f"{host}:{port}"
+        conn = http.client.HTTPConnection(host, port, timeout=HTTP_TIMEOUT[1])
+        conn.sock = ssock
+        method, path = 'HEAD', '/'
+        headers: Mapping[str, str] = {}
+        try:
+            for _ in range(PROBE_MAX_REDIRECTS + 2):
+                request_headers = {'Host': authority, 'User-Agent': USER_AGENT, 'Accept': '*/*'}
+                if method == 'GET':
+                    request_headers['Range'] = 'bytes=0-0'
+                request_start = time.perf_counter()
+                conn.request(method, path, headers=request_headers)
+                response = conn.getresponse()
+                if connection['first_byte_ms'] is None:
+                    connection['first_byte_ms'] = round((time.perf_counter() - request_start) * 1000, 1)
+                headers = response.headers
+
+                next_request: Optional[Tuple[str, str]] = None
+                location = response.getheader('Location')
+                if method == 'HEAD' and response.status in (405, 501):
+                    logger.info(f"HEAD not allowed by {domain}, falling back to ranged GET")
+                    next_request = ('GET', path)
+                elif response.status in REDIRECT_STATUSES and location:
+                    target = urlparse(urljoin(f"https://{authority}{path}", location))
+                    if target.scheme == 'https' and target.hostname == host.lower() and (target.port or 443) == port:
+                        next_path = target.path or '/'
+                        next_request = (method, f"{next_path}?{target.query}" if target.query else next_path)
+                    else:
+                        logger.info(f"{domain} redirects to {location}, using the redirect's headers")
+
+                if next_request is None or response.will_close:
+                    response.close()
+                    break
+                # Drain the (empty or tiny) body so the socket is ready for the next request
+                response.read()
+                method, path = next_request
         except Exception as e:
-            error_msg = f"SSL certificate lookup failed: {str(e)}"
-            logger.error(error_msg)
-            if not signals['error']:  # Don't overwrite previous error
-                signals['error'] = error_msg
-            
+            logger.error(f"Error getting header signals: {e}")
+        return self._parse_header_signals(headers)
+
+    @staticmethod
+    def _parse_peer_cert(cert: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Map a decoded peer certificate (ssl.getpeercert()) to certificate signals"""
+        signals: Dict[str, Optional[str]] = {}
+
+        # Get subject information
+        for rdn in cert.get('subject', ()):
+            for key, value in rdn:
+                if not isinstance(value, str):
+                    continue
+                if key == 'organizationName':
+                    signals['organization'] = value
+                elif key == 'countryName':
+                    signals['country'] = value
+                elif key == 'stateOrProvinceName':
+                    signals['state'] = value
+                elif key == 'localityName':
+                    signals['locality'] = value
+                elif key == 'commonName':
+                    signals['common_name'] = value
+
+        # Get issuer information
+        for rdn in cert.get('issuer', ()):
+            for key, value in rdn:
+                if not isinstance(value, str):
+                    continue
+                if key == 'organizationName':
+                    signals['issuer'] = value
+                elif key == 'countryName':
+                    signals['issuer_country'] = value
+                elif key == 'commonName':
+                    signals['issuer_common_name'] = value
+
         return signals
 
+    @staticmethod
+    def _parse_der_cert(cert_bin: bytes) -> Dict[str, Optional[str]]:
+        """Map a DER-encoded certificate to certificate signals"""
+        x509 = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_ASN1, cert_bin)
+
+        # Get subject components
+        subject_components = dict(x509.get_subject().get_components())
+        logger.info(f"Certificate subject components: {subject_components}")
+
+        # Get issuer components
+        issuer_components = dict(x509.get_issuer().get_components())
+        logger.info(f"Certificate issuer components: {issuer_components}")
+
+        # Map the components to our signals
+        # Note: Components are in bytes, so we need to decode them
+        return {
+            'organization': subject_components.get(b'O', b'').decode('utf-8') or None,
+            'country': subject_components.get(b'C', b'').decode('utf-8') or None,
+            'state': subject_components.get(b'ST', b'').decode('utf-8') or None,
+            'locality': subject_components.get(b'L', b'').decode('utf-8') or None,
+            'common_name': subject_components.get(b'CN', b'').decode('utf-8') or None,
+            'issuer': issuer_components.get(b'O', b'').decode('utf-8') or None,
+            'issuer_country': issuer_components.get(b'C', b'').decode('utf-8') or None,
+            'issuer_common_name': issuer_components.get(b'CN', b'').decode('utf-8') or None
+        }
+
+    @timed('geoip.ip_signals')
     def _get_ip_location_signals(self, ip_address: str) -> Dict[str, Optional[str]]:
         """Get additional location signals from IP address"""
         signals = {
@@ -506,8 +973,7 @@ class GeoIPManager:
             # Try to get IP ranges from TXT records
             try:
                 ptr_name = '.'.join(reversed(ip_address.split('.'))) + '.in-addr.arpa'
-                txt_records = dns.resolver.resolve(ptr_name, 'TXT')
-                signals['ip_ranges'] = [str(rdata) for rdata in txt_records]
+                signals['ip_ranges'] = run_sync(resolve(ptr_name, 'TXT'))
                 logger.info(f"Found IP TXT records: {signals['ip_ranges']}")
             except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.DNSException) as e:
                 logger.warning(f"Could not retrieve IP TXT records: {e}")
@@ -525,6 +991,7 @@ class GeoIPManager:
 
         return signals
 
+    @timed('geoip.lookup_url')
     def lookup_url(self, url: str) -> Optional[Dict[str, Any]]:
         """
         Get geolocation data for a URL by resolving its IP and querying MaxMind.
@@ -550,12 +1017,14 @@ class GeoIPManager:
                 'city': None,
                 'region': None,
                 'country': None,
+                'country_code': None,
                 'latitude': None,
                 'longitude': None,
                 'network': None,
                 'is_cdn': False,
                 'cdn_provider': None,
-                'additional_signals': {}
+                'additional_signals': {},
+                'timed_out_signals': []
             }
 
             # Resolve IP and do MaxMind lookups
@@ -583,12 +1052,8 @@ class GeoIPManager:
                     
                     # Get additional signals
                     logger.info("Getting additional location signals due to CDN detection")
-                    result['additional_signals'] = {
-                        'dns': self._get_dns_location_signals(domain),
-                        'ssl': self._get_ssl_location_signals(domain),
-                        'ip': self._get_ip_location_signals(ip_address),
-                        'headers': self._get_header_signals(domain)
-                    }
+                    result['additional_signals'], result['timed_out_signals'] = \
+                        self._collect_additional_signals(domain, ip_address)
                 
             except socket.gaierror as e:
                 logger.error(f"Failed to resolve domain: {e}")
@@ -600,63 +1065,337 @@ class GeoIPManager:
             logger.error(f"Error during lookup: {e}")
             return None
 
+    def lookup_ips(self, ips: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Look up city, country and ASN data for many IP addresses.
+
+        Unlike lookup_url, no DNS resolution is done. Duplicate addresses are
+        skipped, so each unique IP yields exactly one result in first-seen order.
+        Raw records are read straight from the shared readers, which avoids
+        building geoip2 model objects for every lookup.
+
+        Args:
+            ips: Iterable of IPv4/IPv6 address strings
+
+        Yields:
+            One result dict per unique IP address
+        """
+        if not self._started:
+            self.warmup()
+        seen: Set[str] = set()
+        for raw_ip in ips:
+            ip = raw_ip.strip()
+            if not ip or ip in seen:
+                continue
+            seen.add(ip)
+            yield self._lookup_ip_record(ip)
+
+    def _lookup_ip_record(self, ip_address: str) -> Dict[str, Any]:
+        """Look up one IP in every loaded database using raw MaxMind records"""
+        result: Dict[str, Any] = {
+            'ip': ip_address,
+            'city': None,
+            'region': None,
+            'country': None,
+            'country_code': None,
+            'continent': None,
+            'latitude': None,
+            'longitude': None,
+            'network': None,
+            'asn': None,
+            'asn_org': None,
+            'is_cdn': False,
+            'cdn_provider': None,
+        }
+
+        # Take one snapshot so a concurrent hot-swap can't mix database versions
+        readers = self._readers
+        try:
+            city_reader = readers.get('city')
+            if city_reader is not None:
+                record, prefix_len = city_reader.records.get_with_prefix_len(ip_address)
+                if record:
+                    location = record.get('location', {})
+                    subdivisions = record.get('subdivisions')
+                    result.update({
+                        'city': _record_name(record, 'city'),
+                        'region': subdivisions[-1].get('names', {}).get('en') if subdivisions else None,
+                        'country': _record_name(record, 'country'),
+                        'country_code': record.get('country', {}).get('iso_code'),
+                        'continent': _record_name(record, 'continent'),
+                        'latitude': location.get('latitude'),
+                        'longitude': location.get('longitude'),
+                        'network': str(ipaddress.ip_network(f"{ip_address}/{prefix_len}", strict=False)),
+                    })
+
+            country_reader = readers.get('country')
+            if not result['country'] and country_reader is not None:
+                record = country_reader.records.get(ip_address)
+                if record:
+                    result.update({
+                        'country': _record_name(record, 'country'),
+                        'country_code': record.get('country', {}).get('iso_code'),
+                        'continent': _record_name(record, 'continent'),
+                    })
+
+            asn_reader = readers.get('asn')
+            if asn_reader is not None:
+                record = asn_reader.records.get(ip_address)
+                if record:
+                    asn = record.get('autonomous_system_number')
+                    result.update({
+                        'asn': asn,
+                        'asn_org': record.get('autonomous_system_organization'),
+                        'is_cdn': asn in CDN_ASNS,
+                        'cdn_provider': CDN_ASNS.get(asn),
+                    })
+        except ValueError as e:
+            # Raised by maxminddb for strings that are not valid IP addresses
+            result['error'] = str(e)
+        except Exception as e:
+            logger.error(f"Error looking up {ip_address}: {e}")
+            result['error'] = str(e)
+
+        return result
+
+    def _collect_additional_signals(self, domain: str, ip_address: str) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Run the DNS, IP and connection (certificate + header) collectors concurrently.
+
+        Each collector gets its own timeout from SIGNAL_COLLECTOR_TIMEOUTS, and
+        all of them share the overall GEO_SIGNALS_DEADLINE, so the wall-clock
+        time is bounded by the slowest probe rather than the sum of all of them.
+        Collectors run on separate pools: a collector still queued at its
+        deadline is cancelled, and one still running finishes in the background
+        without taking workers from the other collectors.
+
+        Returns:
+            Tuple of signals by collector name (None for collectors that timed
+            out or failed) and the names of collectors that timed out
+        """
+        # Certificate and header signals share one connection probe
+        collectors = {
+            'dns': (self._get_dns_location_signals, domain),
+            'ip': (self._get_ip_location_signals, ip_address),
+            'connection': (self._probe_connection, domain),
+        }
+        start = time.monotonic()
+        overall_deadline = start + GEO_SIGNALS_DEADLINE
+        # Run each collector in a copy of this context so its span nests under this request
+        futures = {
+            name: self._signal_executors[name].submit(contextvars.copy_context().run, collector, arg)
+            for name, (collector, arg) in collectors.items()
+        }
+
+        signals: Dict[str, Any] = {}
+        timed_out: List[str] = []
+        for name, future in futures.items():
+            collector_deadline = min(start + SIGNAL_COLLECTOR_TIMEOUTS[name], overall_deadline)
+            try:
+                signals[name] = future.result(timeout=max(0.0, collector_deadline - time.monotonic()))
+            except concurrent.futures.TimeoutError:
+                # A queued collector is dropped; a running one can't be interrupted
+                # and finishes in the background on its own pool
+                future.cancel()
+                signals[name] = None
+                timed_out.append(name)
+                logger.warning(f"{name} signal collector timed out for {domain}")
+            except Exception as e:
+                signals[name] = None
+                logger.error(f"{name} signal collector failed for {domain}: {e}")
+
+        probe = signals.pop('connection')
+        signals['ssl'] = probe['ssl'] if probe else None
+        signals['headers'] = probe['headers'] if probe else None
+        signals['connection'] = probe['connection'] if probe else None
+        if 'connection' in timed_out:
+            timed_out.remove('connection')
+            timed_out.extend(['ssl', 'headers'])
+
+        logger.info(f"Collected additional signals in {(time.monotonic() - start) * 1000:.0f}ms (timed out: {timed_out})")
+        return signals, timed_out
+
     def _do_maxmind_lookups(self, ip_address: str, result: Dict[str, Any]) -> None:
-        """Perform all MaxMind database lookups"""
+        """Perform all MaxMind database lookups, served from the lookup cache when possible"""
+        with span('geoip.maxmind') as current:
+            cached = self._get_cached_lookup(ip_address)
+            current.set_attribute('cache.hit', cached is not None)
+            if cached is not None:
+                self._lookup_cache_hits += 1
+                logger.info(f"MaxMind lookup cache hit for {ip_address}")
+                result.update(cached)
+                return
+            self._lookup_cache_misses += 1
+
+            generation = self._readers_generation
+            fields, prefix_len = self._query_maxmind(ip_address)
+            # Don't cache results from a database that was swapped out mid-lookup
+            if generation == self._readers_generation:
+                self._cache_lookup(ip_address, prefix_len, fields)
+            result.update(fields)
+
+    def _get_cached_lookup(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Find cached lookup fields for an IP, by exact address or by a cached network"""
+        cached = self._lookup_cache.get(ip_address)
+        if cached is not None:
+            return dict(cached)
+
+        if not self._cached_prefix_lens:
+            return None
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except ValueError:
+            return None
+        address_int = int(address)
+        for version, prefix_len in tuple(self._cached_prefix_lens):
+            if version != address.version:
+                continue
+            host_bits = address.max_prefixlen - prefix_len
+            cached = self._lookup_cache.get((version, prefix_len, address_int >> host_bits))
+            if cached is not None:
+                return dict(cached)
+        return None
+
+    def _cache_lookup(self, ip_address: str, prefix_len: Optional[int], fields: Dict[str, Any]) -> None:
+        """Cache lookup fields by IP and, when known, by the network they are valid for"""
+        self._lookup_cache.set(ip_address, dict(fields))
+        if prefix_len is None:
+            return
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except ValueError:
+            return
+        host_bits = address.max_prefixlen - prefix_len
+        self._cached_prefix_lens.add((address.version, prefix_len))
+        self._lookup_cache.set((address.version, prefix_len, int(address) >> host_bits), dict(fields))
+
+    def _invalidate_lookup_cache(self) -> None:
+        """Drop cached lookups after the set of readers changed"""
+        self._readers_generation += 1
+        self._lookup_cache.clear()
+        self._cached_prefix_lens.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters for the MaxMind lookup cache"""
+        lookups = self._lookup_cache_hits + self._lookup_cache_misses
+        # Count per lookup rather than per cache probe (one lookup may probe several networks)
+        return {
+            **self._lookup_cache.stats(),
+            'hits': self._lookup_cache_hits,
+            'misses': self._lookup_cache_misses,
+            'hit_rate': round(self._lookup_cache_hits / lookups, 4) if lookups else None,
+            'network_prefixes': len(self._cached_prefix_lens),
+        }
+
+    def _query_maxmind(self, ip_address: str) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        Query the city, country and ASN databases for one IP.
+
+        Returns:
+            Tuple of the result fields and the prefix length of the narrowest
+            network every queried database answered for, including empty ranges
+            (None if any network is unknown, in which case the result is only
+            valid for this IP)
+        """
+        fields: Dict[str, Any] = {}
+        prefix_lens: List[int] = []
+        complete = True
+
         # Try city database first
-        city_path = self.local_path / self.databases.get('city', 'GeoLite2-City.mmdb')
-        if city_path.exists():
+        city_reader = self.get_reader('city')
+        if city_reader is not None:
             try:
-                with geoip2.database.Reader(str(city_path)) as reader:
-                    city_response = reader.city(ip_address)
-                    result.update({
-                        'city': city_response.city.name,
-                        'region': city_response.subdivisions.most_specific.name if city_response.subdivisions else None,
-                        'country': city_response.country.name,
-                        'latitude': city_response.location.latitude,
-                        'longitude': city_response.location.longitude,
-                        'network': str(city_response.traits.network) if hasattr(city_response.traits, 'network') else None
-                    })
-                    logger.info(f"City database lookup successful: {result}")
-            except geoip2.errors.AddressNotFoundError:
+                city_response = city_reader.city(ip_address)
+                network = city_response.traits.network if hasattr(city_response.traits, 'network') else None
+                fields.update({
+                    'city': city_response.city.name,
+                    'region': city_response.subdivisions.most_specific.name if city_response.subdivisions else None,
+                    'country': city_response.country.name,
+                    'country_code': city_response.country.iso_code,
+                    'latitude': city_response.location.latitude,
+                    'longitude': city_response.location.longitude,
+                    'network': str(network) if network is not None else None
+                })
+                if network is not None:
+                    prefix_lens.append(network.prefixlen)
+                else:
+                    complete = False
+                logger.info(f"City database lookup successful: {fields}")
+            except geoip2.errors.AddressNotFoundError as e:
+                # The empty range also has a network, so a miss can be cached by prefix too
+                network = getattr(e, 'network', None)
+                if network is not None:
+                    prefix_lens.append(network.prefixlen)
+                else:
+                    complete = False
                 logger.warning(f"IP not found in city database: {ip_address}")
             except Exception as e:
+                complete = False
                 logger.error(f"Error querying city database: {e}")
 
         # If we don't have country data yet, try country database
-        if not result['country']:
-            country_path = self.local_path / self.databases.get('country', 'GeoLite2-Country.mmdb')
-            if country_path.exists():
+        if not fields.get('country'):
+            country_reader = self.get_reader('country')
+            if country_reader is not None:
                 try:
-                    with geoip2.database.Reader(str(country_path)) as reader:
-                        country_response = reader.country(ip_address)
-                        result.update({
-                            'country': country_response.country.name,
-                            'continent': country_response.continent.name if hasattr(country_response, 'continent') else None
-                        })
-                        logger.info(f"Country database lookup successful: {result}")
-                except geoip2.errors.AddressNotFoundError:
+                    country_response = country_reader.country(ip_address)
+                    fields.update({
+                        'country': country_response.country.name,
+                        'country_code': country_response.country.iso_code,
+                        'continent': country_response.continent.name if hasattr(country_response, 'continent') else None
+                    })
+                    network = getattr(country_response.traits, 'network', None)
+                    if network is not None:
+                        prefix_lens.append(network.prefixlen)
+                    else:
+                        complete = False
+                    logger.info(f"Country database lookup successful: {fields}")
+                except geoip2.errors.AddressNotFoundError as e:
+                    network = getattr(e, 'network', None)
+                    if network is not None:
+                        prefix_lens.append(network.prefixlen)
+                    else:
+                        complete = False
                     logger.warning(f"IP not found in country database: {ip_address}")
                 except Exception as e:
+                    complete = False
                     logger.error(f"Error querying country database: {e}")
 
         # Try ASN database for network info
-        asn_path = self.local_path / self.databases.get('asn', 'GeoLite2-ASN.mmdb')
-        if asn_path.exists():
+        asn_reader = self.get_reader('asn')
+        if asn_reader is not None:
             try:
-                with geoip2.database.Reader(str(asn_path)) as reader:
-                    asn_response = reader.asn(ip_address)
-                    result.update({
-                        'asn': asn_response.autonomous_system_number,
-                        'asn_org': asn_response.autonomous_system_organization,
-                    })
-                    logger.info(f"ASN database lookup successful: {result}")
-            except geoip2.errors.AddressNotFoundError:
+                asn_response = asn_reader.asn(ip_address)
+                fields.update({
+                    'asn': asn_response.autonomous_system_number,
+                    'asn_org': asn_response.autonomous_system_organization,
+                })
+                network = getattr(asn_response, 'network', None)
+                if network is not None:
+                    prefix_lens.append(network.prefixlen)
+                else:
+                    complete = False
+                logger.info(f"ASN database lookup successful: {fields}")
+            except geoip2.errors.AddressNotFoundError as e:
+                # The empty range also has a network, so a miss can be cached by prefix too
+                network = getattr(e, 'network', None)
+                if network is not None:
+                    prefix_lens.append(network.prefixlen)
+                else:
+                    complete = False
                 logger.warning(f"IP not found in ASN database: {ip_address}")
             except Exception as e:
+                complete = False
                 logger.error(f"Error querying ASN database: {e}")
 
-    def _get_header_signals(self, domain: str) -> Dict[str, Optional[str]]:
-        """Get location signals from HTTP headers"""
+        # Networks containing the same IP are nested, so the longest prefix is
+        # the range over which every database returns the same record
+        prefix_len = max(prefix_lens) if complete and prefix_lens else None
+        return fields, prefix_len
+
+    @staticmethod
+    def _parse_header_signals(headers: Mapping[str, str]) -> Dict[str, Optional[str]]:
+        """Extract location signals from HTTP response headers"""
         signals: Dict[str, Optional[str]] = {
             'server': None,
             'powered_by': None,
@@ -670,65 +1409,54 @@ class GeoIPManager:
             'estimated_distance_km': None  # Rough distance based on RTT
         }
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (compatible; WebEntityScraper/1.0)',
-                'Accept': '*/*'
-            }
-            
-            response = requests.get(f'https://{domain}', headers=headers, allow_redirects=True)
-            
-            # Extract relevant headers
-            if 'Server' in response.headers:
-                signals['server'] = response.headers['Server']
-            if 'X-Powered-By' in response.headers:
-                signals['powered_by'] = response.headers['X-Powered-By']
+        # Extract relevant headers
+        if 'Server' in headers:
+            signals['server'] = headers['Server']
+        if 'X-Powered-By' in headers:
+            signals['powered_by'] = headers['X-Powered-By']
+        
+        # Parse Cloudflare headers
+        if 'CF-RAY' in headers:
+            cf_ray = headers['CF-RAY']
+            signals['cf_ray'] = cf_ray
+            # Extract location code (e.g., "7ac7-SJC" -> "SJC")
+            if '-' in cf_ray:
+                signals['cf_ray_location'] = cf_ray.split('-')[1]
+                
+        if 'CF-IPCountry' in headers:
+            signals['cf_ipcountry'] = headers['CF-IPCountry']
+        
+        # Parse Server-Timing header
+        if 'Server-Timing' in headers:
+            timing = headers['Server-Timing']
+            signals['server_timing'] = timing
             
-            # Parse Cloudflare headers
-            if 'CF-RAY' in response.headers:
-                cf_ray = response.headers['CF-RAY']
-                signals['cf_ray'] = cf_ray
-                # Extract location code (e.g., "7ac7-SJC" -> "SJC")
-                if '-' in cf_ray:
-                    signals['cf_ray_location'] = cf_ray.split('-')[1]
+            # Extract timing information
+            if 'rtt=' in timing:
+                try:
+                    # Extract RTT values
+                    rtt = timing.split('rtt=')[1].split('&')[0]
+                    signals['server_rtt'] = rtt
                     
-            if 'CF-IPCountry' in response.headers:
-                signals['cf_ipcountry'] = response.headers['CF-IPCountry']
-            
-            # Parse Server-Timing header
-            if 'Server-Timing' in response.headers:
-                timing = response.headers['Server-Timing']
-                signals['server_timing'] = timing
-                
-                # Extract timing information
-                if 'rtt=' in timing:
-                    try:
-                        # Extract RTT values
-                        rtt = timing.split('rtt=')[1].split('&')[0]
-                        signals['server_rtt'] = rtt
+                    if 'min_rtt=' in timing:
+                        min_rtt = timing.split('min_rtt=')[1].split('&')[0]
+                        signals['server_min_rtt'] = min_rtt
                         
-                        if 'min_rtt=' in timing:
-                            min_rtt = timing.split('min_rtt=')[1].split('&')[0]
-                            signals['server_min_rtt'] = min_rtt
-                            
-                            # Estimate rough distance based on min_rtt
-                            # Speed of light in fiber is roughly 2/3 c, or 200,000 km/s
-                            # Round trip means dividing by 2
-                            # min_rtt is in microseconds, so divide by 1,000,000 for seconds
-                            try:
-                                min_rtt_seconds = float(min_rtt) / 1_000_000
-                                distance_km = (min_rtt_seconds * 200_000) / 2
-                                signals['estimated_distance_km'] = f"{distance_km:.0f}"
-                            except ValueError:
-                                pass
-                    except Exception:
-                        pass
-            
+                        # Estimate rough distance based on min_rtt
+                        # Speed of light in fiber is roughly 2/3 c, or 200,000 km/s
+                        # Round trip means dividing by 2
+                        # min_rtt is in microseconds, so divide by 1,000,000 for seconds
+                        try:
+                            min_rtt_seconds = float(min_rtt) / 1_000_000
+                            distance_km = (min_rtt_seconds * 200_000) / 2
+                            signals['estimated_distance_km'] = f"{distance_km:.0f}"
+                        except ValueError:
+                            pass
+                except Exception:
+                    pass
+        
+        if headers:
             logger.info(f"Found header signals: {signals}")
-            
-        except Exception as e:
-            logger.error(f"Error getting header signals: {e}")
-            
         return signals
 
 # Global instance
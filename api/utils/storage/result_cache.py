@@ -0,0 +1,207 @@
+# utils/storage/result_cache.py
+
+"""
+Analysis result cache.
+
+Caches the signals behind /api/analyze responses per normalized URL. Every signal
+carries its own fetch time, so a cached entry can be partially reused: fresh
+signals are served from the cache and only stale ones are recomputed.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Protocol, Tuple
+from utils.storage.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class ResultCacheBackend(Protocol):
+    """Storage used by AnalysisResultCache."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None: ...
+    def delete(self, key: str) -> None: ...
+
+class MemoryResultCacheBackend:
+    """Process-local backend, for development and single-process deployments."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._cache = TTLCache(maxsize=maxsize)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        self._cache.set(key, entry, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+class SQLAlchemyResultCacheBackend:
+    """
+    Backend storing entries as JSON rows through Flask-SQLAlchemy.
+
+    Args:
+        db: The application's SQLAlchemy extension
+        model: Model with key_hash, cache_key, payload, updated_at and expires_at columns
+    """
+
+    # Seconds between sweeps that delete expired rows
+    PURGE_INTERVAL = 600
+
+    def __init__(self, db: Any, model: Any) -> None:
+        self.db = db
+        self.model = model
+        self._last_purge = 0.0
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _get_row(self, key: str) -> Any:
+        return self.db.session.execute(
+            self.db.select(self.model).where(self.model.key_hash == self._hash(key))
+        ).scalar_one_or_none()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            row = self._get_row(key)
+            if row is None or row.expires_at <= datetime.utcnow():
+                return None
+            return json.loads(row.payload)
+        except Exception as e:
+            logger.warning(f"Result cache read failed for {key}: {str(e)}")
+            self.db.session.rollback()
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any], ttl: float) -> None:
+        now = datetime.utcnow()
+        try:
+            row = self._get_row(key)
+            if row is None:
+                row = self.model(key_hash=self._hash(key), cache_key=key)
+                self.db.session.add(row)
+            row.payload = json.dumps(entry, default=str)
+            row.updated_at = now
+            row.expires_at = now + timedelta(seconds=ttl)
+            self.db.session.commit()
+        except Exception as e:
+            logger.warning(f"Result cache write failed for {key}: {str(e)}")
+            self.db.session.rollback()
+            return
+
+        if time.monotonic() - self._last_purge > self.PURGE_INTERVAL:
+            self.purge_expired()
+
+    def delete(self, key: str) -> None:
+        try:
+            self.db.session.execute(
+                self.db.delete(self.model).where(self.model.key_hash == self._hash(key))
+            )
+            self.db.session.commit()
+        except Exception as e:
+            logger.warning(f"Result cache delete failed for {key}: {str(e)}")
+            self.db.session.rollback()
+
+    def purge_expired(self) -> None:
+        """Delete all expired rows"""
+        self._last_purge = time.monotonic()
+        try:
+            self.db.session.execute(
+                self.db.delete(self.model).where(self.model.expires_at <= datetime.utcnow())
+            )
+            self.db.session.commit()
+        except Exception as e:
+            logger.warning(f"Result cache purge failed: {str(e)}")
+            self.db.session.rollback()
+
+def is_partial(name: str, value: Any) -> bool:
+    """
+    Whether a collected signal is a failure or only part of a result.
+
+    IP geolocation comes back as a full dict even when the domain didn't resolve
+    (no ``ip``) or some CDN signal collectors hit their deadline (non-empty
+    ``timed_out_signals``); neither should be reused for a full TTL.
+    """
+    if value is None:
+        return True
+    if name == 'ip_geolocation' and isinstance(value, dict):
+        return not value.get('ip') or bool(value.get('timed_out_signals'))
+    return False
+
+class AnalysisResultCache:
+    """
+    Per-signal TTL cache of analysis signals.
+
+    Entries have the form ``{'signals': {name: value}, 'fetched_at': {name: epoch}}``.
+
+    Args:
+        backend: Where entries are stored
+        ttls: Lifetime in seconds of each signal
+    """
+
+    def __init__(self, backend: ResultCacheBackend, ttls: Dict[str, float]) -> None:
+        self.backend = backend
+        self.ttls = ttls
+
+    def lookup(self, key: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Get the signals for a key that are still within their TTL.
+
+        Returns:
+            Tuple of fresh signals and their fetch times (both empty on a miss)
+        """
+        entry = self.backend.get(key)
+        if not entry:
+            return {}, {}
+
+        now = time.time()
+        signals: Dict[str, Any] = {}
+        fetched_at: Dict[str, float] = {}
+        for name, value in entry.get('signals', {}).items():
+            fetched = entry.get('fetched_at', {}).get(name)
+            ttl = self.ttls.get(name)
+            if fetched is not None and ttl is not None and now - fetched < ttl:
+                signals[name] = value
+                fetched_at[name] = fetched
+        return signals, fetched_at
+
+    def is_complete(self, signals: Dict[str, Any]) -> bool:
+        """Whether every signal with a TTL is present"""
+        return all(name in signals for name in self.ttls)
+
+    def store(self, key: str, signals: Dict[str, Any], fetched_at: Optional[Dict[str, float]] = None) -> None:
+        """
+        Store signals for a key.
+
+        Args:
+            key: Normalized URL
+            signals: All signals for the key
+            fetched_at: Original fetch times of signals reused from the cache;
+                every other signal is stamped with the current time
+
+        Failed or partial signals (see is_partial) are not stored, so the next
+        request retries them instead of reusing the failure for a full TTL.
+        """
+        now = time.time()
+        stamps = {
+            name: (fetched_at or {}).get(name, now)
+            for name, value in signals.items() if name in self.ttls and not is_partial(name, value)
+        }
+        if not stamps:
+            return
+        # Keep the entry until its longest-lived signal expires
+        ttl = max(stamps[name] + self.ttls[name] - now for name in stamps)
+        if ttl <= 0:
+            return
+        self.backend.set(key, {
+            'signals': {name: signals[name] for name in stamps},
+            'fetched_at': stamps,
+        }, ttl)
+
+    def invalidate(self, key: str) -> None:
+        """Drop the cached entry for a key"""
+        self.backend.delete(key)
@@ -1,29 +1,72 @@
 import os
+import json
+import hashlib
 import logging
+import tempfile
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-import boto3
+from typing import Any, Dict, Optional
 from botocore.exceptions import ClientError, BotoCoreError
 
 logger = logging.getLogger(__name__)
 
+# Multipart transfer tuning: objects above the threshold move in parallel parts
+S3_MULTIPART_THRESHOLD = int(float(os.getenv("S3_MULTIPART_THRESHOLD_MB", "16")) * 1024 * 1024)
+S3_MULTIPART_CHUNKSIZE = int(float(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", "8")) * 1024 * 1024)
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "10"))
+
+# Per-directory record of the ETag each downloaded file was fetched at
+MANIFEST_NAME = ".s3-manifest.json"
+
+def _md5_file(path: Path) -> str:
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
 class S3Manager:
+    """
+    Access to the S3 bucket named by S3_BUCKET_NAME.
+
+    The client is created, and the bucket checked, on first use rather than at
+    construction, so importing this module costs no network round trip.
+    """
+
     def __init__(self):
-        logger.info("Initializing S3 Manager...")
         self.bucket_name = os.getenv("S3_BUCKET_NAME")
-        if self.bucket_name:
-            logger.info(f"Found S3 bucket configuration: {self.bucket_name}")
-        else:
-            logger.info("No S3 bucket configured - S3 operations will be disabled")
         self._client = None
-        self._init_client()
+        self._client_ready = False
+        self._client_lock = threading.Lock()
+        self._manifest_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        """The S3 client, connected on first access (None when S3 is not configured or unreachable)"""
+        if not self._client_ready:
+            with self._client_lock:
+                if not self._client_ready:
+                    self._init_client()
+                    self._client_ready = True
+        return self._client
+
+    def warmup(self) -> bool:
+        """Connect to the bucket now instead of on first use; returns whether S3 is available"""
+        return self.client is not None
 
     def _init_client(self):
         """Initialize S3 client if credentials are available"""
+        logger.info("Initializing S3 Manager...")
         if not self.bucket_name:
             logger.info("S3 bucket name not configured - S3 operations disabled")
             return
 
+        logger.info(f"Found S3 bucket configuration: {self.bucket_name}")
         try:
+            # boto3 is slow to import, so only load it when S3 is actually used
+            import boto3
+
             self._client = boto3.client('s3')
             # Test connection with a head bucket call
             self._client.head_bucket(Bucket=self.bucket_name)
@@ -32,37 +75,179 @@ class S3Manager:
             logger.warning(f"Could not initialize S3 client: {e}")
             self._client = None
 
-    def download_file(self, s3_key: str, local_path: Path) -> bool:
-        """Download file from S3 with graceful failure"""
-        if not self._client:
+    @property
+    def transfer_config(self) -> Any:
+        """TransferConfig for managed uploads and downloads, from the S3_MULTIPART_* settings"""
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=S3_MAX_CONCURRENCY,
+            use_threads=S3_MAX_CONCURRENCY > 1,
+        )
+
+    @staticmethod
+    def _read_manifest(directory: Path) -> Dict[str, Any]:
+        try:
+            with open(directory / MANIFEST_NAME, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_download(self, local_path: Path, s3_key: str, etag: Optional[str]) -> None:
+        """Remember the ETag a local file was downloaded (or uploaded) at"""
+        with self._manifest_lock:
+            manifest = self._read_manifest(local_path.parent)
+            manifest[local_path.name] = {
+                'key': s3_key,
+                'etag': etag,
+                'size': local_path.stat().st_size,
+                'synced_at': datetime.now(timezone.utc).isoformat(),
+            }
+            # Unique name: other worker processes may write the manifest at the same time
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=local_path.parent,
+                                             prefix=f"{MANIFEST_NAME}.", suffix='.tmp', delete=False) as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.replace(f.name, local_path.parent / MANIFEST_NAME)
+
+    def local_etag(self, local_path: Path, s3_key: str) -> Optional[str]:
+        """ETag of the S3 object a local file is an unmodified copy of, per the manifest"""
+        entry = self._read_manifest(local_path.parent).get(local_path.name)
+        if not entry or entry.get('key') != s3_key or not local_path.exists():
+            return None
+        if local_path.stat().st_size != entry.get('size'):
+            return None
+        return entry.get('etag')
+
+    def download_file(self, s3_key: str, local_path: Path, if_changed: bool = True) -> bool:
+        """
+        Download file from S3 with graceful failure.
+
+        The object is fetched with the multipart transfer config into a uniquely
+        named temporary file next to local_path, checked against the object's size
+        (and MD5 when its ETag is one), and renamed into place, so readers never
+        see a partial file. Every GET carries If-Match with the ETag from the
+        initial HEAD, so an object replaced mid-download fails the transfer
+        instead of being recorded under the old ETag. With if_changed, a local
+        copy recorded in the manifest is revalidated with If-None-Match and kept
+        when the object hasn't changed.
+
+        Returns:
+            True if local_path now holds the current object
+        """
+        client = self.client
+        if not client:
             return False
 
         try:
-            self._client.download_file(
-                self.bucket_name,
-                s3_key,
-                str(local_path)
-            )
+            request: Dict[str, Any] = {'Bucket': self.bucket_name, 'Key': s3_key}
+            known_etag = self.local_etag(local_path, s3_key) if if_changed else None
+            if known_etag:
+                request['IfNoneMatch'] = known_etag
+            try:
+                head = client.head_object(**request)
+            except ClientError as e:
+                if known_etag and e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+                    logger.info(f"{s3_key} unchanged (ETag {known_etag}), keeping {local_path}")
+                    return True
+                raise
+
+            etag = head.get('ETag')
+            size = head.get('ContentLength')
+            # Unique per download, so workers fetching the same key don't share a file
+            with tempfile.NamedTemporaryFile(dir=local_path.parent, prefix=f".{local_path.name}.",
+                                             suffix='.s3tmp', delete=False) as f:
+                tmp_path = Path(f.name)
+            try:
+                self._download_pinned(client, s3_key, tmp_path, etag, size)
+                self._verify_download(tmp_path, etag, size)
+                os.replace(tmp_path, local_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            self._record_download(local_path, s3_key, etag)
             logger.info(f"Successfully downloaded {s3_key} from S3")
             return True
-        except ClientError as e:
+        except (ClientError, BotoCoreError, OSError, ValueError) as e:
             logger.warning(f"Could not download {s3_key} from S3: {e}")
             return False
 
+    def _download_pinned(self, client: Any, s3_key: str, path: Path, etag: Optional[str], size: Optional[int]) -> None:
+        """
+        Managed (multipart) download of the object version seen by a HEAD.
+
+        Handing the ETag and size to the transfer up front skips its own HEAD,
+        and makes it send If-Match on every GET, so a replaced object fails with
+        412 rather than mixing parts or bodies of two versions.
+
+        Raises:
+            ClientError: If the object changed since the HEAD (or any other request error)
+        """
+        from boto3.s3.transfer import BaseSubscriber, create_transfer_manager
+
+        class PinObject(BaseSubscriber):
+            def on_queued(self, future: Any, **kwargs: Any) -> None:
+                if size is not None:
+                    future.meta.provide_transfer_size(size)
+                if etag is not None:
+                    future.meta.provide_object_etag(etag)
+
+        with create_transfer_manager(client, self.transfer_config) as manager:
+            manager.download(self.bucket_name, s3_key, str(path), subscribers=[PinObject()]).result()
+
+    @staticmethod
+    def _verify_download(path: Path, etag: Optional[str], size: Optional[int]) -> None:
+        """
+        Check a downloaded file against the object's metadata.
+
+        Raises:
+            ValueError: If the size, or the MD5 for single-part ETags, doesn't match
+        """
+        actual_size = path.stat().st_size
+        if size is not None and actual_size != size:
+            raise ValueError(f"size mismatch: expected {size} bytes, got {actual_size}")
+        plain_etag = (etag or '').strip('"')
+        # Multipart ETags ("<md5 of part md5s>-<parts>") can't be recomputed without the part size
+        if len(plain_etag) == 32 and '-' not in plain_etag and _md5_file(path) != plain_etag:
+            raise ValueError(f"checksum mismatch: ETag {plain_etag}")
+
+    def get_object_info(self, s3_key: str) -> Optional[Dict[str, Any]]:
+        """Get the ETag, size and last-modified time of an object without downloading it"""
+        client = self.client
+        if not client:
+            return None
+
+        try:
+            response = client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return {
+                'etag': response.get('ETag'),
+                'last_modified': response.get('LastModified'),
+                'size': response.get('ContentLength'),
+            }
+        except ClientError as e:
+            logger.warning(f"Could not get info for {s3_key} from S3: {e}")
+            return None
+
     def upload_file(self, local_path: Path, s3_key: str) -> bool:
-        """Upload file to S3 with graceful failure"""
-        if not self._client:
+        """Upload file to S3 with graceful failure, in parallel parts for large files"""
+        client = self.client
+        if not client:
             return False
 
         try:
-            self._client.upload_file(
+            client.upload_file(
                 str(local_path),
                 self.bucket_name,
-                s3_key
+                s3_key,
+                Config=self.transfer_config
             )
+            # The uploaded object is what the local file now mirrors
+            etag = client.head_object(Bucket=self.bucket_name, Key=s3_key).get('ETag')
+            self._record_download(local_path, s3_key, etag)
             logger.info(f"Successfully uploaded {local_path} to S3")
             return True
-        except ClientError as e:
+        except (ClientError, BotoCoreError, OSError) as e:
             logger.warning(f"Could not upload {local_path} to S3: {e}")
             return False
 
@@ -0,0 +1,311 @@
+# utils/storage/signal_store.py
+
+"""
+Relational storage of analysis signals.
+
+Flattens collected signals into rows for the domain, resolved IP, IP geolocation,
+DNS record, certificate and social link tables, and writes them with bulk
+upserts (``INSERT ... ON CONFLICT DO UPDATE`` on PostgreSQL and SQLite) in a
+few statements per batch rather than a query per row. The tables are indexed
+on domain, IP, ASN and country so they can be queried directly, e.g. every
+domain served from one ASN in one country.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to stop writing analysis signals to the database
+ANALYSIS_PERSIST = os.getenv("ANALYSIS_PERSIST", "1").lower() not in ('0', 'false', 'no')
+
+# Rows per INSERT statement; keeps bound parameters under SQLite's limit
+UPSERT_CHUNK_SIZE = 500
+
+# Signal field -> DNS record type
+_DNS_FIELDS = (
+    ('a_records', 'A'),
+    ('aaaa_records', 'AAAA'),
+    ('mx_records', 'MX'),
+    ('txt_records', 'TXT'),
+    ('soa_record', 'SOA'),
+)
+
+_GEO_FIELDS = (
+    'city', 'region', 'country', 'country_code', 'latitude', 'longitude',
+    'network', 'asn', 'asn_org', 'is_cdn', 'cdn_provider'
+)
+
+_CERT_FIELDS = (
+    'common_name', 'organization', 'country', 'state', 'locality',
+    'issuer', 'issuer_country', 'issuer_common_name'
+)
+
+def _chunks(rows: Sequence[Dict[str, Any]], size: int) -> Iterable[Sequence[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def bulk_upsert(
+    session: Any,
+    model: Any,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str]
+) -> None:
+    """
+    Insert rows, updating update_columns of rows that already exist.
+
+    Uses the dialect's native upsert on PostgreSQL and SQLite; other databases
+    fall back to a lookup and merge per row. Does not commit.
+
+    Args:
+        session: SQLAlchemy session
+        model: Mapped class whose table has a unique constraint on conflict_columns
+        rows: Column -> value dicts, all with the same keys
+        conflict_columns: Columns identifying an existing row
+        update_columns: Columns overwritten on conflict (others keep their stored value)
+    """
+    if not rows:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        _merge_rows(session, model, rows, conflict_columns)
+        return
+
+    for chunk in _chunks(rows, UPSERT_CHUNK_SIZE):
+        statement = insert(model).values(list(chunk))
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: statement.excluded[column] for column in update_columns}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        session.execute(statement)
+
+def _merge_rows(session: Any, model: Any, rows: Sequence[Dict[str, Any]], conflict_columns: Sequence[str]) -> None:
+    from sqlalchemy import select
+
+    for row in rows:
+        existing = session.execute(
+            select(model).filter_by(**{column: row[column] for column in conflict_columns})
+        ).scalar_one_or_none()
+        if existing is None:
+            session.add(model(**row))
+        else:
+            for column, value in row.items():
+                setattr(existing, column, value)
+    session.flush()
+
+def domain_name(url: str) -> str:
+    """The host name a URL's signals are stored under"""
+    return (urlparse(url).hostname or url).lower()
+
+def collected_tables(signals: Dict[str, Any]) -> List[str]:
+    """
+    Child tables whose rows an analysis fully describes.
+
+    A signal that wasn't collected (failed IP lookup, page not fetched, no CDN
+    probes) says nothing about the rows stored for it before, so only the
+    tables listed here are replaced when the domain is saved again.
+    """
+    geo = signals.get('ip_geolocation') or {}
+    additional = geo.get('additional_signals') or {}
+    tables: List[str] = []
+    if geo.get('ip'):
+        tables.append('domain_ips')
+    if additional.get('dns') is not None:
+        tables.append('dns_records')
+    if additional.get('ssl') is not None:
+        tables.append('certificates')
+    if signals.get('social') is not None:
+        tables.append('social_links')
+    return tables
+
+def rows_from_signals(url: str, signals: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Flatten one URL's signals into table rows.
+
+    Child rows carry a ``domain`` key in place of ``domain_id``; it is swapped
+    for the id once the domain rows have been written.
+
+    Returns:
+        Dict of 'domains', 'domain_ips', 'ip_geo', 'dns_records', 'certificates'
+        and 'social_links' row lists
+    """
+    now = now or datetime.utcnow()
+    domain = domain_name(url)
+    tables: Dict[str, List[Dict[str, Any]]] = {
+        'domains': [{'name': domain, 'url': url, 'first_seen_at': now, 'last_analyzed_at': now}],
+        'domain_ips': [], 'ip_geo': [], 'dns_records': [], 'certificates': [], 'social_links': [],
+    }
+
+    geo = signals.get('ip_geolocation') or {}
+    if geo.get('ip'):
+        tables['domain_ips'].append({
+            'domain': domain, 'ip': geo['ip'], 'hostname': geo.get('hostname'), 'resolved_at': now
+        })
+        row = {field: geo.get(field) for field in _GEO_FIELDS}
+        row.update(ip=geo['ip'], is_cdn=bool(row['is_cdn']), updated_at=now)
+        tables['ip_geo'].append(row)
+
+    additional = geo.get('additional_signals') or {}
+    dns = additional.get('dns') or {}
+    for field, rdtype in _DNS_FIELDS:
+        values = dns.get(field) or []
+        for value in ([values] if isinstance(values, str) else values):
+            value = str(value)
+            tables['dns_records'].append({
+                'domain': domain, 'rdtype': rdtype, 'value': value,
+                'value_hash': hashlib.sha256(value.encode('utf-8')).hexdigest(), 'updated_at': now
+            })
+
+    cert = additional.get('ssl') or {}
+    if any(cert.get(field) for field in _CERT_FIELDS):
+        row = {field: cert.get(field) for field in _CERT_FIELDS}
+        row.update(domain=domain, updated_at=now)
+        tables['certificates'].append(row)
+
+    social = (signals.get('social') or {}).get('links') or {}
+    for platform, link in social.items():
+        tables['social_links'].append({'domain': domain, 'platform': platform, 'url': link, 'updated_at': now})
+
+    return tables
+
+class SignalStore:
+    """
+    Writes and queries analysis signals through Flask-SQLAlchemy.
+
+    Args:
+        db: The application's SQLAlchemy extension
+        models: Namespace (e.g. the api.models.analysis module) providing the
+            Domain, DomainIP, IPGeo, DNSRecord, Certificate and SocialLink models
+    """
+
+    def __init__(self, db: Any, models: Any) -> None:
+        self.db = db
+        self.models = models
+
+    def _upserts(self) -> Tuple[Tuple[str, Any, Tuple[str, ...], Tuple[str, ...]], ...]:
+        m = self.models
+        # (table, model, conflict columns, columns refreshed on conflict)
+        return (
+            ('ip_geo', m.IPGeo, ('ip',), _GEO_FIELDS + ('updated_at',)),
+            ('domain_ips', m.DomainIP, ('domain_id', 'ip'), ('hostname', 'resolved_at')),
+            ('dns_records', m.DNSRecord, ('domain_id', 'rdtype', 'value_hash'), ('updated_at',)),
+            ('certificates', m.Certificate, ('domain_id',), _CERT_FIELDS + ('updated_at',)),
+            ('social_links', m.SocialLink, ('domain_id', 'platform'), ('url', 'updated_at')),
+        )
+
+    def _replaced(self) -> Dict[str, Tuple[Any, Any]]:
+        m = self.models
+        # table -> (model, column stamped with the save time)
+        return {
+            'domain_ips': (m.DomainIP, m.DomainIP.resolved_at),
+            'dns_records': (m.DNSRecord, m.DNSRecord.updated_at),
+            'certificates': (m.Certificate, m.Certificate.updated_at),
+            'social_links': (m.SocialLink, m.SocialLink.updated_at),
+        }
+
+    def save(self, analyses: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """
+        Upsert the signals of a batch of analyses.
+
+        A re-analyzed domain's child rows that the new analysis no longer
+        contains (an old IP, a removed DNS record or social link) are deleted
+        in the same transaction, for every table the analysis collected (see
+        collected_tables).
+
+        Args:
+            analyses: (normalized URL, signals) pairs
+
+        Returns:
+            Number of domains written (0 if the write failed; failures are logged, not raised)
+        """
+        now = datetime.utcnow()
+        tables: Dict[str, List[Dict[str, Any]]] = {}
+        # table -> domains whose rows in it are replaced
+        replaced: Dict[str, Set[str]] = {}
+        for url, signals in analyses:
+            for table, rows in rows_from_signals(url, signals, now).items():
+                tables.setdefault(table, []).extend(rows)
+            for table in collected_tables(signals):
+                replaced.setdefault(table, set()).add(domain_name(url))
+        if not tables.get('domains'):
+            return 0
+
+        # The last analysis of a domain in the batch wins
+        domains = list({row['name']: row for row in tables['domains']}.values())
+        session = self.db.session
+        try:
+            bulk_upsert(session, self.models.Domain, domains, ('name',), ('url', 'last_analyzed_at'))
+            ids = dict(session.execute(
+                self.db.select(self.models.Domain.name, self.models.Domain.id)
+                .where(self.models.Domain.name.in_([row['name'] for row in domains]))
+            ).all())
+
+            for table, model, conflict, update in self._upserts():
+                unique: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+                for row in tables.get(table, []):
+                    row = dict(row)
+                    if 'domain' in row:
+                        row['domain_id'] = ids[row.pop('domain')]
+                    unique[tuple(row[column] for column in conflict)] = row
+                bulk_upsert(session, model, list(unique.values()), conflict, update)
+
+            # Rows this save didn't touch still carry an older timestamp
+            for table, (model, stamp) in self._replaced().items():
+                domain_ids = [ids[name] for name in replaced.get(table, ())]
+                if domain_ids:
+                    session.execute(
+                        self.db.delete(model).where(model.domain_id.in_(domain_ids), stamp < now)
+                    )
+            session.commit()
+        except Exception as e:
+            logger.warning(f"Could not store signals for {len(domains)} domains: {str(e)}")
+            session.rollback()
+            return 0
+        return len(domains)
+
+    def find_domains(
+        self,
+        asn: Optional[int] = None,
+        country_code: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Find domains whose resolved IPs match an ASN and/or country.
+
+        Args:
+            asn: Autonomous system number
+            country_code: ISO 3166-1 alpha-2 code of the IP's country
+
+        Returns:
+            Dicts with domain, ip, asn, asn_org and country_code, ordered by domain
+        """
+        m = self.models
+        query = (
+            self.db.select(m.Domain.name, m.IPGeo.ip, m.IPGeo.asn, m.IPGeo.asn_org, m.IPGeo.country_code)
+            .join(m.DomainIP, m.DomainIP.domain_id == m.Domain.id)
+            .join(m.IPGeo, m.IPGeo.ip == m.DomainIP.ip)
+        )
+        if asn is not None:
+            query = query.where(m.IPGeo.asn == asn)
+        if country_code:
+            query = query.where(m.IPGeo.country_code == country_code.upper())
+        query = query.order_by(m.Domain.name, m.IPGeo.ip).limit(limit).offset(offset)
+
+        return [
+            {'domain': name, 'ip': ip, 'asn': row_asn, 'asn_org': asn_org, 'country_code': code}
+            for name, ip, row_asn, asn_org, code in self.db.session.execute(query).all()
+        ]